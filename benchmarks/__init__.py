@@ -0,0 +1,11 @@
+"""
+Reproducible benchmarks for triematch data structures.
+
+Run all benchmarks and write one JSON object per measurement:
+
+```
+python -m benchmarks --sizes 1000 10000 --output results.jsonl
+```
+
+Every run is seeded, so results of two commits can be compared line by line.
+"""
@@ -0,0 +1,57 @@
+"""Command line entry point: `python -m benchmarks --help`."""
+import argparse
+import json
+import sys
+from typing import Optional
+
+from benchmarks.cases import CASES
+from benchmarks.datasets import DATASETS
+from benchmarks.routing import run_routing
+from benchmarks.runner import STRUCTURES
+from benchmarks.runner import run_benchmarks
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    """Parse arguments, run benchmarks and print JSON lines."""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark triematch data structures.',
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000])
+    parser.add_argument(
+        '--structures', nargs='+', choices=STRUCTURES, default=list(STRUCTURES),
+    )
+    parser.add_argument(
+        '--datasets', nargs='+', choices=DATASETS, default=list(DATASETS),
+    )
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--routing', action='store_true',
+        help='compare IP longest prefix match lookups instead of the cases',
+    )
+    parser.add_argument(
+        '--output', type=argparse.FileType('w'), default=sys.stdout,
+        help='file to write JSON lines to (default: stdout)',
+    )
+    args = parser.parse_args(argv)
+
+    if args.routing:
+        results = run_routing(sizes=args.sizes, repeat=args.repeat, seed=args.seed)
+    else:
+        results = run_benchmarks(
+            sizes=args.sizes,
+            structures=args.structures,
+            datasets=args.datasets,
+            cases=args.cases,
+            repeat=args.repeat,
+            seed=args.seed,
+        )
+    for result in results:
+        args.output.write(json.dumps(result) + '\n')
+        args.output.flush()
+
+
+if __name__ == '__main__':
+    main()
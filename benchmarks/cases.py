@@ -0,0 +1,205 @@
+"""
+Benchmark cases.
+
+Every case is a function which gets a fixture dict (see `runner.fixture`) and
+returns `(setup, run, ops)`. `setup()` prepares a fresh state which is passed
+to `run(state)`, only `run` is timed, and `ops` is the number of operations
+one call of `run` performs. A case returns `None` if it does not apply to the
+data structure. Cases of paths which could give wrong results check them
+against the plain structure once, before anything is timed.
+"""
+import pickle
+from collections.abc import Callable
+from importlib.util import find_spec
+from typing import Any
+from typing import Optional
+
+Case = tuple[Callable[[], Any], Callable[[Any], Any], int]
+
+
+def _noop() -> None:
+    return None
+
+
+def _check(result: Any, expected: Any, case: str) -> None:
+    """Fail the case if its result differs, timing wrong output is misleading."""
+    if result != expected:
+        raise AssertionError(f'{case} gives a different result than expected')
+
+
+def bench_setitem(fx: dict) -> Optional[Case]:
+    """Insert every key with `trie[key] = value` into an empty trie."""
+    cls, items = fx['cls'], fx['items']
+
+    def run(trie: Any) -> None:
+        for key, value in items:
+            trie[key] = value
+
+    return cls, run, len(items)
+
+
+def bench_update(fx: dict) -> Optional[Case]:
+    """Insert every key with `trie.update(mapping)` into an empty trie."""
+    cls, mapping = fx['cls'], dict(fx['items'])
+    return cls, lambda trie: trie.update(mapping), len(mapping)
+
+
+def bench_getitem(fx: dict) -> Optional[Case]:
+    """Read the value of every key."""
+    trie, keys = fx['trie'], fx['keys']
+
+    def run(_: Any) -> None:
+        for key in keys:
+            trie[key]
+
+    return _noop, run, len(keys)
+
+
+def bench_contains(fx: dict) -> Optional[Case]:
+    """Membership test of present and missing keys."""
+    trie, probes = fx['trie'], fx['probes']
+
+    def run(_: Any) -> None:
+        for key in probes:
+            key in trie  # noqa: B015
+
+    return _noop, run, len(probes)
+
+
+def bench_match(fx: dict) -> Optional[Case]:
+    """All prefix matches of every key."""
+    trie, keys = fx['trie'], fx['keys']
+
+    def run(_: Any) -> None:
+        for key in keys:
+            for _ in trie.match(key):
+                pass
+
+    return _noop, run, len(keys)
+
+
+def bench_longest_prefix(fx: dict) -> Optional[Case]:
+    """Longest key which is a prefix of each present or missing key."""
+    trie, probes = fx['trie'], fx['probes']
+    return _noop, lambda _: trie.longest_prefixes(probes), len(probes)
+
+
+def bench_search(fx: dict) -> Optional[Case]:
+    """Search the text without Aho-Corasick links (ops are text items)."""
+    trie, text = fx['trie'], fx['text']
+
+    def run(_: Any) -> None:
+        for _ in trie.search(text):
+            pass
+
+    return _noop, run, len(text)
+
+
+def bench_search_linked(fx: dict) -> Optional[Case]:
+    """Search the text after `link_nodes` (ops are text items)."""
+    if not hasattr(fx['trie'], 'link_nodes'):
+        return None
+    trie, text = fx['trie'].copy(), fx['text']
+    trie.link_nodes()
+    _check(sorted(trie.search(text)), sorted(fx['trie'].search(text)), 'search_linked')
+
+    def run(_: Any) -> None:
+        for _ in trie.search(text):
+            pass
+
+    return _noop, run, len(text)
+
+
+def bench_search_batch(fx: dict) -> Optional[Case]:
+    """Search every probe key as a short text with `search_batch` (needs NumPy)."""
+    if find_spec('numpy') is None or not hasattr(fx['trie'], 'search_batch'):
+        return None
+    trie, probes = fx['trie'], fx['probes']
+    trie.search_batch(probes[:1])  # the transition table is built once
+
+    def run(_: Any) -> None:
+        trie.search_batch(probes)
+
+    return _noop, run, len(probes)
+
+
+def bench_expand(fx: dict) -> Optional[Case]:
+    """Enumerate keys under two-item prefixes of keys."""
+    trie, prefixes = fx['trie'], fx['prefixes']
+
+    def run(_: Any) -> None:
+        for prefix in prefixes:
+            for _ in trie.expand(prefix):
+                pass
+
+    return _noop, run, len(prefixes)
+
+
+def _bench_fuzzy(fx: dict, max_distance: int) -> Optional[Case]:
+    trie, typos = fx['trie'], fx['typos']
+
+    def run(_: Any) -> None:
+        for query in typos:
+            for _ in trie.fuzzy(query, max_distance):
+                pass
+
+    return _noop, run, len(typos)
+
+
+def bench_fuzzy_1(fx: dict) -> Optional[Case]:
+    """Look up misspelled keys within edit distance 1."""
+    return _bench_fuzzy(fx, 1)
+
+
+def bench_fuzzy_2(fx: dict) -> Optional[Case]:
+    """Look up misspelled keys within edit distance 2."""
+    return _bench_fuzzy(fx, 2)
+
+
+def bench_to_regex(fx: dict) -> Optional[Case]:
+    """Export the trie as a regex pattern."""
+    trie = fx['trie']
+    if not hasattr(trie, 'to_regex'):
+        return None
+    return _noop, lambda _: trie.to_regex(), 1
+
+
+def bench_link_nodes(fx: dict) -> Optional[Case]:
+    """Generate Aho-Corasick links on a fresh copy of the trie."""
+    if not hasattr(fx['trie'], 'link_nodes'):
+        return None
+    return fx['trie'].copy, lambda trie: trie.link_nodes(), 1
+
+
+def bench_copy(fx: dict) -> Optional[Case]:
+    """Copy the whole trie."""
+    trie = fx['trie']
+    return _noop, lambda _: trie.copy(), 1
+
+
+def bench_pickle(fx: dict) -> Optional[Case]:
+    """Pickle and unpickle the whole trie."""
+    trie = fx['trie']
+    copied = pickle.loads(pickle.dumps(trie))
+    _check(dict(copied.items()), dict(trie.items()), 'pickle')
+    return _noop, lambda _: pickle.loads(pickle.dumps(trie)), 1
+
+
+CASES = {
+    'setitem': bench_setitem,
+    'update': bench_update,
+    'getitem': bench_getitem,
+    'contains': bench_contains,
+    'match': bench_match,
+    'longest_prefix': bench_longest_prefix,
+    'search': bench_search,
+    'search_linked': bench_search_linked,
+    'search_batch': bench_search_batch,
+    'expand': bench_expand,
+    'fuzzy_1': bench_fuzzy_1,
+    'fuzzy_2': bench_fuzzy_2,
+    'to_regex': bench_to_regex,
+    'link_nodes': bench_link_nodes,
+    'copy': bench_copy,
+    'pickle': bench_pickle,
+}
@@ -0,0 +1,107 @@
+"""
+Seeded key sets and texts used by benchmarks.
+
+All generators take a `size` and a `seed`, and return the same keys for the
+same arguments.
+"""
+import random
+from string import ascii_lowercase
+
+STEMS_PER_SUFFIX = 8
+SUFFIXES = (
+    '', 's', 'ed', 'ing', 'er', 'ers', 'ly', 'ness', 'ment', 'ments',
+    'able', 'ation', 'ations', 'ize', 'izes', 'ized',
+)
+TLDS = ('com', 'org', 'net', 'io', 'de', 'co.uk', 'fr', 'ir', 'info')
+
+
+def random_words(
+    size: int,
+    seed: int=0,
+    min_len: int=3,
+    max_len: int=12,
+) -> list[str]:
+    """Uniformly random lowercase words (synthetic, little prefix sharing)."""
+    rnd = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        length = rnd.randint(min_len, max_len)
+        words.add(''.join(rnd.choices(ascii_lowercase, k=length)))
+    return sorted(words)
+
+
+def inflected_words(size: int, seed: int=0) -> list[str]:
+    """Stems combined with common English suffixes (shared suffixes)."""
+    stems = random_words(
+        size // len(SUFFIXES) + STEMS_PER_SUFFIX, seed=seed, min_len=3, max_len=8,
+    )
+    words = [stem + suffix for stem in stems for suffix in SUFFIXES]
+    random.Random(seed).shuffle(words)
+    return sorted(words[:size])
+
+
+def domain_names(size: int, seed: int=0) -> list[str]:
+    """Host names with a few shared top level domains and subdomains."""
+    rnd = random.Random(seed)
+    labels = random_words(max(size // 4, 1), seed=seed, min_len=2, max_len=10)
+    domains = set()
+    while len(domains) < size:
+        host = rnd.choice(labels) + '.' + rnd.choice(TLDS)
+        if rnd.random() < 0.5:  # noqa: PLR2004
+            host = rnd.choice(('www', 'mail', 'api', 'cdn')) + '.' + host
+        domains.add(host)
+    return sorted(domains)
+
+
+def ipv4_addresses(size: int, seed: int=0) -> list[tuple[int, ...]]:
+    """IPv4 addresses as tuples of octets."""
+    rnd = random.Random(seed)
+    addresses = set()
+    while len(addresses) < size:
+        addresses.add(tuple(rnd.randrange(256) for _ in range(4)))
+    return sorted(addresses)
+
+
+def ipv4_routes(size: int, seed: int=0) -> list[tuple[int, ...]]:
+    """Octet aligned IPv4 networks (/8, /16 and /24) as tuples of octets."""
+    rnd = random.Random(seed)
+    routes = set()
+    while len(routes) < size:
+        routes.add(tuple(rnd.randrange(256) for _ in range(rnd.randint(1, 3))))
+    return sorted(routes)
+
+
+def text_with(words: list, length: int, seed: int=0, hit_rate: float=0.3) -> str:
+    """
+    Build a text of about `length` characters.
+
+    Roughly `hit_rate` of the tokens are taken from `words`, the rest are
+    random words which are usually not keys.
+    """
+    rnd = random.Random(seed)
+    noise = random_words(max(len(words), 1), seed=seed + 1)
+    tokens = []
+    total = 0
+    while total < length:
+        token = rnd.choice(words if rnd.random() < hit_rate else noise)
+        tokens.append(token)
+        total += len(token) + 1
+    return ' '.join(tokens)[:length]
+
+
+def with_typos(words: list, count: int, seed: int=0) -> list:
+    """`count` of the words, each with one item replaced by an item of another word."""
+    rnd = random.Random(seed)
+    typos = []
+    for word in rnd.choices(words, k=count):
+        other = rnd.choice(words)
+        i, j = rnd.randrange(len(word)), rnd.randrange(len(other))
+        typos.append(word[:i] + other[j:j + 1] + word[i + 1:])
+    return typos
+
+
+DATASETS = {
+    'random': random_words,
+    'inflected': inflected_words,
+    'domains': domain_names,
+}
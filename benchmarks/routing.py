@@ -0,0 +1,108 @@
+"""
+IP longest prefix match, `TupleTrie` of octets against `PrefixTable`.
+
+Routes are octet aligned (/8, /16 and /24), so every structure holds the
+same table and returns the same results.
+"""
+import random
+from collections.abc import Iterable
+from typing import Any
+from typing import Callable
+
+from benchmarks.datasets import ipv4_addresses
+from benchmarks.datasets import ipv4_routes
+from benchmarks.runner import measure
+from triematch import TupleTrie
+from triematch.iptable import PrefixTable
+
+HIT_RATE = 0.5  # share of looked up addresses inside a route
+
+
+def _address_int(octets: tuple[int, ...]) -> int:
+    return int.from_bytes(bytes(octets).ljust(4, b'\0'), 'big')
+
+
+def routed_addresses(routes: list, size: int, seed: int=0) -> list[tuple[int, ...]]:
+    """Addresses of which about `HIT_RATE` are inside one of the routes."""
+    rnd = random.Random(seed)
+    addresses = ipv4_addresses(size, seed=seed)
+    for i in range(size):
+        if rnd.random() < HIT_RATE:
+            route = rnd.choice(routes)
+            addresses[i] = route + addresses[i][len(route):]
+    return addresses
+
+
+def _last_match(trie: TupleTrie, address: tuple) -> Any:
+    last = None
+    for last in trie.match(address):  # noqa: B007
+        pass
+    return last
+
+
+def tuple_trie_match(routes: dict, addresses: list) -> Callable[[], list]:
+    """Last item of `TupleTrie.match` for octet tuples."""
+    trie = TupleTrie(routes)
+    return lambda: [_last_match(trie, address) for address in addresses]
+
+
+def tuple_trie_longest_prefix(routes: dict, addresses: list) -> Callable[[], list]:
+    """`TupleTrie.longest_prefixes` for octet tuples."""
+    trie = TupleTrie(routes)
+    return lambda: trie.longest_prefixes(addresses)
+
+
+def prefix_table(routes: dict, addresses: list) -> Callable[[], list]:
+    """`PrefixTable.longest_prefixes` for addresses as ints."""
+    table = PrefixTable({
+        (_address_int(route), 8 * len(route)): value
+        for route, value in routes.items()
+    })
+    numbers = [_address_int(address) for address in addresses]
+    return lambda: table.longest_prefixes(numbers)
+
+
+def prefix_table_tuples(routes: dict, addresses: list) -> Callable[[], list]:
+    """`PrefixTable.longest_prefixes` for octet tuples, converted per lookup."""
+    table = PrefixTable({
+        (_address_int(route), 8 * len(route)): value
+        for route, value in routes.items()
+    })
+    return lambda: table.longest_prefixes(addresses)
+
+
+LOOKUPS = {
+    'TupleTrie.match': tuple_trie_match,
+    'TupleTrie.longest_prefix': tuple_trie_longest_prefix,
+    'PrefixTable': prefix_table,
+    'PrefixTable(tuples)': prefix_table_tuples,
+}
+
+
+def run_routing(
+    sizes: Iterable[int]=(1000,),
+    *,
+    repeat: int=3,
+    seed: int=0,
+) -> Iterable[dict[str, Any]]:
+    """Yield one result dict per size and lookup, like `run_benchmarks`."""
+    for size in sizes:
+        routes = {route: i for i, route in enumerate(ipv4_routes(size, seed=seed))}
+        addresses = routed_addresses(list(routes), 10 * size, seed=seed + 1)
+        for structure, lookup in LOOKUPS.items():
+            run = lookup(routes, addresses)
+            timings, peak = measure(lambda: None, lambda _, run=run: run(), repeat)
+            best = min(timings)
+            yield {
+                'case': 'longest_prefix',
+                'structure': structure,
+                'dataset': 'ipv4_routes',
+                'size': size,
+                'seed': seed,
+                'ops': len(addresses),
+                'repeat': repeat,
+                'best_seconds': best,
+                'mean_seconds': sum(timings) / len(timings),
+                'ops_per_second': len(addresses) / best if best else None,
+                'peak_memory_bytes': peak,
+            }
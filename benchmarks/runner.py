@@ -0,0 +1,137 @@
+"""Run benchmark cases and collect machine readable results."""
+import platform
+import sys
+import tracemalloc
+from collections.abc import Iterable
+from datetime import datetime
+from datetime import timezone
+from time import perf_counter
+from typing import Any
+from typing import Callable
+
+from benchmarks.cases import CASES
+from benchmarks.datasets import DATASETS
+from benchmarks.datasets import random_words
+from benchmarks.datasets import text_with
+from benchmarks.datasets import with_typos
+from triematch import Radix
+from triematch import Trie
+from triematch import TupleTrie
+
+STRUCTURES = {
+    'Trie': Trie,
+    'TupleTrie': TupleTrie,
+    'Radix': Radix,
+}
+TEXT_LENGTH_FACTOR = 10  # text length is this factor times the dataset size
+FUZZY_QUERIES = 100  # number of misspelled keys looked up by fuzzy cases
+
+
+def as_keys(cls: type, words: Iterable[str]) -> list:
+    """Convert words to the key type used by the data structure."""
+    if issubclass(cls, TupleTrie):
+        return [tuple(word) for word in words]
+    return list(words)
+
+
+def fixture(structure: str, dataset: str, size: int, seed: int=0) -> dict:
+    """Build the data shared by all cases for one structure, dataset and size."""
+    cls = STRUCTURES[structure]
+    words = DATASETS[dataset](size, seed=seed)
+    missing = random_words(len(words), seed=seed + 2, min_len=13, max_len=16)
+    keys = as_keys(cls, words)
+    items = [(key, i) for i, key in enumerate(keys)]
+    text = text_with(words, TEXT_LENGTH_FACTOR * size, seed=seed)
+    return {
+        'cls': cls,
+        'keys': keys,
+        'items': items,
+        'probes': keys + as_keys(cls, missing),
+        'prefixes': list(dict.fromkeys(key[:2] for key in keys)),
+        'text': as_keys(cls, [text])[0],
+        'typos': as_keys(cls, with_typos(words, FUZZY_QUERIES, seed=seed + 3)),
+        'trie': cls(dict(items)),
+    }
+
+
+def measure(
+    setup: Callable[[], Any],
+    run: Callable[[Any], Any],
+    repeat: int,
+) -> tuple[list[float], int]:
+    """
+    Time `run` on fresh states from `setup`.
+
+    Returns:
+        tuple: timings in seconds of each repeat and peak memory (bytes)
+            allocated by one extra traced run.
+    """
+    timings = []
+    for _ in range(repeat):
+        state = setup()
+        started = perf_counter()
+        run(state)
+        timings.append(perf_counter() - started)
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return timings, peak
+
+
+def run_benchmarks(  # noqa: PLR0913
+    sizes: Iterable[int]=(1000,),
+    structures: Iterable[str]=tuple(STRUCTURES),
+    datasets: Iterable[str]=tuple(DATASETS),
+    cases: Iterable[str]=tuple(CASES),
+    *,
+    repeat: int=3,
+    seed: int=0,
+) -> Iterable[dict[str, Any]]:
+    """
+    Run the selected cases and yield one result dict per measurement.
+
+    A case which raises is reported with an `error` field instead of timings,
+    so one broken operation does not hide the rest of the results.
+    """
+    environment = {
+        'python': platform.python_version(),
+        'implementation': sys.implementation.name,
+        'timestamp': datetime.now(tz=timezone.utc).isoformat(),
+    }
+    for size in sizes:
+        for dataset in datasets:
+            for structure in structures:
+                fx = fixture(structure, dataset, size, seed=seed)
+                for case in cases:
+                    result = {
+                        'case': case,
+                        'structure': structure,
+                        'dataset': dataset,
+                        'size': size,
+                        'seed': seed,
+                        **environment,
+                    }
+                    try:
+                        prepared = CASES[case](fx)
+                        if prepared is None:
+                            continue
+                        setup, run, ops = prepared
+                        timings, peak = measure(setup, run, repeat)
+                    except Exception as error:
+                        result['error'] = f'{type(error).__name__}: {error}'
+                    else:
+                        best = min(timings)
+                        result.update(
+                            ops=ops,
+                            repeat=repeat,
+                            best_seconds=best,
+                            mean_seconds=sum(timings) / len(timings),
+                            ops_per_second=ops / best if best else None,
+                            peak_memory_bytes=peak,
+                        )
+                    yield result
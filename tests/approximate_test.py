@@ -0,0 +1,65 @@
+"""Tests for ApproximateSearch, matching keys with substitutions."""
+import pytest
+
+from triematch.approximate import ApproximateSearch
+from triematch.approximate import split_bounds
+from triematch.radix import Radix
+from triematch.trie import Trie
+from triematch.trie import TupleTrie
+
+
+def brute_force(keys: dict, text, max_mismatches: int) -> list:
+    matches = []
+    for key, value in keys.items():
+        for start in range(len(text) - len(key) + 1):
+            distance = sum(a != b for a, b in zip(text[start:start + len(key)], key))
+            if distance <= max_mismatches:
+                matches.append((start, start + len(key), value, distance))
+    return sorted(matches)
+
+
+def test_split_bounds() -> None:
+    assert split_bounds(7, 3) == [(0, 2), (2, 4), (4, 7)]
+    assert split_bounds(3, 1) == [(0, 3)]
+
+
+@pytest.mark.parametrize('trie_class', [Trie, Radix])
+@pytest.mark.parametrize('max_mismatches', [0, 1, 2, 3])
+def test_approximate_search_like_brute_force(trie_class, max_mismatches) -> None:
+    keys = {'abcab': 1, 'bca': 2, 'aaaa': 3, 'cab': 4, 'b': 5, 'abcabcab': 6}
+    text = 'abcbbcaacabaaabcacbcabaab'
+    matcher = ApproximateSearch(trie_class(keys), max_mismatches)
+
+    matches = list(matcher.search(text))
+    assert len(matches) == len(set(matches)), 'windows must be reported once'
+    assert sorted(matches) == brute_force(keys, text, max_mismatches)
+
+
+def test_approximate_search_tuple_trie() -> None:
+    keys = {('GET', '/users', '200'): 'ok', ('POST', '/login', '401'): 'denied'}
+    text = ('GET', '/users', '500', 'POST', '/login', '401')
+    matcher = ApproximateSearch(TupleTrie(keys), 1)
+    assert sorted(matcher.search(text)) == [(0, 3, 'ok', 1), (3, 6, 'denied', 0)]
+
+
+def test_approximate_search_follows_updates() -> None:
+    trie = Trie({'error': 'E'})
+    matcher = ApproximateSearch(trie, 1)
+    assert list(matcher.search('an errer')) == [(3, 8, 'E', 1)]
+
+    trie['an'] = 'A'
+    assert sorted(matcher.search('an errer')) == [(0, 2, 'A', 0), (3, 8, 'E', 1)]
+
+
+def test_approximate_search_stream() -> None:
+    keys = {'error': 'E', 'warning': 'W'}
+    text = 'an errer and a warninq, no errors'
+    matcher = ApproximateSearch(Trie(keys), 1)
+    chunks = [text[:5], text[5:17], text[17:18], text[18:]]
+
+    assert sorted(matcher.search_stream(chunks)) == sorted(matcher.search(text))
+
+
+def test_approximate_search_rejects_negative_mismatches() -> None:
+    with pytest.raises(ValueError, match='negative'):
+        ApproximateSearch(Trie(), -1)
@@ -0,0 +1,62 @@
+"""Smoke tests for the benchmark suite (tiny sizes, single repeat)."""
+import json
+
+from benchmarks.__main__ import main
+from benchmarks.datasets import inflected_words
+from benchmarks.datasets import ipv4_routes
+from benchmarks.routing import LOOKUPS
+from benchmarks.routing import routed_addresses
+from benchmarks.routing import run_routing
+from benchmarks.runner import run_benchmarks
+
+
+def test_datasets_are_reproducible() -> None:
+    assert inflected_words(50, seed=3) == inflected_words(50, seed=3)
+    assert inflected_words(50, seed=3) != inflected_words(50, seed=4)
+    assert len(inflected_words(50)) == 50
+
+
+def test_run_benchmarks_results() -> None:
+    results = list(
+        run_benchmarks(
+            sizes=[20],
+            structures=['Trie'],
+            datasets=['random'],
+            cases=['setitem', 'search_linked', 'to_regex'],
+            repeat=1,
+        ),
+    )
+
+    assert [result['case'] for result in results] == [
+        'setitem', 'search_linked', 'to_regex',
+    ]
+    for result in results:
+        assert 'error' not in result
+        assert result['ops_per_second'] > 0
+        assert result['peak_memory_bytes'] >= 0
+
+
+def test_benchmarks_cli_writes_json_lines(tmp_path) -> None:
+    output = tmp_path / 'results.jsonl'
+    main([
+        '--sizes', '10', '--structures', 'TupleTrie', '--datasets', 'domains',
+        '--cases', 'getitem', 'to_regex', '--repeat', '1', '--output', str(output),
+    ])
+
+    lines = output.read_text().splitlines()
+    # to_regex is not available for TupleTrie, so it is skipped
+    assert [json.loads(line)['case'] for line in lines] == ['getitem']
+
+
+def test_routing_lookups_agree() -> None:
+    routes = {route: i for i, route in enumerate(ipv4_routes(50))}
+    addresses = routed_addresses(list(routes), 200, seed=1)
+    results = [lookup(routes, addresses)() for lookup in LOOKUPS.values()]
+
+    # TupleTrie lengths are in octets and PrefixTable lengths are in bits
+    values = [[None if r is None else r[1] for r in result] for result in results]
+    assert all(result == values[0] for result in values)
+    assert any(value is not None for value in values[0])
+    assert [result['structure'] for result in run_routing([20], repeat=1)] == list(
+        LOOKUPS,
+    )
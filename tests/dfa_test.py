@@ -0,0 +1,148 @@
+"""Tests for dense transition tables (DFA) and batch search."""
+import pytest
+
+from triematch import Radix
+from triematch import Trie
+from triematch import TupleTrie
+from triematch.trie import TrieStates
+from triematch.dfa import Alphabet
+from triematch.dfa import DFA
+from triematch.dfa import estimate_memory
+
+KEYS = {'he': 1, 'she': 2, 'his': 3, 'hers': 4}
+TEXTS = ['ushers', '', 'this is his', 'xyz', 'she']
+
+
+def expected_matches(trie, texts) -> list:
+    return sorted(
+        (doc_id, start, end, value)
+        for doc_id, text in enumerate(texts)
+        for start, end, value in trie.search_iter(text)
+    )
+
+
+def test_dfa_resolves_failure_transitions() -> None:
+    dfa = DFA(Trie(KEYS))
+    assert dfa.num_states == 10  # root, h, he, her, hers, hi, his, s, sh, she
+    assert dfa.width == len(dfa.alphabet) + 1
+    columns = dfa.alphabet.columns
+    sh = dfa.table[dfa.table[columns['s']] * dfa.width + columns['h']]
+    she = dfa.table[sh * dfa.width + dfa.alphabet.columns['e']]
+    # "she" ends with "he", so "r" continues to "her"
+    her = dfa.table[she * dfa.width + dfa.alphabet.columns['r']]
+    he = dfa.table[dfa.table[columns['h']] * dfa.width + columns['e']]
+    assert he != 0
+    assert her != 0
+    assert dfa.table[her * dfa.width + dfa.width - 1] == 0
+
+
+def test_alphabet_columns() -> None:
+    alphabet = Alphabet('ACGT')
+    assert len(alphabet) == 4
+    assert alphabet.other == 4
+    assert list(alphabet.encode('GATN')) == [2, 0, 3, 4]
+    assert list(alphabet.encode(['G', 'x'])) == [2, 4]
+    assert list(Alphabet([('a',), ('b',)]).encode([('b',), ('c',)])) == [1, 2]
+    assert Alphabet.of_trie(Radix({'abc': 1, 'abd': 2})).symbols == ['a', 'b', 'c', 'd']
+
+
+def test_estimate_memory() -> None:
+    trie = Trie(KEYS)
+    itemsize = DFA(trie).table.itemsize
+    assert estimate_memory(trie) == 10 * 6 * itemsize
+    assert estimate_memory(trie, Alphabet('ehirsx')) == 10 * 7 * itemsize
+    assert estimate_memory(trie) == len(DFA(trie).table) * itemsize
+
+
+@pytest.mark.parametrize('trie_class', [Trie, Radix])
+def test_compile_dfa_search(trie_class) -> None:
+    trie = trie_class(KEYS)
+    dfa = trie.compile_dfa(Alphabet('ehirst'))
+    text = 'ushers at this hershey'
+    expected = sorted(trie_class(KEYS).search_iter(text))
+
+    assert trie._state == TrieStates.Linked
+    assert sorted(trie.search(text)) == expected
+    assert sorted(trie.search_iter(iter(text))) == expected
+    assert sorted(dfa.search(text)) == expected
+    assert dfa.memory >= len(dfa.table) * dfa.table.itemsize
+
+
+def test_compile_dfa_tuple_trie() -> None:
+    trie = TupleTrie({(1, 2): 'a', (2, 3): 'b'})
+    trie.compile_dfa()
+    assert list(trie.search((1, 2, 3, 9, 2, 3))) == [
+        (0, 2, 'a'),
+        (1, 3, 'b'),
+        (4, 6, 'b'),
+    ]
+
+
+def test_compile_dfa_errors() -> None:
+    with pytest.raises(ValueError, match='not in the alphabet'):
+        Trie({'AXG': 1}).compile_dfa(Alphabet('ACGT'))
+    with pytest.raises(ValueError, match='max_memory'):
+        Trie(KEYS).compile_dfa(max_memory=100)
+
+
+def test_compile_dfa_is_dropped_on_unlink() -> None:
+    trie = Trie(KEYS)
+    trie.compile_dfa()
+    with pytest.raises(AttributeError):
+        trie['him'] = 5
+    trie.unlink_nodes()
+    trie['him'] = 5
+    assert (0, 3, 5) in list(trie.search('him'))
+
+
+@pytest.mark.parametrize('trie_class', [Trie, Radix])
+def test_search_batch(trie_class) -> None:
+    pytest.importorskip('numpy')
+    trie = trie_class(KEYS)
+    matches = trie.search_batch(TEXTS)
+
+    assert sorted(matches) == expected_matches(trie, TEXTS)
+    assert len(matches) == len(matches.doc_id) == 7
+    assert [matches.values[i] for i in matches.value_id] == [
+        value for *_, value in matches
+    ]
+    assert matches.doc_id.tolist() == sorted(matches.doc_id.tolist())
+
+
+def test_search_batch_linked_and_minimized() -> None:
+    pytest.importorskip('numpy')
+    trie = Trie(KEYS)
+    trie.link_nodes()
+    assert sorted(trie.search_batch(TEXTS)) == expected_matches(Trie(KEYS), TEXTS)
+    trie = Trie(KEYS)
+    trie.minimize()
+    assert sorted(trie.search_batch(TEXTS)) == expected_matches(Trie(KEYS), TEXTS)
+
+
+def test_search_batch_tuple_trie() -> None:
+    pytest.importorskip('numpy')
+    trie = TupleTrie({('new', 'york'): 'state', ('york',): 'town'})
+    texts = [('i', 'love', 'new', 'york'), (), ('york',)]
+    assert list(trie.search_batch(texts)) == [
+        (0, 2, 4, 'state'),
+        (0, 3, 4, 'town'),
+        (2, 0, 1, 'town'),
+    ]
+
+
+def test_search_batch_follows_updates() -> None:
+    pytest.importorskip('numpy')
+    trie = Trie(KEYS)
+    assert len(trie.search_batch(['hers'])) == 2
+    trie['r'] = 5
+    assert sorted(trie.search_batch(['hers'])) == [
+        (0, 0, 2, 1),
+        (0, 0, 4, 4),
+        (0, 2, 3, 5),
+    ]
+
+
+def test_search_batch_empty() -> None:
+    pytest.importorskip('numpy')
+    assert len(Trie().search_batch(['abc'])) == 0
+    assert len(Trie(KEYS).search_batch([])) == 0
@@ -203,7 +203,8 @@ def test_trie_dot_keys(simple_trielike, simple_trie_keys) -> None:
 def test_trie_dot_values(simple_trielike, simple_trie_keys) -> None:
     vals = simple_trielike.values()
 
-    assert type(vals) is ValuesView
+    assert isinstance(vals, ValuesView)
+    assert len(vals) == len(simple_trie_keys)
     assert set(vals) == {default_value(k) for k in simple_trie_keys}
 
 
@@ -435,3 +436,60 @@ def test_tuple_trie_extend_key(simple_tuple_trie, simple_trie_keys) -> None:
                 key for key in simple_trie_keys if explore_key[:2] == key[:2]
             ]
             assert set(explored_keys) == set(keys_to_explore)
+
+
+def test_trie_prefix_view(simple_mutable_trielike, simple_trie_keys) -> None:
+    prefix = simple_trie_keys[1][:2]
+    expected = {
+        key: default_value(key)
+        for key in simple_trie_keys
+        if key[:2] == prefix
+    }
+    view = simple_mutable_trielike.prefix_view(prefix)
+
+    assert len(view) == len(expected)
+    assert all(view[key] == value for key, value in expected.items())
+    assert all(key in view for key in view)
+    assert sorted(view.values()) == sorted(expected.values())
+    assert sorted(value for _, value in view.items()) == sorted(expected.values())
+    assert simple_trie_keys[0] not in view
+
+    new_key = prefix + prefix
+    simple_mutable_trielike[new_key] = 'new_val'
+    assert len(view) == len(expected) + 1
+    assert view[new_key] == 'new_val'
+
+
+def test_trie_prefix_view_sizes_follow_updates(
+    simple_mutable_trielike,
+    simple_trie_keys,
+) -> None:
+    trie = simple_mutable_trielike
+    root_view = trie.prefix_view(simple_trie_keys[0][:1])
+    view_len = len(root_view)
+
+    assert view_len == len(list(root_view))
+    del trie[simple_trie_keys[0]]
+    assert len(root_view) == view_len - 1
+    assert len(trie) == trie.count() == len(simple_trie_keys) - 1
+    trie[simple_trie_keys[0]] = 1
+    trie[simple_trie_keys[0]] = 2  # updating a value does not change sizes
+    assert len(root_view) == view_len
+    assert len(trie) == len(simple_trie_keys)
+
+
+def test_trie_prefix_view_missing_prefix(simple_trielike, missing_key) -> None:
+    view = simple_trielike.prefix_view(missing_key)
+
+    assert len(view) == 0
+    assert list(view) == []
+    with pytest.raises(KeyError):
+        view.sample()
+
+
+def test_trie_prefix_view_sample(simple_trielike, simple_trie_keys) -> None:
+    view = simple_trielike.prefix_view('ab')
+    expected = sorted(key for key in simple_trie_keys if key.startswith('ab'))
+    samples = [view.sample(lambda i=i: i / len(expected)) for i in range(len(expected))]
+
+    assert sorted(samples) == expected
@@ -0,0 +1,96 @@
+"""Tests for PrefixTable, longest prefix match of IP networks."""
+import ipaddress
+
+import pytest
+
+from triematch.iptable import PrefixTable
+
+
+def brute_force(routes: dict, address: int, bits: int=32) -> tuple:
+    best = None
+    for (network, length), value in routes.items():
+        if address >> (bits - length) << (bits - length) == network and (
+            best is None or length > best[0]
+        ):
+            best = (length, value)
+    return best
+
+
+def test_prefix_table_longest_prefix() -> None:
+    routes = PrefixTable({
+        '0.0.0.0/0': 'default',
+        '10.0.0.0/8': 'internal',
+        '10.32.0.0/19': 'office',
+        '10.32.7.0/24': 'lab',
+        '10.32.7.1/32': 'host',
+    })
+
+    assert routes.longest_prefix('10.32.7.1') == (32, 'host')
+    assert routes.longest_prefix('10.32.7.2') == (24, 'lab')
+    assert routes.longest_prefix('10.32.31.255') == (19, 'office')
+    assert routes.longest_prefix('10.32.32.0') == (8, 'internal')
+    assert routes.longest_prefix((192, 168, 0, 1)) == (0, 'default')
+    assert routes.longest_prefix(ipaddress.ip_address('10.1.1.1')) == (8, 'internal')
+    assert list(routes.match('10.32.7.9')) == [
+        (0, 'default'), (8, 'internal'), (19, 'office'), (24, 'lab'),
+    ]
+
+
+@pytest.mark.parametrize('stride', [1, 4, 8, 16])
+def test_prefix_table_updates_like_brute_force(stride) -> None:
+    networks = [
+        (0x0A000000, 8), (0x0A200000, 11), (0x0A200000, 19), (0x0A200700, 24),
+        (0x0A200701, 32), (0x00000000, 0), (0x0A200000, 12), (0x0A200400, 22),
+    ]
+    addresses = [0x0A200701, 0x0A200702, 0x0A2007FF, 0x0A2004FF, 0x0A3F0000, 0x0B000000]
+    table = PrefixTable(stride=stride)
+    routes = {}
+    for i, network in enumerate(networks):
+        table[network] = routes[network] = i
+        assert table.longest_prefixes(addresses) == [
+            brute_force(routes, address) for address in addresses
+        ]
+    for network in networks[::-1]:
+        del table[network]
+        del routes[network]
+        assert table.longest_prefixes(addresses) == [
+            brute_force(routes, address) for address in addresses
+        ]
+    assert len(table) == 0
+
+
+def test_prefix_table_ipv6() -> None:
+    routes = PrefixTable({'2001:db8::/32': 'doc', '2001:db8:1::/48': 'site'}, version=6)
+    assert routes.longest_prefix('2001:db8:1::7') == (48, 'site')
+    assert routes.longest_prefix('2001:db8:2::7') == (32, 'doc')
+    assert routes.longest_prefix('2001:db9::', 'none') == 'none'
+
+
+def test_prefix_table_is_a_mapping() -> None:
+    routes = PrefixTable({'10.0.0.0/8': 1})
+    routes[(0x0A200000, 19)] = 2
+    routes['10.0.0.0/8'] = 3
+
+    assert len(routes) == 2
+    assert routes['10.32.0.0/19'] == 2
+    assert '10.0.0.0/8' in routes
+    assert '10.0.0.0/9' not in routes
+    assert list(routes) == [
+        ipaddress.ip_network('10.0.0.0/8'),
+        ipaddress.ip_network('10.32.0.0/19'),
+    ]
+    assert repr(routes) == "PrefixTable({'10.0.0.0/8': 3, '10.32.0.0/19': 2})"
+    with pytest.raises(KeyError):
+        routes['10.1.0.0/16']
+    with pytest.raises(KeyError):
+        del routes['10.1.0.0/16']
+
+
+def test_prefix_table_rejects_bad_networks() -> None:
+    routes = PrefixTable()
+    with pytest.raises(ValueError, match='host bits'):
+        routes[(0x0A000001, 8)] = 1
+    with pytest.raises(ValueError, match='IPv4'):
+        routes['2001:db8::/32'] = 1
+    with pytest.raises(ValueError, match='stride'):
+        PrefixTable(stride=5)
@@ -0,0 +1,102 @@
+"""Tests for MultiTrie and Postings."""
+import pytest
+
+from triematch.multi import MultiTrie
+from triematch.multi import MultiTupleTrie
+from triematch.multi import Postings
+from triematch.symbols import SymbolTable
+
+
+def postings_dict(trie) -> dict:
+    return {key: list(postings) for key, postings in trie.items()}
+
+
+def test_postings_are_sorted_ids() -> None:
+    payloads = SymbolTable(['a', 'b', 'c'])
+    postings = Postings(payloads, [2, 0, 2])
+    assert list(postings.ids) == [0, 2]
+    assert list(postings) == ['a', 'c']
+    assert postings[1] == 'c'
+    assert 'c' in postings
+    assert 'b' not in postings
+    assert 'z' not in postings
+    assert postings.add('b')
+    assert not postings.add('b')
+    assert list(postings.ids) == [0, 1, 2]
+    assert postings.update_ids([5, 4])
+    assert not postings.update_ids([0, 4])
+    assert list(postings.ids) == [0, 1, 2, 4, 5]
+    postings.remove('a')
+    with pytest.raises(KeyError):
+        postings.remove('a')
+
+
+def test_multi_trie_add_and_remove() -> None:
+    trie = MultiTrie()
+    trie.add('python', 'doc1')
+    trie.add('python', 'doc7')
+    trie.add('python', 'doc1')
+    trie.add('py', 'doc2')
+    assert len(trie) == 2
+    assert postings_dict(trie) == {'py': ['doc2'], 'python': ['doc1', 'doc7']}
+
+    trie.remove('python', 'doc1')
+    trie.remove('py', 'doc2')
+    assert postings_dict(trie) == {'python': ['doc7']}
+    with pytest.raises(KeyError):
+        trie.remove('python', 'doc1')
+    with pytest.raises(KeyError):
+        trie.remove('java', 'doc1')
+
+
+def test_multi_trie_set_values_and_copy() -> None:
+    trie = MultiTrie({'ab': ['x', 'y', 'x'], 'b': 'z'})
+    assert postings_dict(trie) == {'ab': ['x', 'y'], 'b': ['z']}
+    copied = trie.copy()
+    copied.add('ab', 'w')
+    assert copied.payloads is trie.payloads
+    assert list(trie['ab']) == ['x', 'y']
+    assert list(copied['ab']) == ['x', 'y', 'w']
+
+
+@pytest.mark.parametrize('linking', ['none', 'links', 'dfa'])
+def test_multi_trie_search(linking) -> None:
+    trie = MultiTrie({'he': [1, 2], 'she': [3], 'hers': [2, 4]})
+    if linking == 'links':
+        trie.link_nodes()
+    elif linking == 'dfa':
+        trie.compile_dfa()
+
+    matches = sorted(trie.search('ushers'))
+    assert [(start, end, list(values)) for start, end, values in matches] == [
+        (1, 4, [3]), (2, 4, [1, 2]), (2, 6, [2, 4]),
+    ]
+    assert all(isinstance(values, Postings) for _, _, values in matches)
+    assert trie.count_matches('ushers he') == {1: 2, 2: 3, 3: 1, 4: 1}
+
+
+@pytest.mark.parametrize('shared', [False, True])
+def test_multi_trie_merge(shared) -> None:
+    first = MultiTrie({'ab': ['x'], 'abc': ['y']})
+    payloads = first.payloads if shared else None
+    second = MultiTrie({'ab': ['z', 'x'], 'b': ['y'], 'abcd': ['w']}, payloads=payloads)
+    first.merge(second)
+
+    assert postings_dict(first) == {
+        'ab': ['x', 'z'], 'abc': ['y'], 'abcd': ['w'], 'b': ['y'],
+    }
+    assert len(first) == 4
+    assert len(first.prefix_view('abc')) == 2
+    assert set(second['ab']) == {'x', 'z'}
+    assert len(second) == 3
+
+
+def test_multi_trie_merge_mapping_and_read_only() -> None:
+    trie = MultiTupleTrie({('new', 'york'): ['NY']})
+    trie.merge({('new', 'york'): ['NYC'], ('york',): ['UK']})
+    assert postings_dict(trie) == {('new', 'york'): ['NY', 'NYC'], ('york',): ['UK']}
+    trie.link_nodes()
+    with pytest.raises(AttributeError):
+        trie.add(('paris',), 'FR')
+    with pytest.raises(AttributeError):
+        trie.merge(MultiTupleTrie())
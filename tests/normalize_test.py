@@ -0,0 +1,121 @@
+"""Tests for NormalizedTrie."""
+import pytest
+
+from triematch import Trie
+from triematch.normalize import casefold
+from triematch.normalize import nfkc
+from triematch.normalize import NormalizedTrie
+from triematch.normalize import strip_accents
+
+TEXT = 'Große Straße, Café'
+
+
+def street_trie() -> NormalizedTrie:
+    return NormalizedTrie(
+        {'strasse': 'street', 'cafe': 'coffee'},
+        normalizers=(casefold, strip_accents),
+    )
+
+
+def test_normalizers() -> None:
+    assert casefold('Straße') == 'strasse'
+    assert nfkc('ﬁＡ') == 'fiA'
+    assert strip_accents('Crème brûlée') == 'Creme brulee'
+
+
+def test_normalized_keys() -> None:
+    trie = street_trie()
+    assert trie['STRASSE'] == 'street'
+    assert 'Café' in trie
+    assert 'cafes' not in trie
+    assert sorted(trie) == ['cafe', 'strasse']
+    trie['CAFÉ'] = 'espresso'
+    assert len(trie) == 2
+    del trie['Cafe']
+    assert dict(trie.items()) == {'strasse': 'street'}
+    assert trie.copy().normalizers == trie.normalizers
+
+
+@pytest.mark.parametrize('linking', ['none', 'links', 'dfa'])
+def test_normalized_search_keeps_offsets(linking) -> None:
+    trie = street_trie()
+    if linking == 'links':
+        trie.link_nodes()
+    elif linking == 'dfa':
+        trie.compile_dfa()
+
+    assert sorted(trie.search(TEXT)) == [(6, 12, 'street'), (14, 18, 'coffee')]
+    assert sorted(trie.search_iter(iter(TEXT))) == sorted(trie.search(TEXT))
+    assert TEXT[6:12] == 'Straße'
+    assert trie.contains_any('CAFÉ')
+    assert not trie.contains_any('Strase')
+    assert trie.count_matches('Cafe café') == {'coffee': 2}
+
+
+def test_normalized_search_expanding_characters() -> None:
+    trie = NormalizedTrie({'fi': 1, 'office': 2, 'ss': 3}, normalizers=(nfkc, casefold))
+    assert sorted(trie.search('Oﬃce Maß')) == [(0, 4, 2), (1, 2, 1), (7, 8, 3)]
+    assert list(trie.match('OFFICE hours')) == [(6, 2)]
+
+
+def test_normalized_search_matches_lowered_copy() -> None:
+    keys = ['he', 'She', 'HIS', 'hers']
+    trie = NormalizedTrie(dict.fromkeys(keys, 1))
+    lowered = Trie(dict.fromkeys((key.casefold() for key in keys), 1))
+    text = 'uSHErs and HIS Hershey'
+    assert sorted(trie.search(text)) == sorted(lowered.search(text.casefold()))
+
+
+def test_normalized_search_batch() -> None:
+    pytest.importorskip('numpy')
+    trie = street_trie()
+    assert list(trie.search_batch([TEXT, 'CAFE'])) == [
+        (0, 6, 12, 'street'),
+        (0, 14, 18, 'coffee'),
+        (1, 0, 4, 'coffee'),
+    ]
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_normalized_search_boundaries(linked) -> None:
+    trie = NormalizedTrie({'strasse': 'street', 'ss': 's', 'cafe': 'coffee'})
+    if linked:
+        trie.link_nodes()
+    text = 'Große Straße. Maß CAFE_'
+    assert list(trie.search(text, boundaries='word')) == [(6, 12, 'street')]
+    assert list(trie.search(text, boundaries={' ', '_'})) == [(18, 22, 'coffee')]
+
+
+def test_normalized_prefix_lookups() -> None:
+    trie = NormalizedTrie({'hello': 1, 'help': 2, 'strasse': 3})
+    assert trie.longest_prefix('HELLO world') == (5, 1)
+    assert trie.shortest_prefix('HELPing') == (4, 2)
+    assert trie.longest_prefix('Straße!') == (6, 3)
+    assert trie.longest_prefix('HEL', 'none') == 'none'
+    assert trie.shortest_prefix('World') is None
+
+
+def test_normalized_prefix_views() -> None:
+    trie = NormalizedTrie({'hello': 1, 'help': 2, 'world': 3})
+    expected = {'hello': 1, 'help': 2}
+    assert dict(trie.expand('HE')) == expected
+    assert dict(trie.items('HE')) == expected
+    assert dict(trie.prefix_view('HE')) == expected
+    assert trie.prefix_view('HE').sample() in expected
+    assert trie.complete('HE') == [('help', 2), ('hello', 1)]
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_normalized_instrumented_search(linked) -> None:
+    trie = street_trie()
+    if linked:
+        trie.link_nodes()
+    assert list(trie.instrumented_search(TEXT)) == list(trie.search(TEXT))
+    assert list(trie.instrumented_search('')) == []
+
+
+def test_normalized_fuzzy_and_glob() -> None:
+    trie = street_trie()
+    assert list(trie.fuzzy('STRASE')) == [('strasse', 'street', 1)]
+    assert list(trie.glob('CAF?')) == [('cafe', 'coffee')]
+    assert list(trie.glob('Straß*')) == [('strasse', 'street')]
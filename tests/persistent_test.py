@@ -0,0 +1,67 @@
+"""Tests for PersistentTrie."""
+import pytest
+
+from triematch import Trie
+from triematch.persistent import PersistentTrie
+
+
+def node_ids(trie) -> set[int]:
+    nodes = [trie.data]
+    ids = set()
+    while nodes:
+        node = nodes.pop()
+        ids.add(id(node))
+        nodes.extend(node.values())
+    return ids
+
+
+def test_persistent_trie_set_returns_new_version() -> None:
+    first = PersistentTrie({'hello': 1, 'help': 2})
+    second = first.set('helium', 3)
+    third = second.set('hello', 4)
+
+    assert dict(first.items()) == {'hello': 1, 'help': 2}
+    assert dict(second.items()) == {'hello': 1, 'help': 2, 'helium': 3}
+    assert dict(third.items()) == {'hello': 4, 'help': 2, 'helium': 3}
+    assert (len(first), len(second), len(third)) == (2, 3, 3)
+    assert len(third.prefix_view('hel')) == 3
+    # only the path of the key is copied
+    assert first.data['h']['e']['l']['p'] is second.data['h']['e']['l']['p']
+    assert len(node_ids(first) & node_ids(second)) == 3
+
+
+def test_persistent_trie_delete() -> None:
+    first = PersistentTrie({'hello': 1, 'help': 2, 'he': 3})
+    second = first.delete('hello')
+    third = second.delete('help')
+
+    assert dict(first.items()) == {'hello': 1, 'help': 2, 'he': 3}
+    assert dict(second.items()) == {'help': 2, 'he': 3}
+    assert dict(third.items()) == {'he': 3}
+    assert third.node_count() == 3
+    assert len(third) == 1
+    with pytest.raises(KeyError):
+        first.delete('hell')
+
+
+def test_persistent_trie_is_read_only() -> None:
+    trie = PersistentTrie({'he': 1, 'she': 2})
+    with pytest.raises(AttributeError):
+        trie['hers'] = 3
+    with pytest.raises(AttributeError):
+        del trie['he']
+    with pytest.raises(AttributeError):
+        trie |= {'hers': 3}
+    with pytest.raises(AttributeError):
+        trie.link_nodes()
+    with pytest.raises(AttributeError):
+        trie.minimize()
+
+    assert sorted(trie.search('ushe')) == [(1, 4, 2), (2, 4, 1)]
+    assert list(trie.match('hello')) == [(2, 1)]
+
+    copied = trie.copy()
+    assert type(copied) is Trie
+    copied.link_nodes()
+    assert sorted(copied.search('ushe')) == [(1, 4, 2), (2, 4, 1)]
+    assert dict((trie | {'hers': 3}).items()) == {'he': 1, 'she': 2, 'hers': 3}
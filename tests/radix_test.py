@@ -6,6 +6,7 @@ Such tests are included in trie-like and dict-like tests.
 """
 from tests.test_utils import default_value
 from triematch.radix import Radix
+from triematch.trie import new_search_stats
 
 
 def test_radix_iternal_struct() -> None:
@@ -26,3 +27,45 @@ def test_radix_iternal_struct() -> None:
 
     assert 'd' in trie.data['a']['bc']
     assert 'ef' in trie.data['a']['bc']
+
+
+def test_radix_inner_node_is_not_a_key() -> None:
+    trie = Radix({'abc': 1, 'abd': 2})
+
+    assert 'ab' not in trie
+    assert trie.get('ab', None) is None
+    assert trie.data['ab'].size == 2
+
+
+def test_radix_prefix_view_inside_edge() -> None:
+    keys = ['abcde', 'abcdf', 'xyz']
+    trie = Radix({key: default_value(key) for key in keys})
+    view = trie.prefix_view('abc')
+
+    assert len(view) == 2
+    assert dict(view) == {key: default_value(key) for key in keys[:2]}
+    assert len(trie.prefix_view('abx')) == 0
+
+
+def test_radix_instrumented_search() -> None:
+    trie = Radix({'he': 3, 'help': 2, 'hello': 1})
+    stats = new_search_stats()
+
+    matches = list(trie.instrumented_search('xhelpx', stats))
+
+    assert matches == list(trie.search('xhelpx')) == [(1, 3, 3), (1, 5, 2)]
+    assert stats['characters'] == 6
+    assert stats['transitions'] == 3  # he -> l -> p, one per edge
+    assert stats['matches'] == 2
+
+
+def test_radix_linked_search_matches_unlinked() -> None:
+    keys = ['abc', 'bc', 'c', 'ab', 'xab', 'cab']
+    text = 'xabcabcxab'
+    trie = Radix({key: default_value(key) for key in keys})
+    expected = list(trie.search(text))
+    trie.link_nodes()
+
+    assert list(trie.search(text)) == expected
+    assert list(trie.instrumented_search(text)) == expected
+    assert list(trie.search_iter(text)) == expected
@@ -0,0 +1,165 @@
+"""Tests for SymbolTable and EncodedTupleTrie."""
+import pickle
+from array import array
+
+import pytest
+
+from triematch import EncodedTupleTrie
+from triematch import SymbolTable
+from triematch import TupleTrie
+from triematch.wildcard import ANY_RUN
+from triematch.wildcard import ItemSet
+
+GAZETTEER = {
+    ('new', 'york'): 'state',
+    ('new', 'york', 'city'): 'city',
+    ('york',): 'town',
+}
+TEXT = ('i', 'love', 'new', 'york', 'city', 'and', 'york')
+
+
+def test_symbol_table_ids_are_dense() -> None:
+    symbols = SymbolTable(['a', 'b'])
+    assert symbols.add('c') == 2
+    assert symbols.add('a') == 0
+    assert len(symbols) == 3
+    assert list(symbols) == ['a', 'b', 'c']
+    assert symbols['b'] == 1
+    assert 'z' not in symbols
+    with pytest.raises(KeyError):
+        symbols['z']
+
+
+def test_symbol_table_encode_decode() -> None:
+    symbols = SymbolTable(['new', 'york'])
+    assert symbols.encode(['york', 'city', 'new']) == array('i', [1, -1, 0])
+    assert symbols.decode([1, 0]) == ('york', 'new')
+    assert symbols.token(1) == 'york'
+
+
+def test_symbol_table_pickle() -> None:
+    symbols = pickle.loads(pickle.dumps(SymbolTable(['a', 'b'])))
+    assert symbols.get('b') == 1
+    assert symbols.add('c') == 2
+
+
+def test_encoded_trie_stores_ids() -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    assert set(trie.data) == {trie.symbols['new'], trie.symbols['york']}
+    assert dict(trie.items()) == GAZETTEER
+    assert trie['new', 'york'] == 'state'
+    assert ('new', 'jersey') not in trie
+    assert len(trie) == 3
+
+
+def test_encoded_trie_shares_symbols() -> None:
+    symbols = SymbolTable()
+    first = EncodedTupleTrie({('a', 'b'): 1}, symbols=symbols)
+    second = EncodedTupleTrie({('b', 'c'): 2}, symbols=symbols)
+    assert list(symbols) == ['a', 'b', 'c']
+    assert first.copy().symbols is symbols
+    assert dict(second.items()) == {('b', 'c'): 2}
+
+
+def test_encoded_trie_delete() -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    del trie['new', 'york', 'city']
+    assert dict(trie.items()) == {('new', 'york'): 'state', ('york',): 'town'}
+    with pytest.raises(KeyError):
+        del trie['new', 'jersey']
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_encoded_trie_search(linked) -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    expected = TupleTrie(GAZETTEER)
+    if linked:
+        trie.link_nodes()
+        expected.link_nodes()
+    ids = trie.symbols.encode(TEXT)
+
+    assert sorted(trie.search(TEXT)) == sorted(expected.search(TEXT))
+    assert sorted(trie.search(ids, encoded=True)) == sorted(expected.search(TEXT))
+    assert sorted(trie.search_iter(iter(TEXT))) == sorted(expected.search(TEXT))
+    assert sorted(trie.search_iter(ids, encoded=True)) == sorted(
+        expected.search(TEXT),
+    )
+
+
+@pytest.mark.parametrize('linking', ['none', 'links', 'dfa'])
+def test_encoded_trie_contains_any_and_count_matches(linking) -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    if linking == 'links':
+        trie.link_nodes()
+    elif linking == 'dfa':
+        trie.compile_dfa()
+    ids = trie.symbols.encode(TEXT)
+    expected = {'state': 1, 'city': 1, 'town': 2}
+
+    assert trie.contains_any(TEXT)
+    assert trie.contains_any(ids, encoded=True)
+    assert not trie.contains_any(('i', 'love', 'jersey'))
+    assert trie.count_matches(TEXT) == expected
+    assert trie.count_matches(ids, encoded=True) == expected
+    assert trie.count_matches(('new', 'jersey')) == {}
+
+
+def test_encoded_trie_match() -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    ids = trie.symbols.encode(TEXT[2:])
+    assert list(trie.match(TEXT[2:])) == [(2, 'state'), (3, 'city')]
+    assert list(trie.match(ids, encoded=True)) == [(2, 'state'), (3, 'city')]
+    assert trie.longest_prefix(TEXT[2:]) == (3, 'city')
+
+
+def test_encoded_trie_numpy_text() -> None:
+    numpy = pytest.importorskip('numpy')
+    trie = EncodedTupleTrie(GAZETTEER)
+    ids = numpy.array(trie.symbols.encode(TEXT), dtype=numpy.int32)
+    assert sorted(trie.search(ids, encoded=True)) == [
+        (2, 4, 'state'),
+        (2, 5, 'city'),
+        (3, 4, 'town'),
+        (6, 7, 'town'),
+    ]
+
+
+def test_encoded_trie_fuzzy_and_glob() -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    assert sorted(trie.fuzzy(('new', 'yorks'), 1)) == [(('new', 'york'), 'state', 1)]
+    assert sorted(trie.glob((ItemSet(['new', 'old']), ANY_RUN))) == [
+        (('new', 'york'), 'state'),
+        (('new', 'york', 'city'), 'city'),
+    ]
+
+
+def test_encoded_trie_linked_is_read_only() -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    trie.link_nodes()
+    with pytest.raises(AttributeError):
+        trie['los', 'angeles'] = 'city'
+    assert 'los' not in trie.symbols
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_encoded_trie_search_boundaries(linked) -> None:
+    trie = EncodedTupleTrie(GAZETTEER)
+    if linked:
+        trie.link_nodes()
+    text = ('new', 'york', ',', 'york', 'city')
+    ids = trie.symbols.encode(text)
+    assert list(trie.search(text, boundaries='word')) == [(0, 2, 'state')]
+    assert list(trie.search(ids, encoded=True, boundaries={-1})) == [(0, 2, 'state')]
+
+
+def test_encoded_trie_union_translates_symbols() -> None:
+    symbols = SymbolTable()
+    first = EncodedTupleTrie({('new', 'york'): 'state'}, symbols=symbols)
+    shared = EncodedTupleTrie({('york',): 'town'}, symbols=symbols)
+    other = EncodedTupleTrie({('york',): 'city', ('new',): 'new'})
+    assert dict((first | shared).items()) == {
+        ('new', 'york'): 'state', ('york',): 'town',
+    }
+    assert dict((first | other).items()) == {
+        ('new', 'york'): 'state', ('york',): 'city', ('new',): 'new',
+    }
@@ -3,8 +3,13 @@ Tests for Trie-like classes.
 
 These tests check general behavior of Trie class and its subclasses.
 """
+import pickle
+import re
+import sys
 from types import GeneratorType
 
+import pytest
+
 from tests.test_utils import default_value
 from tests.test_utils import print_nested
 from triematch import Trie
@@ -174,6 +179,122 @@ def test_trie_to_regex7(strtrie_like_class) -> None:
     assert pattern == 'abb(?:bbcc|c)'
 
 
+def test_trie_to_regex_shared_suffix(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'abc': 1, 'adc': 1, 'xyzq': 1, 'wyzq': 1})
+    pattern = trie.to_regex()
+    assert pattern == '[wx]yzq|a[bd]c'
+
+
+def test_trie_to_regex_partially_shared_suffix(strtrie_like_class) -> None:
+    keys = ['jumping', 'running', 'talked', 'walked', 'walking']
+    trie = strtrie_like_class(dict.fromkeys(keys, 1))
+    pattern = trie.to_regex()
+    assert pattern == '(?:jump|runn)ing|talked|walk(?:ed|ing)'
+
+
+def test_trie_to_regex_deep_key(strtrie_like_class) -> None:
+    """Long keys should not hit the recursion limit."""
+    trie = strtrie_like_class({'a' * 5000: 1, 'a' * 3000 + 'b': 1})
+    pattern = trie.to_regex()
+    assert pattern == 'a' * 3000 + '(?:' + 'a' * 2000 + '|b)'
+
+
+def test_trie_to_regex_escapes_keys(strtrie_like_class) -> None:
+    keys = ['a.b', 'a(c', '[x]', 'q+']
+    trie = strtrie_like_class(dict.fromkeys(keys, 1))
+    pattern = trie.to_regex()
+
+    assert pattern == r'\[x\]|a(?:\(c|\.b)|q\+'
+    assert {match.group() for match in re.finditer(pattern, 'a.b axb [x] q+')} == {
+        'a.b', '[x]', 'q+',
+    }
+
+
+def test_trie_to_regex_character_ranges(strtrie_like_class) -> None:
+    trie = strtrie_like_class(dict.fromkeys('abcdxz-]', 1))
+    pattern = trie.to_regex()
+    assert pattern == r'[\-\]a-dxz]'
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason='atomic groups need 3.11')
+def test_trie_to_regex_atomic_groups(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'abc': 1, 'adc': 1, 'aef': 1, 'x': 1})
+    pattern = trie.to_regex(atomic=True)
+
+    assert pattern == 'a(?>[bd]c|ef)|x'
+    assert trie.compiled_regex(atomic=True).findall('aef adc abd x') == [
+        'aef', 'adc', 'x',
+    ]
+
+
+def test_trie_compiled_regex_is_cached(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'ab': 1, 'ac': 1})
+    pattern = trie.compiled_regex()
+
+    assert pattern.pattern == trie.to_regex()
+    assert trie.compiled_regex() is pattern
+    assert trie.compiled_regex(re.IGNORECASE) is not pattern
+    assert trie.compiled_regex(re.IGNORECASE).flags & re.IGNORECASE
+
+
+def test_trie_compiled_regex_invalidation(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'ab': 1, 'ac': 1})
+    pattern = trie.compiled_regex()
+
+    trie['de'] = 1
+    assert trie.compiled_regex() is not pattern
+    assert trie.compiled_regex().fullmatch('de')
+
+    del trie['ab']
+    assert not trie.compiled_regex().fullmatch('ab')
+
+
+def test_trie_minimize_shares_suffixes(strtrie_like_class) -> None:
+    stems = ['walk', 'talk', 'jump', 'play', 'call']
+    keys = [stem + suffix for stem in stems for suffix in ('', 's', 'ed', 'ing')]
+    trie = strtrie_like_class(dict.fromkeys(keys, True))
+    node_count = trie.node_count()
+    pattern = trie.to_regex()
+
+    trie.minimize()
+
+    assert trie.node_count() < node_count / 2
+    assert len(trie) == len(keys)
+    assert all(trie[key] is True for key in keys)
+    assert 'walke' not in trie
+    assert list(trie.match('walking')) == [(4, True), (7, True)]
+    assert {key for key, _ in trie.expand('ta')} == {
+        key for key in keys if key.startswith('ta')
+    }
+    assert trie.to_regex() == pattern
+
+
+def test_trie_minimize_keeps_different_values(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'ab': 1, 'cb': 2, 'db': 1, 'eb': [1], 'fb': [1]})
+    trie.minimize()
+
+    assert dict(trie) == {'ab': 1, 'cb': 2, 'db': 1, 'eb': [1], 'fb': [1]}
+    assert trie['ab'] is trie['db']
+    assert trie['eb'] is not trie['fb']
+
+
+def test_trie_minimize_is_read_only(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'ab': 1, 'cb': 1})
+    trie.minimize()
+
+    with pytest.raises(AttributeError):
+        trie['db'] = 1
+    with pytest.raises(AttributeError):
+        del trie['ab']
+    with pytest.raises(AttributeError):
+        trie.link_nodes()
+
+    trie2 = trie.copy()
+    trie2['db'] = 1
+    assert 'db' not in trie
+    assert trie2 == {'ab': 1, 'cb': 1, 'db': 1}
+
+
 def test_trie_match(strtrie_like_class) -> None:
 
     keys = [
@@ -234,4 +355,286 @@ def test_trie_expand(strtrie_like_class) -> None:
     trie = strtrie_like_class({key: default_value(key) for key in keys})
 
     results = list(trie.expand('ab'))
-    print(results)
+    assert sorted(results) == sorted(
+        (key, default_value(key)) for key in keys if key.startswith('ab')
+    )
+
+
+def test_trie_expand_partial_and_full_node(strtrie_like_class) -> None:
+    keys = ['abc', 'abcd', 'abxy', 'b']
+    trie = strtrie_like_class({key: default_value(key) for key in keys})
+
+    for prefix in ('a', 'ab', 'abc', 'abx', 'abxy'):
+        assert sorted(trie.expand(prefix)) == sorted(
+            (key, default_value(key)) for key in keys if key.startswith(prefix)
+        ), f'wrong keys for {prefix=}'
+
+
+def test_trie_items_deep_key(strtrie_like_class) -> None:
+    keys = ['a' * 5000, 'a' * 2500 + 'b', 'c']
+    trie = strtrie_like_class(dict.fromkeys(keys, 1))
+    assert sorted(trie) == sorted(keys)
+
+
+def test_trie_complete_top_k(strtrie_like_class) -> None:
+    weights = {'app': 9, 'apple': 5, 'apply': 3, 'ape': 7, 'apex': 1, 'banana': 10}
+    trie = strtrie_like_class(weights)
+
+    assert trie.complete('ap', 3) == [('app', 9), ('ape', 7), ('apple', 5)]
+    assert trie.complete('', 2) == [('banana', 10), ('app', 9)]
+    assert trie.complete('appl', 5) == [('apple', 5), ('apply', 3)]
+    assert trie.complete('zz', 5) == []
+    assert trie.complete('ap', 0) == []
+
+    def shortest(value: int) -> int:
+        return -value
+    assert trie.complete('ap', 2, score=shortest) == [('apex', 1), ('apply', 3)]
+
+
+def test_trie_complete_follows_updates(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'app': 9, 'apple': 5, 'apex': 1})
+    assert trie.complete('ap', 1) == [('app', 9)]
+
+    trie['apex'] = 100
+    assert trie.complete('ap', 1) == [('apex', 100)]
+    trie['apt'] = 200
+    assert trie.complete('ap', 1) == [('apt', 200)]
+    del trie['apt']
+    del trie['apex']
+    assert trie.complete('ap', 2) == [('app', 9), ('apple', 5)]
+
+
+def test_trie_pickle_round_trip(strtrie_like_class) -> None:
+    weights = {'app': 9, 'apple': 5, 'apex': 1, 'banana': 10}
+    trie = strtrie_like_class(weights)
+    trie.complete('ap', 1, score=lambda value: -value)  # not picklable
+
+    copied = pickle.loads(pickle.dumps(trie))
+    assert dict(copied) == weights
+    assert 'ap' not in copied
+    assert len(copied.prefix_view('ap')) == 3
+    assert copied.complete('ap', 2) == [('app', 9), ('apple', 5)]
+    assert list(copied.search('xapex')) == list(trie.search('xapex'))
+    copied['apt'] = 2
+    assert sorted(copied.prefix_view('ap')) == ['apex', 'app', 'apple', 'apt']
+
+
+def test_trie_pickle_round_trip_linked(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'a': 1, 'aa': 2, 'abc': 3, 'bc': 4, 'c': 5})
+    text = 'aabcaa'
+    expected = list(trie.search(text))
+    trie.link_nodes(flatten_outputs=True)
+
+    copied = pickle.loads(pickle.dumps(trie))
+    assert list(copied.search(text)) == expected
+    assert copied.count_matches(text) == trie.count_matches(text)
+
+
+def test_trie_fuzzy(strtrie_like_class) -> None:
+    keys = ['hello', 'help', 'hell', 'yellow', 'world', 'word', 'h']
+    trie = strtrie_like_class({key: default_value(key) for key in keys})
+
+    assert sorted(trie.fuzzy('helo', 1)) == [
+        ('hell', default_value('hell'), 1),
+        ('hello', default_value('hello'), 1),
+        ('help', default_value('help'), 1),
+    ]
+    assert sorted(key for key, _, _ in trie.fuzzy('wrld', 2)) == ['word', 'world']
+    assert list(trie.fuzzy('word', 0)) == [('word', default_value('word'), 0)]
+    assert list(trie.fuzzy('', 1)) == [('h', default_value('h'), 1)]
+    assert list(trie.fuzzy('xyzzy', 2)) == []
+
+
+def test_trie_glob(strtrie_like_class) -> None:
+    keys = ['user_1_id', 'user_22_id', 'user_x_id', 'users', 'admin', 'a?b']
+    trie = strtrie_like_class({key: default_value(key) for key in keys})
+
+    def glob(pattern: str) -> list:
+        return sorted(key for key, _ in trie.glob(pattern))
+
+    assert glob('user_?_id') == ['user_1_id', 'user_x_id']
+    assert glob('user_[0-9]*') == ['user_1_id', 'user_22_id']
+    assert glob('user_[!0-9]*') == ['user_x_id']
+    assert glob('*s') == ['users']
+    assert glob('a\\?b') == ['a?b']
+    assert glob('admin') == ['admin']
+    assert glob('*') == sorted(keys)
+    assert glob('x*') == []
+    assert list(trie.glob('admin')) == [('admin', default_value('admin'))]
+
+
+def test_trie_longest_and_shortest_prefix(strtrie_like_class) -> None:
+    routes = ['/', '/api', '/api/v1', '/api/v1/users', '/static']
+    trie = strtrie_like_class({route: default_value(route) for route in routes})
+
+    assert trie.longest_prefix('/api/v1/users/7') == (
+        13, default_value('/api/v1/users'),
+    )
+    assert trie.longest_prefix('/api/v2') == (4, default_value('/api'))
+    assert trie.longest_prefix('/api/v1') == (7, default_value('/api/v1'))
+    assert trie.shortest_prefix('/api/v1/users/7') == (1, default_value('/'))
+    assert trie.longest_prefix('api', 'none') == 'none'
+    assert trie.shortest_prefix('api') is None
+
+    probes = ['/api/v1/x', '/x', 'x']
+    assert trie.longest_prefixes(probes) == [trie.longest_prefix(p) for p in probes]
+    assert trie.shortest_prefixes(probes, 0) == [
+        trie.shortest_prefix(p, 0) for p in probes
+    ]
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_trie_search_iter(strtrie_like_class, linked) -> None:
+    keys = ['ab', 'bcd', 'c', 'abcde']
+    trie = strtrie_like_class({key: default_value(key) for key in keys})
+    if linked:
+        trie.link_nodes()
+    text = 'abcdefabc'
+
+    assert sorted(trie.search_iter(iter(text))) == sorted(
+        (start, start + len(key), default_value(key))
+        for key in keys
+        for start in range(len(text))
+        if text.startswith(key, start)
+    )
+
+
+@pytest.mark.parametrize('linking', ['none', 'links', 'flat_outputs', 'dfa'])
+def test_trie_contains_any_and_count_matches(strtrie_like_class, linking) -> None:
+    trie = strtrie_like_class({'a': 'A', 'ab': 'AB', 'b': 'B', 'bab': 'BAB'})
+    if linking == 'links':
+        trie.link_nodes()
+    elif linking == 'flat_outputs':
+        trie.link_nodes(flatten_outputs=True)
+    elif linking == 'dfa':
+        trie.compile_dfa()
+
+    assert trie.contains_any('xxbxx')
+    assert not trie.contains_any('xyz')
+    assert not trie.contains_any('')
+    assert trie.count_matches('abab') == {'A': 2, 'AB': 2, 'B': 2, 'BAB': 1}
+    assert trie.count_matches('xyz') == {}
+
+
+@pytest.mark.parametrize('keys', [['ab', 'b'], ['abc', 'bc', 'c', 'xab', 'cab']])
+def test_trie_flat_outputs_with_long_edges(strtrie_like_class, keys) -> None:
+    # Radix edges have many characters, dictionary links can go deeper
+    trie = strtrie_like_class({key: default_value(key) for key in keys})
+    text = 'xabcabcxab'
+    expected = list(trie.search(text))
+    trie.link_nodes(flatten_outputs=True)
+
+    assert list(trie.search(text)) == expected
+    assert trie.count_matches(text) == trie.copy().count_matches(text)
+
+
+@pytest.mark.parametrize('linking', ['none', 'links', 'flat_outputs', 'dfa'])
+def test_trie_search_boundaries(strtrie_like_class, linking) -> None:
+    trie = strtrie_like_class({'he': 1, 'hers': 2, 'she': 3, 'new york': 4})
+    if linking == 'links':
+        trie.link_nodes()
+    elif linking == 'flat_outputs':
+        trie.link_nodes(flatten_outputs=True)
+    elif linking == 'dfa':
+        trie.compile_dfa()
+    text = 'she said: hers, not his. he is in new york_city'
+
+    assert sorted(trie.search(text, boundaries='word')) == [
+        (0, 3, 3), (10, 14, 2), (25, 27, 1),
+    ]
+    assert sorted(trie.search(text, boundaries={' ', '_'})) == [
+        (0, 3, 3), (25, 27, 1), (34, 42, 4),
+    ]
+    assert sorted(trie.search(text, boundaries=str.isspace)) == [
+        (0, 3, 3), (25, 27, 1),
+    ]
+    with pytest.raises(ValueError, match='Unknown boundaries'):
+        list(trie.search(text, boundaries='line'))
+
+
+def test_tuple_trie_search_boundaries() -> None:
+    trie = TupleTrie({('new', 'york'): 'state', ('york',): 'town'})
+    text = ('new', 'york', ',', 'york', 'city')
+    assert list(trie.search(text, boundaries='word')) == [(0, 2, 'state')]
+    assert sorted(trie.search(text, boundaries={',', 'city'})) == [
+        (0, 2, 'state'), (3, 4, 'town'),
+    ]
+
+
+def test_trie_union(strtrie_like_class) -> None:
+    first = strtrie_like_class({'abc': 1, 'abd': 2, 'x': 3})
+    second = strtrie_like_class({'ab': 4, 'abcde': 5, 'abd': 6, 'y': 7})
+
+    union = first | second
+    assert dict(union.items()) == {
+        'ab': 4, 'abc': 1, 'abcde': 5, 'abd': 6, 'x': 3, 'y': 7,
+    }
+    assert len(union) == 6
+    assert len(union.prefix_view('abc')) == 2
+    assert union['abcde'] == 5
+    assert first.union(second, max)['abd'] == 6
+    assert first.union(second, lambda value, _: value)['abd'] == 2
+    assert dict(first.items()) == {'abc': 1, 'abd': 2, 'x': 3}
+
+    first |= {'abce': 8}
+    assert dict(first.items()) == {'abc': 1, 'abce': 8, 'abd': 2, 'x': 3}
+    assert list(first.match('abce')) == [(3, 1), (4, 8)]
+
+
+def test_trie_intersection_and_difference(strtrie_like_class) -> None:
+    first = strtrie_like_class({'abc': 1, 'abcde': 2, 'abx': 3, 'b': 4})
+    second = strtrie_like_class({'ab': 5, 'abcde': 6, 'b': 7})
+
+    common = first & second
+    assert dict(common.items()) == {'abcde': 2, 'b': 4}
+    assert len(common) == 2
+    assert first.intersection(second, lambda a, b: a + b)['abcde'] == 8
+
+    rest = first - second
+    assert dict(rest.items()) == {'abc': 1, 'abx': 3}
+    assert len(rest) == 2
+    assert list(rest.match('abcde')) == [(3, 1)]
+
+    first -= {'abx': None, 'zz': None}
+    assert dict(first.items()) == {'abc': 1, 'abcde': 2, 'b': 4}
+
+
+def test_trie_set_operations_need_modifiable_trie(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'ab': 1})
+    trie.link_nodes()
+    with pytest.raises(AttributeError):
+        trie |= {'b': 2}
+    assert dict((trie | {'b': 2}).items()) == {'ab': 1, 'b': 2}
+
+
+def test_tuple_trie_set_operations() -> None:
+    first = TupleTrie({(1, 2): 'a', (1, 3): 'b'})
+    second = TupleTrie({(1, 2): 'c', (1,): 'd'})
+    assert dict((first | second).items()) == {(1,): 'd', (1, 2): 'c', (1, 3): 'b'}
+    assert dict((first & second).items()) == {(1, 2): 'a'}
+    assert dict((first - second).items()) == {(1, 3): 'b'}
+
+
+def test_node_copy_keeps_value_and_children() -> None:
+    trie = Trie({'ab': 1, 'ac': 2, 'a': 3})
+    node = trie.data['a']
+    copied = node.copy()
+    assert copied.value == 3
+    assert copied.size == 3
+    assert copied['b'] is node['b']
+
+
+def test_trie_copy_of_linked_and_minimized(strtrie_like_class) -> None:
+    trie = strtrie_like_class({'walk': 1, 'walked': 1, 'talk': 1, 'talked': 1})
+    trie.minimize()
+    copied = trie.copy()
+    copied['walks'] = 2
+    assert len(copied) == 5
+    assert 'walks' not in trie
+    assert copied.node_count() > trie.node_count()
+
+    trie = strtrie_like_class({'he': 1, 'she': 2})
+    trie.link_nodes()
+    copied = trie.copy()
+    copied['hers'] = 3
+    assert sorted(copied.search('ushers')) == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
@@ -1,10 +1,16 @@
 """Tests specific for Trie class which does not apply to it's subclasses."""
+import itertools
+
 import pytest
 
 from tests.test_utils import default_value
 from triematch.trie import Trie
 from triematch.trie import TrieStates
 from triematch.trie import TupleTrie
+from triematch.trie import new_search_stats
+from triematch.wildcard import ANY_ITEM
+from triematch.wildcard import ANY_RUN
+from triematch.wildcard import ItemSet
 
 
 def test_trie_iternal_struct() -> None:
@@ -197,6 +203,24 @@ def test_trie_dictionary_link() -> None:
     assert trie.__getnode_safe__('bbac').dict_link == trie.__getnode_safe__('ac')
 
 
+def test_trie_flatten_outputs() -> None:
+    trie = Trie({'a': 1, 'aa': 2, 'aaa': 3, 'ba': 4})
+    trie.link_nodes(flatten_outputs=True)
+
+    def outputs(key: str) -> tuple:
+        return trie._outputs.get(id(trie.__getnode_safe__(key)), ())
+
+    assert outputs('') == ()
+    assert outputs('b') == ()
+    assert outputs('aaa') == ((2, 3), (1, 2), (0, 1))
+    assert outputs('ba') == ((1, 4), (0, 1))
+
+    expected = Trie({'a': 1, 'aa': 2, 'aaa': 3, 'ba': 4})
+    expected.link_nodes()
+    assert list(trie.search('baaaab')) == list(expected.search('baaaab'))
+    assert list(trie.search_iter('baaaab')) == list(expected.search('baaaab'))
+
+
 def test_tuple_trie_dictionary_link() -> None:
 
     keys = [
@@ -266,3 +290,163 @@ def test_tuple_trie_search() -> None:
         (3, 6, default_value(('b',3,4))),
         (7, 8, default_value((3,))),
     ]
+
+
+def test_trie_instrumented_search() -> None:
+    keys = [
+        'a',
+        'aa',
+        'aaa',
+        'ab',
+    ]
+    text = 'aaab'
+    trie = Trie({key: default_value(key) for key in keys})
+    trie.link_nodes()
+
+    stats = new_search_stats()
+    assert list(trie.instrumented_search(text, stats)) == list(trie.search(text))
+    assert stats['characters'] == len(text)
+    assert stats['matches'] == len(list(trie.search(text)))
+    assert stats['max_output_chain'] == 3  # aaa, aa and a end at index 2
+    assert stats['dict_link_hops'] == 3  # aa -> a, aaa -> aa -> a
+    assert stats['failure_hops'] == 2  # aaa -> aa -> a before reading b
+    assert stats['elapsed'] > 0
+
+
+def test_trie_instrumented_search_callback_and_accumulation() -> None:
+    trie = Trie({key: default_value(key) for key in ('ab', 'b')})
+    trie.link_nodes()
+    reports = []
+    stats = new_search_stats()
+
+    list(trie.instrumented_search('abab', stats, callback=reports.append))
+    list(trie.instrumented_search('ab', stats, callback=reports.append))
+
+    assert reports == [stats, stats]
+    assert stats['characters'] == 6
+    assert stats['matches'] == 6
+
+
+def test_trie_instrumented_search_unlinked() -> None:
+    trie = Trie({key: default_value(key) for key in ('ab', 'b')})
+    stats = new_search_stats()
+
+    assert list(trie.instrumented_search('abb', stats)) == list(trie.search('abb'))
+    assert stats['failure_hops'] == 0
+    assert stats['transitions'] == 4
+
+
+def test_tuple_trie_minimize() -> None:
+    keys = [
+        ('GET', 'users', 'id'),
+        ('GET', 'groups', 'id'),
+        ('POST', 'users', 'id'),
+    ]
+    trie = TupleTrie(dict.fromkeys(keys, 'handler'))
+    trie.minimize()
+
+    assert trie.node_count() == 5  # root, GET, POST, users or groups, id
+    assert trie.__getnode_safe__(('GET', 'users')) is trie.__getnode_safe__(
+        ('POST', 'users'),
+    )
+    assert list(trie.match(('GET', 'groups', 'id', 7))) == [(3, 'handler')]
+    assert {key for key, _ in trie.items(('GET',))} == set(keys[:2])
+    assert trie._state == TrieStates.Minimized
+
+
+def test_tuple_trie_expand() -> None:
+    keys = [
+        (1, 2),
+        (1, 2, 3),
+        (1, 4),
+        (2,),
+    ]
+    trie = TupleTrie({key: default_value(key) for key in keys})
+
+    assert list(trie.expand((1,))) == [
+        ((1, 2), default_value((1, 2))),
+        ((1, 2, 3), default_value((1, 2, 3))),
+        ((1, 4), default_value((1, 4))),
+    ]
+    assert list(trie.expand((1, 2, 3))) == [((1, 2, 3), default_value((1, 2, 3)))]
+
+
+def test_tuple_trie_fuzzy() -> None:
+    trie = TupleTrie({
+        ('GET', 'users', 'id'): 1,
+        ('GET', 'user', 'id'): 2,
+        ('POST', 'users'): 3,
+    })
+    assert sorted(trie.fuzzy(('GET', 'users', 'name'), 1)) == [
+        (('GET', 'users', 'id'), 1, 1),
+    ]
+    assert sorted(trie.fuzzy(('GET', 'users'), 1)) == [
+        (('GET', 'users', 'id'), 1, 1),
+        (('POST', 'users'), 3, 1),
+    ]
+
+
+def test_tuple_trie_glob() -> None:
+    trie = TupleTrie({
+        ('GET', 'users', 'id'): 1,
+        ('GET', 'users', 'id', 'posts'): 2,
+        ('POST', 'users'): 3,
+    })
+    assert sorted(trie.glob(('GET', ANY_RUN))) == [
+        (('GET', 'users', 'id'), 1),
+        (('GET', 'users', 'id', 'posts'), 2),
+    ]
+    assert list(trie.glob((ItemSet(['POST', 'PUT']), ANY_ITEM))) == [
+        (('POST', 'users'), 3),
+    ]
+
+
+def test_tuple_trie_longest_prefix() -> None:
+    table = TupleTrie({(10,): 'a', (10, 1): 'b', (10, 1, 2, 3): 'c'})
+    assert table.longest_prefix((10, 1, 2, 4)) == (2, 'b')
+    assert table.longest_prefix((10, 1, 2, 3)) == (4, 'c')
+    assert table.shortest_prefix((10, 1, 2, 3)) == (1, 'a')
+    assert table.longest_prefixes([(11,), (10, 2)], 'default') == [
+        'default',
+        (1, 'a'),
+    ]
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_tuple_trie_search_iter(linked) -> None:
+    gazetteer = TupleTrie({
+        ('new', 'york'): 'state',
+        ('new', 'york', 'city'): 'city',
+        ('york',): 'town',
+    })
+    if linked:
+        gazetteer.link_nodes()
+    tokens = iter(['i', 'love', 'new', 'york', 'city', 'and', 'york'])
+
+    assert sorted(gazetteer.search_iter(tokens)) == [
+        (2, 4, 'state'),
+        (2, 5, 'city'),
+        (3, 4, 'town'),
+        (6, 7, 'town'),
+    ]
+
+
+@pytest.mark.parametrize('linked', [False, True])
+def test_tuple_trie_search_iter_encoded(linked) -> None:
+    vocabulary = {'new': 0, 'york': 1, 'city': 2}
+    gazetteer = TupleTrie({(0, 1): 'state', (0, 1, 2): 'city'})
+    if linked:
+        gazetteer.link_nodes()
+    tokens = ['new', 'new', 'york', 'city']
+
+    assert sorted(gazetteer.search_iter(tokens, encode=vocabulary)) == [
+        (1, 3, 'state'),
+        (1, 4, 'city'),
+    ]
+
+
+def test_tuple_trie_search_iter_is_lazy() -> None:
+    gazetteer = TupleTrie({('a', 'b'): 1})
+    gazetteer.link_nodes()
+    matches = gazetteer.search_iter(itertools.cycle('abc'))
+    assert list(itertools.islice(matches, 3)) == [(0, 2, 1), (3, 5, 1), (6, 8, 1)]
@@ -0,0 +1,97 @@
+"""Tests for wildcard patterns, glob and WildcardTrie."""
+import pickle
+
+import pytest
+
+from triematch.trie import WildcardTrie
+from triematch.wildcard import ANY_ITEM
+from triematch.wildcard import ANY_RUN
+from triematch.wildcard import ItemSet
+from triematch.wildcard import parse_pattern
+from triematch.wildcard import pattern_text
+from triematch.wildcard import Wildcard
+
+
+def test_parse_pattern() -> None:
+    assert parse_pattern('a?*') == ('a', ANY_ITEM, ANY_RUN)
+    assert parse_pattern('a**b') == ('a', ANY_RUN, 'b')
+    assert parse_pattern('[!a-c_]') == (ItemSet(['_'], [('a', 'c')], negated=True),)
+    assert parse_pattern('[]a]') == (ItemSet([']', 'a']),)
+    assert parse_pattern('\\*\\?') == ('*', '?')
+    assert parse_pattern('[ab') == ('[', 'a', 'b')
+
+
+@pytest.mark.parametrize('pattern', ['a?*', '[!a-c_]x', '[]a]', '\\*\\?\\[', '[ab'])
+def test_pattern_text_round_trip(pattern) -> None:
+    tokens = parse_pattern(pattern)
+    assert parse_pattern(pattern_text(tokens)) == tokens
+
+
+def test_item_set_matches() -> None:
+    digits = ItemSet(ranges=[('0', '9')])
+    assert digits.matches('5')
+    assert not digits.matches('a')
+    assert ItemSet(['a'], negated=True).matches('b')
+    assert not ItemSet(['a'], negated=True).matches('a')
+
+
+def test_wildcards_survive_pickle() -> None:
+    assert pickle.loads(pickle.dumps(ANY_RUN)) is ANY_RUN
+    assert pickle.loads(pickle.dumps(ANY_ITEM)) is ANY_ITEM
+
+
+def test_wildcard_trie_matches() -> None:
+    routes = WildcardTrie({
+        'user_?_id': 'short id',
+        'user_[0-9]*': 'numeric',
+        'user_7_id': 'exact',
+        '*_id': 'any id',
+        'admin': 'admin',
+    })
+
+    assert sorted(routes.matches('user_7_id')) == [
+        ('*_id', 'any id'),
+        ('user_7_id', 'exact'),
+        ('user_?_id', 'short id'),
+        ('user_[0-9]*', 'numeric'),
+    ]
+    assert sorted(routes.matches('user_x_id')) == [
+        ('*_id', 'any id'),
+        ('user_?_id', 'short id'),
+    ]
+    assert list(routes.matches('admin')) == [('admin', 'admin')]
+    assert list(routes.matches('adm')) == []
+
+
+def test_wildcard_trie_match_prefixes() -> None:
+    routes = WildcardTrie({'a?': 1, 'a*c': 2, '[ab]': 3})
+    assert sorted(routes.match('abc')) == [(1, 3), (2, 1), (3, 2)]
+
+
+def test_wildcard_trie_is_dict_like() -> None:
+    routes = WildcardTrie({'user_[0-9]*': 1, 'a\\*': 2})
+    assert routes['user_[0-9]*'] == 1
+    assert 'user_1' not in routes
+    assert sorted(routes) == ['a\\*', 'user_[0-9]*']
+    assert list(routes.matches('a*')) == [('a\\*', 2)]
+    assert list(routes.matches('ab')) == []
+
+    del routes['user_[0-9]*']
+    assert list(routes.matches('user_1')) == []
+    assert routes.copy() == {'a\\*': 2}
+
+
+def test_wildcard_trie_copy_keeps_item_sets() -> None:
+    routes = WildcardTrie({'user_[0-9]': 1, 'a[bc]d': 2})
+    copied = routes.copy()
+    assert sorted(copied.matches('user_7')) == [('user_[0-9]', 1)]
+    assert sorted(copied.matches('acd')) == [('a[bc]d', 2)]
+
+
+def test_wildcard_subclass_must_implement_matches() -> None:
+    class Incomplete(Wildcard):
+        def __str__(self) -> str:
+            return '~'
+
+    with pytest.raises(TypeError):
+        Incomplete()
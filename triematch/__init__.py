@@ -1,5 +1,19 @@
 from .radix import Radix
 from .radix import RadixNode
+from .symbols import SymbolTable
+from .trie import EncodedTupleTrie
 from .trie import Node
 from .trie import Trie
 from .trie import TupleTrie
+from .trie import WildcardTrie
+
+__all__ = [
+    'EncodedTupleTrie',
+    'Node',
+    'Radix',
+    'RadixNode',
+    'SymbolTable',
+    'Trie',
+    'TupleTrie',
+    'WildcardTrie',
+]
@@ -0,0 +1,169 @@
+"""
+Approximate search of trie keys in a text, allowing substitutions.
+
+A key of length `m` with at most `k` substitutions in a window of the text
+has at least one of its `k + 1` pieces in that window unchanged. All pieces
+are stored in one Aho-Corasick trie, so the text is scanned once for every
+key, and each hit of a piece is verified against its key.
+
+```python
+from triematch import Trie
+from triematch.approximate import ApproximateSearch
+
+trie = Trie({'error': 'E', 'warning': 'W'})
+list(ApproximateSearch(trie, max_mismatches=1).search('an errer and a warninq'))
+# Output: [(3, 8, 'E', 1), (15, 22, 'W', 1)]
+```
+"""
+from collections.abc import Iterable
+from operator import ne
+from typing import Any
+from typing import Optional
+
+from triematch.trie import BaseTrie
+from triematch.trie import Trie
+from triematch.trie import TrieKey
+from triematch.trie import TupleTrie
+
+
+def split_bounds(length: int, parts: int) -> list[tuple[int, int]]:
+    """Split range(length) into `parts` consecutive (start, end) pieces."""
+    return [
+        (length * i // parts, length * (i + 1) // parts)
+        for i in range(parts)
+    ]
+
+
+class ApproximateSearch:
+    """
+    Find keys of a trie in a text with up to `max_mismatches` substitutions.
+
+    The index of pieces is built on the first search and built again after
+    the trie is modified.
+    """
+
+    def __init__(self, trie: BaseTrie, max_mismatches: int=1) -> None:
+        """
+        Construct ApproximateSearch instance.
+
+        Args:
+            trie (BaseTrie): Keys and values to search for, it can be a Trie,
+                TupleTrie or Radix.
+            max_mismatches (int, optional): Largest number of substituted
+                items in a match, default is 1.
+        """
+        if max_mismatches < 0:
+            raise ValueError('max_mismatches can not be negative')
+        self.trie = trie
+        self.max_mismatches = max_mismatches
+        self._version = None
+        self._seeds = None
+        self._short_keys = []  # keys too short to be split into pieces
+        self._max_length = 0
+
+    def _build(self) -> None:
+        """Index the pieces of all keys of the trie in a linked trie."""
+        parts = self.max_mismatches + 1
+        seeds = TupleTrie() if isinstance(self.trie, TupleTrie) else Trie()
+        self._short_keys = []
+        self._max_length = 0
+        for key, value in self.trie.items():
+            self._max_length = max(self._max_length, len(key))
+            if len(key) < parts:
+                self._short_keys.append((key, value))
+                continue
+            bounds = split_bounds(len(key), parts)
+            for piece, (start, end) in enumerate(bounds):
+                entry = (key, value, bounds, piece)
+                if key[start:end] in seeds:
+                    seeds[key[start:end]].append(entry)
+                else:
+                    seeds[key[start:end]] = [entry]
+        seeds.link_nodes()
+        self._seeds = seeds
+        self._version = self.trie._version
+
+    def _distance(
+        self,
+        text: TrieKey,
+        start: int,
+        key: TrieKey,
+        bounds: list[tuple[int, int]],
+        piece: int,
+    ) -> Optional[int]:
+        """
+        Count substitutions of key in the text window at start.
+
+        Returns:
+            int: number of substitutions, None if there are too many or an
+                earlier piece also matches exactly (it reports the same window).
+        """
+        distance = sum(map(ne, text[start:start + len(key)], key))
+        if distance > self.max_mismatches:
+            return None
+        for piece_start, piece_end in bounds[:piece]:
+            window_piece = text[start + piece_start:start + piece_end]
+            if window_piece == key[piece_start:piece_end]:
+                return None
+        return distance
+
+    def search(self, text: TrieKey) -> Iterable[tuple[int, int, Any, int]]:
+        """
+        Search for all keys in the text with up to `max_mismatches` substitutions.
+
+        Matches are not sorted, each window is reported once for every key
+        that matches it.
+
+        Yields:
+            (int, int, Any, int) as (start index, end index, value, number of
+                substitutions)
+        """
+        if self._version != self.trie._version:
+            self._build()
+
+        # linked search reports (0, 0, None) for an empty text
+        seed_matches = self._seeds.search(text) if text else ()
+        for seed_start, _, entries in seed_matches:
+            for key, value, bounds, piece in entries:
+                start = seed_start - bounds[piece][0]
+                end = start + len(key)
+                if start < 0 or end > len(text):
+                    continue
+                distance = self._distance(text, start, key, bounds, piece)
+                if distance is not None:
+                    yield start, end, value, distance
+
+        for key, value in self._short_keys:
+            # at most max_mismatches items, every window of this length matches
+            for start in range(len(text) - len(key) + 1):
+                distance = sum(map(ne, text[start:start + len(key)], key))
+                yield start, start + len(key), value, distance
+
+    def search_stream(
+        self,
+        chunks: Iterable[TrieKey],
+    ) -> Iterable[tuple[int, int, Any, int]]:
+        """
+        Search a text which is read in chunks, e.g. lines of a log file.
+
+        The end of each chunk is kept until the next one arrives, so matches
+        crossing chunk borders are found. Indices are positions in the whole
+        stream.
+
+        Yields:
+            (int, int, Any, int) as in `search`
+        """
+        if self._version != self.trie._version:
+            self._build()
+
+        tail = None
+        offset = 0  # position of tail in the stream
+        for chunk in chunks:
+            text = chunk if tail is None else tail + chunk
+            tail_length = len(text) - len(chunk)
+            for start, end, value, distance in self.search(text):
+                if end > tail_length:  # windows inside the tail are reported
+                    yield offset + start, offset + end, value, distance
+            keep = min(len(text), max(self._max_length - 1, 0))
+            offset += len(text) - keep
+            tail = text[len(text) - keep:]
@@ -0,0 +1,477 @@
+"""
+Dense transition tables (DFA) of Aho-Corasick automata.
+
+A `DFA` is exported from the keys of a trie: every state has one
+transition for each symbol of an `Alphabet`, failure links are resolved
+while the table is built, and the matches reported in a state (its own key
+and the keys reached by dictionary links) are stored with it. Searching
+is one table lookup per item of the text, without failure chains. It pays
+off for small alphabets like DNA, hex digits or lowercase ASCII, since the
+table has `states * (symbols + 1)` entries; `estimate_memory` tells the
+size before building it.
+
+```python
+from triematch import Trie
+from triematch.dfa import Alphabet
+
+trie = Trie({'GATTACA': 1, 'TAC': 2})
+dfa = trie.compile_dfa(Alphabet('ACGT'))
+list(trie.search('CGATTACAT'))
+# Output: [(4, 7, 2), (1, 8, 1)]
+```
+
+With NumPy installed, `search_batch` runs the automaton over many texts
+at once.
+"""
+from array import array
+from collections import Counter
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Sequence
+from itertools import repeat
+from typing import Any
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional, only needed by search_batch
+    np = None
+
+from triematch.trie import BaseTrie
+from triematch.trie import Empty
+
+TABLE_TYPECODE = 'i'  # array typecode of transition tables and outputs
+
+
+class _Translation(dict):
+    """`str.translate` table which maps unknown characters to one character."""
+
+    def __init__(self, mapping: dict[int, str], other: str) -> None:
+        super().__init__(mapping)
+        self.other = other
+
+    def __missing__(self, key: int) -> str:
+        return self.other
+
+
+class Alphabet:
+    """
+    Columns of the transition table for the symbols of a DFA.
+
+    Each symbol has a column in order, and one more column (`other`) is used
+    by all symbols which are not in the alphabet. Alphabets of less than 255
+    characters translate a whole string to columns with `str.translate`.
+    """
+
+    __slots__ = ('_translation', 'columns', 'symbols')
+
+    def __init__(self, symbols: Iterable[Any]) -> None:
+        """
+        Construct Alphabet instance.
+
+        Args:
+            symbols (iterable): Characters, e.g. `'ACGT'`, or tokens. Repeated
+                symbols are ignored.
+        """
+        self.symbols = list(dict.fromkeys(symbols))
+        self.columns = {symbol: column for column, symbol in enumerate(self.symbols)}
+        self._translation = None
+        if len(self.symbols) < 255 and all(  # noqa: PLR2004, columns as latin-1
+            isinstance(symbol, str) and len(symbol) == 1 for symbol in self.symbols
+        ):
+            self._translation = _Translation(
+                {ord(symbol): chr(column) for symbol, column in self.columns.items()},
+                chr(self.other),
+            )
+
+    @classmethod
+    def of_trie(cls, trie: BaseTrie) -> 'Alphabet':
+        """Return the alphabet of all symbols on the edges of a trie."""
+        symbols = {}
+        seen = set()
+        stack = [trie.data]
+        while stack:
+            node = stack.pop()
+            for label, child in node.items():
+                symbols.update(dict.fromkeys(trie._edge_symbols(label)))
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return cls(symbols)
+
+    @property
+    def other(self) -> int:
+        """Column of the symbols which are not in the alphabet."""
+        return len(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.columns
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.symbols!r})'
+
+    def encode(self, text: Iterable) -> Iterable[int]:
+        """Return the columns of the items of text."""
+        if self._translation is not None and isinstance(text, str):
+            return text.translate(self._translation).encode('latin-1')
+        return map(self.columns.get, text, repeat(self.other))
+
+
+def _count_states(trie: BaseTrie) -> tuple[int, set]:
+    """
+    Count the states a DFA of the trie has, see `DFA._prefix_states`.
+
+    Returns:
+        (int, set) as number of states and the symbols on the edges
+    """
+    states, symbols = 1, set()
+    stack = [trie.data]
+    while stack:
+        for label, child in stack.pop().items():
+            edge = trie._edge_symbols(label)
+            states += len(edge)
+            symbols.update(edge)
+            stack.append(child)
+    return states, symbols
+
+
+def estimate_memory(trie: BaseTrie, alphabet: Optional[Alphabet]=None) -> int:
+    """
+    Estimate the size of the transition table of a DFA without building it.
+
+    Args:
+        trie (BaseTrie): The trie to compile.
+        alphabet (Alphabet, optional): The alphabet to compile with, default
+            is the symbols of the trie.
+
+    Returns:
+        int: bytes of the table, the outputs of states are not counted
+    """
+    states, symbols = _count_states(trie)
+    width = (len(symbols) if alphabet is None else len(alphabet)) + 1
+    return states * width * array(TABLE_TYPECODE).itemsize
+
+
+class DFA:
+    """
+    Transition table of an Aho-Corasick automaton over a fixed alphabet.
+
+    States are numbered in breadth-first order, 0 is the root. The table is
+    a flat array of `num_states * width` next states, where the row of a
+    state has a column for each symbol of the alphabet and the `other`
+    column (it always leads to the root).
+    """
+
+    __slots__ = (
+        'alphabet',
+        'output_lengths',
+        'output_start',
+        'output_values',
+        'outputs',
+        'table',
+        'values',
+        'width',
+    )
+
+    def __init__(self, trie: BaseTrie, alphabet: Optional[Alphabet]=None) -> None:
+        """
+        Export the automaton of the keys of a trie.
+
+        Edges with several symbols (Radix) and nodes shared by minimized
+        tries are expanded, so each state stands for one prefix of keys.
+
+        Args:
+            trie (BaseTrie): A Trie, TupleTrie or Radix, linked or not.
+            alphabet (Alphabet, optional): Symbols of the table columns, it
+                has to include all symbols of the keys. Default is the
+                symbols of the keys.
+
+        Raises:
+            ValueError: If a symbol of a key is not in the alphabet.
+        """
+        children, state_values = self._prefix_states(trie)
+        if alphabet is None:
+            alphabet = Alphabet.of_trie(trie)
+        for edges in children:
+            for symbol in edges:
+                if symbol not in alphabet:
+                    raise ValueError(f'{symbol!r} is not in the alphabet')
+        self.alphabet = alphabet
+        self.width = width = len(alphabet) + 1
+        table = array(TABLE_TYPECODE, [0]) * (len(children) * width)
+        failure = [0] * len(children)
+        depth = [0] * len(children)
+        outputs = [()] * len(children)  # (length, value id) of each state
+        self.values = []
+
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            row = state * width
+            if state:
+                fail_row = failure[state] * width
+                table[row:row + width] = table[fail_row:fail_row + width]
+                own = ()
+                if state_values[state] is not Empty:
+                    own = ((depth[state], len(self.values)),)
+                    self.values.append(state_values[state])
+                outputs[state] = own + outputs[failure[state]]
+            for symbol, child in children[state].items():
+                column = alphabet.columns[symbol]
+                # failure of the child is where the failure state goes by symbol
+                failure[child] = table[fail_row + column] if state else 0
+                table[row + column] = child
+                depth[child] = depth[state] + 1
+                queue.append(child)
+        self.table = table
+        self._flatten_outputs(outputs)
+
+    @staticmethod
+    def _prefix_states(trie: BaseTrie) -> tuple[list[dict], list]:
+        """
+        Give each prefix of the keys a state, one symbol per transition.
+
+        Returns:
+            (list, list) as children (symbol -> state) and value of each state
+        """
+        children = [{}]
+        state_values = [Empty]
+        stack = [(trie.data, 0)]
+        while stack:
+            node, state = stack.pop()
+            for label, child in node.items():
+                current = state
+                for symbol in trie._edge_symbols(label):
+                    current = children[current].setdefault(symbol, len(children))
+                    if current == len(children):
+                        children.append({})
+                        state_values.append(Empty)
+                state_values[current] = child.value
+                stack.append((child, current))
+        return children, state_values
+
+    def _flatten_outputs(self, outputs: list[tuple]) -> None:
+        """Store (length, value) outputs of each state, and in flat arrays."""
+        values = self.values
+        self.outputs = [
+            tuple((length, values[value_id]) for length, value_id in state_outputs)
+            for state_outputs in outputs
+        ]
+        self.output_start = array(TABLE_TYPECODE, [0])
+        self.output_lengths = array(TABLE_TYPECODE)
+        self.output_values = array(TABLE_TYPECODE)
+        for state_outputs in outputs:
+            for length, value_id in state_outputs:
+                self.output_lengths.append(length)
+                self.output_values.append(value_id)
+            self.output_start.append(len(self.output_lengths))
+
+    @property
+    def num_states(self) -> int:
+        """Number of states (rows of the table)."""
+        return len(self.table) // self.width
+
+    @property
+    def memory(self) -> int:
+        """Bytes of the table and output arrays, see `estimate_memory`."""
+        return sum(
+            len(items) * items.itemsize
+            for items in (
+                self.table, self.output_start, self.output_lengths, self.output_values,
+            )
+        )
+
+    def search(self, text: Iterable) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search for all keys in the text, like a linked `ACMixin.search`.
+
+        Each item of the text is a single lookup in the table.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value)
+        """
+        table, width, outputs = self.table, self.width, self.outputs
+        state = 0
+        for end, column in enumerate(self.alphabet.encode(text), 1):
+            state = table[state * width + column]
+            if outputs[state]:
+                for length, value in outputs[state]:
+                    yield end - length, end, value
+
+    def bounded_search(
+        self,
+        text: Iterable,
+        flags: bytes,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search like `search`, for keys starting and ending on a boundary.
+
+        Args:
+            text (Iterable): The items to search in.
+            flags (bytes): Non-zero for positions of text on a boundary, see
+                `triematch.utils.boundary_flags`.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value)
+        """
+        table, width, outputs = self.table, self.width, self.outputs
+        state = 0
+        for end, column in enumerate(self.alphabet.encode(text), 1):
+            state = table[state * width + column]
+            if outputs[state] and flags[end]:
+                for length, value in outputs[state]:
+                    if flags[end - length]:
+                        yield end - length, end, value
+
+    def contains_any(self, text: Iterable) -> bool:
+        """Check if any key occurs in the text, stopping at the first match."""
+        table, width, outputs = self.table, self.width, self.outputs
+        state = 0
+        for column in self.alphabet.encode(text):
+            state = table[state * width + column]
+            if outputs[state]:
+                return True
+        return False
+
+    def count_matches(self, text: Iterable) -> Counter:
+        """
+        Count how many times the keys occur in the text.
+
+        Only the states with outputs are counted while reading the text.
+
+        Returns:
+            Counter: number of matches of each value
+        """
+        table, width, outputs = self.table, self.width, self.outputs
+        visits = {}  # state -> times it was reached
+        state = 0
+        for column in self.alphabet.encode(text):
+            state = table[state * width + column]
+            if outputs[state]:
+                visits[state] = visits.get(state, 0) + 1
+        counts = Counter()
+        for state, times in visits.items():
+            for _, value in outputs[state]:
+                counts[value] += times
+        return counts
+
+    def _symbol_columns(self, texts: Sequence, total: int) -> 'np.ndarray':
+        """Columns of all items of the texts, concatenated."""
+        symbols, other = self.alphabet.symbols, self.alphabet.other
+        if not symbols:
+            return np.full(total, other, dtype=np.intp)
+        if all(isinstance(text, str) for text in texts) and all(
+            isinstance(symbol, str) and len(symbol) == 1 for symbol in symbols
+        ):
+            codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+            symbol_codes = np.array([ord(symbol) for symbol in symbols], np.uint32)
+            order = np.argsort(symbol_codes)
+            sorted_codes = symbol_codes[order]
+            found = np.searchsorted(sorted_codes, codes).clip(0, len(order) - 1)
+            return np.where(sorted_codes[found] == codes, order[found], other)
+        get = self.alphabet.columns.get
+        return np.fromiter(
+            (get(item, other) for text in texts for item in text),
+            dtype=np.intp,
+            count=total,
+        )
+
+    def search_batch(self, texts: Sequence) -> 'BatchMatches':
+        """
+        Search all texts, one step of NumPy array operations per position.
+
+        Texts are ordered by length, so at position `j` the states of the
+        texts longer than `j` are a prefix of the state array and all of
+        them move by a single table lookup.
+
+        Args:
+            texts (Sequence): Strings, or sequences of tokens for tuple keys.
+
+        Returns:
+            BatchMatches: one row per match, ordered by text and end index
+        """
+        if np is None:
+            raise ImportError('search_batch needs NumPy, install triematch[numpy]')
+        lengths = np.fromiter(map(len, texts), dtype=np.intp, count=len(texts))
+        offsets = np.zeros(len(texts) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=offsets[1:])
+        total = int(offsets[-1])
+        columns = self._symbol_columns(texts, total)
+        table = np.frombuffer(self.table, dtype=f'i{self.table.itemsize}')
+
+        order = np.argsort(-lengths, kind='stable')
+        starts = offsets[:-1][order]
+        # number of texts longer than j, for each position j
+        longest = int(lengths.max()) if len(texts) else 0
+        active = np.searchsorted(-lengths[order], -np.arange(longest), side='left')
+        states = np.zeros(len(texts), dtype=np.intp)
+        visited = np.empty(total, dtype=np.intp)  # state after each item
+        for j, count in enumerate(active.tolist()):
+            positions = starts[:count] + j
+            states[:count] = table[states[:count] * self.width + columns[positions]]
+            visited[positions] = states[:count]
+
+        output_start = np.frombuffer(self.output_start, dtype=table.dtype)
+        output_counts = np.diff(output_start)[visited]
+        hits = np.flatnonzero(output_counts)
+        counts = output_counts[hits]
+        positions = np.repeat(hits, counts)
+        # index of each output in the flat arrays: first of its state + rank
+        firsts = np.cumsum(counts) - counts
+        ranks = np.arange(len(positions)) - np.repeat(firsts, counts)
+        entries = output_start[visited[positions]] + ranks
+        doc_id = np.repeat(np.arange(len(texts)), lengths)[positions]
+        end = positions - offsets[doc_id] + 1
+        output_lengths = np.frombuffer(self.output_lengths, dtype=table.dtype)
+        output_values = np.frombuffer(self.output_values, dtype=table.dtype)
+        return BatchMatches(
+            doc_id,
+            end - output_lengths[entries],
+            end,
+            output_values[entries],
+            self.values,
+        )
+
+
+class BatchMatches:
+    """
+    Matches of a batch search as columns of NumPy arrays.
+
+    `values[value_id[i]]` is the value of the key of match `i`. Iterating
+    yields `(doc id, start, end, value)` tuples like `search` with a doc id.
+    """
+
+    __slots__ = ('doc_id', 'end', 'start', 'value_id', 'values')
+
+    def __init__(
+        self,
+        doc_id: 'np.ndarray',
+        start: 'np.ndarray',
+        end: 'np.ndarray',
+        value_id: 'np.ndarray',
+        values: list,
+    ) -> None:
+        self.doc_id = doc_id
+        self.start = start
+        self.end = end
+        self.value_id = value_id
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.doc_id)
+
+    def __iter__(self) -> Iterable[tuple[int, int, int, Any]]:
+        values = self.values
+        for doc_id, start, end, value_id in zip(
+            self.doc_id.tolist(),
+            self.start.tolist(),
+            self.end.tolist(),
+            self.value_id.tolist(),
+        ):
+            yield doc_id, start, end, values[value_id]
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self)} matches)'
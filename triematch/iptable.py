@@ -0,0 +1,287 @@
+"""
+Longest prefix match for IP addresses with a multibit trie.
+
+Networks are integers with a prefix length, so CIDR prefixes like `/19`
+are stored as they are instead of as tuples of octets. Each node of the
+trie consumes `stride` bits of an address and is a block of `2 ** stride`
+slots in flat arrays. A prefix which ends inside a node is expanded to all
+slots it covers, so a lookup reads one slot per node.
+
+```python
+from triematch.iptable import PrefixTable
+
+routes = PrefixTable({'10.0.0.0/8': 'internal', '10.32.0.0/19': 'office'})
+routes.longest_prefix('10.32.7.1')
+# Output: (19, 'office')
+routes.longest_prefix((10, 1, 2, 3))
+# Output: (8, 'internal')
+```
+"""
+import ipaddress
+from array import array
+from collections.abc import Iterable
+from collections.abc import MutableMapping
+from typing import Any
+from typing import Optional
+from typing import Union
+
+ADDRESS_BITS = {4: 32, 6: 128}
+
+Address = Union[int, str, tuple, ipaddress.IPv4Address, ipaddress.IPv6Address]
+Network = Union[str, tuple[int, int], ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class PrefixTable(MutableMapping):
+    """
+    A mapping of IP networks to values with longest prefix match lookups.
+
+    Keys are networks like `'10.0.0.0/8'`, `ipaddress` network objects or
+    `(address int, prefix length)` pairs. Addresses to look up can be ints,
+    strings, `ipaddress` objects or tuples of bytes like `(127, 0, 0, 1)`.
+    """
+
+    def __init__(
+        self,
+        _dict: Optional[dict]=None,
+        /,
+        version: int=4,
+        stride: int=8,
+    ) -> None:
+        """
+        Construct PrefixTable instance.
+
+        Args:
+            _dict (dict, optional): Networks and values to insert.
+            version (int, optional): IP version of all networks, 4 or 6.
+            stride (int, optional): Bits consumed by each node, it has to
+                divide the address length. Larger strides make lookups faster
+                and nodes bigger (`2 ** stride` slots).
+        """
+        if version not in ADDRESS_BITS:
+            raise ValueError(f'IP version has to be 4 or 6, not {version}')
+        self.version = version
+        self.bits = ADDRESS_BITS[version]
+        if stride <= 0 or self.bits % stride:
+            raise ValueError(f'stride has to divide {self.bits}')
+        self.stride = stride
+        self._slots = 1 << stride
+        # a node is a block of slots in these arrays, it is named by the index
+        # of its first slot, so the root is 0
+        self._children = array('l', [0]) * self._slots  # child node, 0 is none
+        self._entries = array('l', [0]) * self._slots  # entry id, 0 is none
+        self._lengths = array('h', [-1]) * self._slots  # prefix length of entry
+        self._networks = {}  # (network int, prefix length) -> entry id
+        self._values = [None]  # value of each entry id
+        if _dict:
+            self.update(_dict)
+
+    def _network(self, key: Network) -> tuple[int, int]:
+        """Return (network int, prefix length) of a key."""
+        if isinstance(key, tuple):
+            network, length = key
+            if not 0 <= length <= self.bits:
+                raise ValueError(f'{key} has a bad prefix length')
+            if network & ((1 << (self.bits - length)) - 1):
+                raise ValueError(f'{key} has host bits set')
+            return network, length
+        network = ipaddress.ip_network(key)
+        if network.version != self.version:
+            raise ValueError(f'{key} is not an IPv{self.version} network')
+        return int(network.network_address), network.prefixlen
+
+    def _address(self, address: Address) -> int:
+        """Return an address as int."""
+        if isinstance(address, int):
+            return address
+        if isinstance(address, tuple):
+            return int.from_bytes(bytes(address), 'big')
+        return int(ipaddress.ip_address(address))
+
+    def _new_node(self) -> int:
+        node = len(self._children)
+        self._children.extend(array('l', [0]) * self._slots)
+        self._entries.extend(array('l', [0]) * self._slots)
+        self._lengths.extend(array('h', [-1]) * self._slots)
+        return node
+
+    def _last_node(self, network: int, length: int, create: bool) -> tuple[int, int]:
+        """
+        Find the node in which a prefix of length ends.
+
+        Returns:
+            (int, int) as node and the number of bits before the node, node
+                is -1 if it does not exist and create is False.
+        """
+        node, depth = 0, 0
+        while length - depth > self.stride:
+            slot = node + self._slot(network, depth)
+            child = self._children[slot]
+            if not child:
+                if not create:
+                    return -1, depth
+                child = self._new_node()
+                self._children[slot] = child
+            node, depth = child, depth + self.stride
+        return node, depth
+
+    def _slot(self, address: int, depth: int) -> int:
+        """Slot in a node at depth for address."""
+        return (address >> (self.bits - depth - self.stride)) & (self._slots - 1)
+
+    def _covered_slots(
+        self,
+        node: int,
+        network: int,
+        length: int,
+        depth: int,
+    ) -> range:
+        """Slots of the node which a prefix ending in it covers."""
+        free_bits = self.stride - (length - depth)
+        first = node + (self._slot(network, depth) >> free_bits << free_bits)
+        return range(first, first + (1 << free_bits))
+
+    def __setitem__(self, key: Network, value: Any) -> None:
+        network, length = self._network(key)
+        if (network, length) in self._networks:
+            self._values[self._networks[network, length]] = value
+            return
+        entry = len(self._values)
+        self._values.append(value)
+        self._networks[network, length] = entry
+        node, depth = self._last_node(network, length, create=True)
+        for slot in self._covered_slots(node, network, length, depth):
+            if self._lengths[slot] <= length:
+                self._entries[slot] = entry
+                self._lengths[slot] = length
+
+    def __getitem__(self, key: Network) -> Any:
+        try:
+            return self._values[self._networks[self._network(key)]]
+        except KeyError:
+            raise KeyError(f'Network {key} is missing in PrefixTable') from None
+
+    def __delitem__(self, key: Network) -> None:
+        network, length = self._network(key)
+        entry = self._networks.pop((network, length), None)
+        if entry is None:
+            raise KeyError(f'Network {key} is missing in PrefixTable')
+        self._values[entry] = None
+        node, depth = self._last_node(network, length, create=False)
+        for slot in self._covered_slots(node, network, length, depth):
+            if self._entries[slot] == entry:
+                self._entries[slot], self._lengths[slot] = self._covering_entry(
+                    slot, network, length, depth,
+                )
+
+    def _covering_entry(
+        self,
+        slot: int,
+        network: int,
+        length: int,
+        depth: int,
+    ) -> tuple[int, int]:
+        """
+        Find the longest network shorter than length which covers the slot.
+
+        Only networks ending in the node of the slot are checked, shorter
+        ones are found in the nodes above it by lookups.
+
+        Returns:
+            (int, int) as entry id and its prefix length, (0, -1) if none
+        """
+        index = slot % self._slots
+        shift = self.bits - depth - self.stride
+        # the address bits before this node are the same for all its slots
+        base = network >> (self.bits - depth) << (self.bits - depth) if depth else 0
+        # a network of length depth ends in the parent node, except /0
+        lowest = depth + 1 if depth else 0
+        for shorter in range(length - 1, lowest - 1, -1):
+            free_bits = self.stride - (shorter - depth)
+            candidate = base | (index >> free_bits << free_bits << shift)
+            entry = self._networks.get((candidate, shorter))
+            if entry is not None:
+                return entry, shorter
+        return 0, -1
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return self._network(key) in self._networks
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self) -> Iterable[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+        for network, length in self._networks:
+            yield ipaddress.ip_network((network, length))
+
+    def __len__(self) -> int:
+        return len(self._networks)
+
+    def __repr__(self) -> str:
+        items = ', '.join(f'{str(key)!r}: {value!r}' for key, value in self.items())
+        return f'{self.__class__.__name__}({{{items}}})'
+
+    def longest_prefix(self, address: Address, default: Any=None) -> Any:
+        """
+        Find the longest network containing the address.
+
+        Returns:
+            (int, Any) as prefix length of the network and its value, or default
+        """
+        address = self._address(address)
+        children, entries = self._children, self._entries
+        stride, mask = self.stride, self._slots - 1
+        shift = self.bits - stride
+        node, found = 0, -1
+        while True:
+            slot = node + ((address >> shift) & mask)
+            if entries[slot]:
+                found = slot
+            node = children[slot]
+            if not node:
+                break
+            shift -= stride
+        if found < 0:
+            return default
+        return self._lengths[found], self._values[entries[found]]
+
+    def longest_prefixes(self, addresses: Iterable[Address], default: Any=None) -> list:
+        """
+        Return `longest_prefix(address, default)` for each of the addresses.
+
+        The lookup loop is inlined, so ints are looked up without any call.
+        """
+        children, entries, lengths = self._children, self._entries, self._lengths
+        values, to_int = self._values, self._address
+        stride, mask = self.stride, self._slots - 1
+        top_shift = self.bits - stride
+        results = []
+        for address in addresses:
+            number = address if isinstance(address, int) else to_int(address)
+            shift, node, found = top_shift, 0, -1
+            while True:
+                slot = node + ((number >> shift) & mask)
+                if entries[slot]:
+                    found = slot
+                node = children[slot]
+                if not node:
+                    break
+                shift -= stride
+            if found < 0:
+                results.append(default)
+            else:
+                results.append((lengths[found], values[entries[found]]))
+        return results
+
+    def match(self, address: Address) -> Iterable[tuple[int, Any]]:
+        """
+        Find all networks containing the address, like `BaseTrie.match`.
+
+        Yields:
+            (int, Any) as prefix length and value, from the shortest network
+        """
+        address = self._address(address)
+        for length in range(self.bits + 1):
+            network = address >> (self.bits - length) << (self.bits - length)
+            entry = self._networks.get((network, length))
+            if entry is not None:
+                yield length, self._values[entry]
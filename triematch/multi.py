@@ -0,0 +1,296 @@
+"""
+Tries with many values per key, stored as posting arrays.
+
+A `MultiTrie` keeps the values of each key as `Postings`: a sorted array of
+int ids of the values, which are stored once in a `SymbolTable` shared by
+all keys (and by tries merged with each other). `search` yields the
+postings of every match as they are stored, and `merge` unions the postings
+of two tries while walking both of them once.
+
+```python
+from triematch.multi import MultiTrie
+
+index = MultiTrie()
+index.add('python', 'doc1')
+index.add('python', 'doc7')
+index.add('py', 'doc2')
+list(index['python'])
+# Output: ['doc1', 'doc7']
+[(start, end, list(docs)) for start, end, docs in index.search('pythons')]
+# Output: [(0, 2, ['doc2']), (0, 6, ['doc1', 'doc7'])]
+```
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import Any
+from typing import Optional
+
+from triematch.symbols import SymbolTable
+from triematch.trie import Empty
+from triematch.trie import Node
+from triematch.trie import Trie
+from triematch.trie import TrieKey
+from triematch.trie import TupleTrie
+
+POSTINGS_TYPECODE = 'i'  # typecode of the arrays of value ids
+
+
+class Postings(Sequence):
+    """
+    Values of a key, as sorted and unique int ids of a `SymbolTable`.
+
+    Values are decoded when they are read, so a value is stored once however
+    many keys have it. Postings are compared and hashed by identity, like the
+    values of other tries, use `list(postings)` to compare values.
+    """
+
+    __slots__ = ('ids', 'payloads')
+
+    def __init__(self, payloads: SymbolTable, ids: Iterable[int]=()) -> None:
+        """
+        Construct Postings instance.
+
+        Args:
+            payloads (SymbolTable): The table of values the ids refer to.
+            ids (iterable, optional): Ids of values, they are sorted and
+                duplicates are removed.
+        """
+        self.payloads = payloads
+        self.ids = array(POSTINGS_TYPECODE, sorted(set(ids)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Any:
+        if isinstance(index, slice):
+            return self.payloads.decode(self.ids[index])
+        return self.payloads.token(self.ids[index])
+
+    def __iter__(self) -> Iterable[Any]:
+        return map(self.payloads.token, self.ids)
+
+    def __contains__(self, value: object) -> bool:
+        return self._index(self.payloads.get(value)) is not None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+    def copy(self) -> 'Postings':
+        """Create a copy with its own array of ids."""
+        inst = self.__class__(self.payloads)
+        inst.ids = array(POSTINGS_TYPECODE, self.ids)
+        return inst
+
+    def _index(self, symbol: Optional[int]) -> Optional[int]:
+        """Return the index of symbol in ids, None if it is not there."""
+        if symbol is None:
+            return None
+        index = bisect_left(self.ids, symbol)
+        if index < len(self.ids) and self.ids[index] == symbol:
+            return index
+        return None
+
+    def add(self, value: Any) -> bool:
+        """Add a value, return False if it was already there."""
+        symbol = self.payloads.add(value)
+        ids = self.ids
+        if not ids or ids[-1] < symbol:
+            ids.append(symbol)
+            return True
+        index = bisect_left(ids, symbol)
+        if ids[index] == symbol:
+            return False
+        ids.insert(index, symbol)
+        return True
+
+    def remove(self, value: Any) -> None:
+        """Remove a value, raise KeyError if it is not there."""
+        index = self._index(self.payloads.get(value))
+        if index is None:
+            raise KeyError(f'Value {value!r} is missing in postings')
+        del self.ids[index]
+
+    def update_ids(self, ids: Sequence[int]) -> bool:
+        """
+        Union ids of values of the same table into the postings.
+
+        Ids which are all larger than the last one are appended, otherwise
+        both sorted arrays are merged.
+
+        Returns:
+            bool: True if any id was added
+        """
+        if not ids:
+            return False
+        own = self.ids
+        if not own or own[-1] < min(ids):
+            own.extend(sorted(set(ids)))
+            return True
+        merged = set(own).union(ids)
+        if len(merged) == len(own):
+            return False
+        self.ids = array(POSTINGS_TYPECODE, sorted(merged))
+        return True
+
+
+class PostingsMixin:
+    """Store `Postings` of many values per key, see `MultiTrie`."""
+
+    def __init__(
+        self,
+        _dict: Optional[dict]=None,
+        /,
+        payloads: Optional[SymbolTable]=None,
+    ) -> None:
+        """
+        Construct the trie.
+
+        Args:
+            _dict (dict, optional): Keys and iterables of their values.
+            payloads (SymbolTable, optional): Table of values, which can be
+                shared with other tries to merge them without translating
+                ids. A new table is used by default.
+        """
+        self.payloads = SymbolTable() if payloads is None else payloads
+        super().__init__(_dict)
+
+    def _postings(self, values: Iterable[Any]) -> Postings:
+        """Return new postings of values, which can be other postings."""
+        if isinstance(values, Postings) and values.payloads is self.payloads:
+            return Postings(self.payloads, values.ids)
+        return Postings(self.payloads, map(self.payloads.add, values))
+
+    def __setitem__(self, key: TrieKey, values: Iterable[Any]) -> None:
+        """Replace the values of key, values is an iterable like a list."""
+        super().__setitem__(key, self._postings(values))
+
+    def add(self, key: TrieKey, value: Any) -> None:
+        """
+        Add a value to the values of key, inserting key if it is missing.
+
+        Args:
+            key: The key, like keys of the trie.
+            value: A hashable value, it is stored once in `payloads`.
+        """
+        self._check_update_possible()
+        node = self.__getnode_safe__(key)
+        if node is None or node.value is Empty:
+            self[key] = (value,)
+        elif node.value.add(value):
+            self._version += 1
+
+    def remove(self, key: TrieKey, value: Any) -> None:
+        """
+        Remove a value of key, and key when it has no values anymore.
+
+        Raises:
+            KeyError: If key or the value of key is missing.
+        """
+        self._check_update_possible()
+        postings = self[key]
+        postings.remove(value)
+        self._version += 1
+        if not postings:
+            del self[key]
+
+    def merge(self, other: 'PostingsMixin') -> None:
+        """
+        Add the keys and values of other to this trie.
+
+        Both tries are walked together once, so shared prefixes are only
+        followed once, and the postings of common keys are merged as sorted
+        arrays. Ids are used as they are if both tries share `payloads`,
+        otherwise they are translated with one lookup per value of other.
+
+        Args:
+            other: A trie of the same kind, or a mapping of keys to iterables
+                of values.
+        """
+        self._check_update_possible()
+        if not isinstance(other, PostingsMixin):
+            for key, values in other.items():
+                for value in values:
+                    self.add(key, value)
+            return
+
+        self._version += 1
+        if other.payloads is self.payloads:
+            translation = None
+        else:
+            translation = array(
+                POSTINGS_TYPECODE, map(self.payloads.add, other.payloads),
+            )
+        path = []
+        stack = [(0, self.data, other.data)]
+        while stack:
+            depth, node, other_node = stack.pop()
+            del path[depth:]
+            path.append(node)
+            if other_node.value is not Empty:
+                self._merge_postings(path, other_node.value, translation)
+            for label, other_child in other_node.items():
+                child = node.get(label)
+                if child is None:
+                    child = node[label] = self.__newnode__()
+                stack.append((depth + 1, child, other_child))
+
+    def _merge_postings(
+        self,
+        path: list,
+        other: Postings,
+        translation: Optional[array],
+    ) -> None:
+        """Union other into the postings of the last node of path."""
+        ids = other.ids
+        if translation is not None:
+            ids = [translation[symbol] for symbol in ids]
+        node = path[-1]
+        if node.value is Empty:
+            node.value = Postings(self.payloads, ids)
+            self._resize_path(path, 1)
+        else:
+            node.value.update_ids(ids)
+            self._resize_path(path, 0)
+
+    def count_matches(self, text: Iterable) -> Counter:
+        """Count how many times the values of keys occur in the text."""
+        counts = Counter()
+        for postings, times in super().count_matches(text).items():
+            for value in postings:
+                counts[value] += times
+        return counts
+
+    def _clone_subtree(self, node: Node) -> Node:
+        """Clone nodes like `Trie`, with copies of their postings."""
+        root = super()._clone_subtree(node)
+        stack = [root]
+        while stack:
+            clone = stack.pop()
+            if clone.value is not Empty:
+                clone.value = clone.value.copy()
+            stack.extend(clone.values())
+        return root
+
+    def _empty_like(self) -> 'PostingsMixin':
+        return self.__class__(payloads=self.payloads)
+
+    def _shares_labels(self, other: Mapping) -> bool:  # noqa: ARG002
+        # items of other are copied, so postings are never shared with other
+        return False
+
+
+class MultiTrie(PostingsMixin, Trie):
+    """
+    A Trie of strings with many values per key.
+
+    `trie[key]` is the `Postings` of key, `add` and `remove` change single
+    values, and `search` yields (start, end, postings) for every match.
+    """
+
+
+class MultiTupleTrie(PostingsMixin, TupleTrie):
+    """A TupleTrie with many values per key, see `MultiTrie`."""
@@ -0,0 +1,343 @@
+"""
+Case-insensitive and Unicode-normalised matching.
+
+A `NormalizedTrie` normalises its keys when they are inserted, and the
+characters of a text one at a time while it is searched, so the text is
+not copied and matches are reported with offsets into the original text,
+also when normalising changes the length of a character (`'ß'` is
+casefolded to `'ss'`).
+
+```python
+from triematch.normalize import NormalizedTrie, casefold, strip_accents
+
+trie = NormalizedTrie({'strasse': 'street', 'cafe': 'coffee'},
+                      normalizers=(casefold, strip_accents))
+list(trie.search('Große Straße, Café'))
+# Output: [(6, 12, 'street'), (14, 18, 'coffee')]
+```
+
+Characters are normalised one by one, so combining sequences are not
+composed (NFKC turns `'ﬁ'` into `'fi'`, but `'e'` followed by a combining
+accent stays two characters). `strip_accents` removes such accents.
+"""
+import unicodedata
+from collections import Counter
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+
+from triematch.trie import Node
+from triematch.trie import Trie
+from triematch.trie import TrieStates
+from triematch.utils import boundary_flags
+
+if TYPE_CHECKING:
+    from triematch.dfa import BatchMatches
+    from triematch.trie import TrieView
+
+
+def casefold(text: str) -> str:
+    """Fold case for caseless matching, like `str.lower` for more scripts."""
+    return text.casefold()
+
+
+def nfkc(text: str) -> str:
+    """Replace compatibility characters like ligatures and full-width forms."""
+    return unicodedata.normalize('NFKC', text)
+
+
+def strip_accents(text: str) -> str:
+    """Remove combining marks, e.g. accents, after decomposing characters."""
+    return ''.join(
+        char
+        for char in unicodedata.normalize('NFD', text)
+        if not unicodedata.combining(char)
+    )
+
+
+class NormalizedTrie(Trie):
+    """
+    A Trie which matches keys and texts after normalising them.
+
+    Keys are stored normalised, so `trie['HELLO']` and `trie['hello']` are
+    the same item and iteration yields normalised keys. `search`,
+    `search_iter` and `match` report offsets into the original text.
+    """
+
+    def __init__(
+        self,
+        _dict: Optional[dict]=None,
+        /,
+        normalizers: Sequence[Callable[[str], str]]=(casefold,),
+    ) -> None:
+        """
+        Construct NormalizedTrie instance.
+
+        Args:
+            _dict (dict, optional): Keys and values to insert.
+            normalizers (sequence, optional): Functions applied in order to
+                each character, e.g. `(nfkc, casefold, strip_accents)`.
+                Default is casefolding only.
+        """
+        self.normalizers = tuple(normalizers)
+        self._folded = {}  # character -> normalised string
+        self._longest = 0  # longest normalised key ever inserted
+        super().__init__(_dict)
+
+    def normalize_char(self, char: str) -> str:
+        """Return the normalised string of a character, it can be empty."""
+        folded = self._folded.get(char)
+        if folded is None:
+            folded = char
+            for normalizer in self.normalizers:
+                folded = normalizer(folded)
+            self._folded[char] = folded
+        return folded
+
+    def normalize(self, text: str) -> str:
+        """Return the normalised text, as keys are stored."""
+        return ''.join(map(self.normalize_char, text))
+
+    def _normalized_items(
+        self,
+        text: Iterable[str],
+        origins: deque,
+    ) -> Iterable[str]:
+        """Yield normalised characters and append their index in text to origins."""
+        normalize_char = self.normalize_char
+        for index, char in enumerate(text):
+            for folded in normalize_char(char):
+                origins.append(index)
+                yield folded
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        key = self.normalize(key)
+        self._longest = max(self._longest, len(key))
+        super().__setitem__(key, value)
+
+    def __getnode_safe__(self, key: str) -> Optional[Node]:
+        return self._find_node(self.normalize(key))
+
+    def __delitem__(self, key: str) -> None:
+        self._check_update_possible()
+        if not key or key not in self:
+            raise KeyError('Key not found in trie object')
+        self._remove(self.normalize(key))
+
+    def copy(self) -> 'NormalizedTrie':
+        """Create a copy of the trie with the same normalizers, see `Trie.copy`."""
+        inst = super().copy()
+        inst._longest = self._longest
+        return inst
+
+    __copy__ = copy
+
+    def _empty_like(self) -> 'NormalizedTrie':
+        return self.__class__(normalizers=self.normalizers)
+
+    def _shares_labels(self, other: Mapping) -> bool:
+        return (
+            super()._shares_labels(other)
+            and other.normalizers == self.normalizers
+        )
+
+    def _union_update(
+        self,
+        other: Mapping,
+        resolve: Optional[Callable[[Any, Any], Any]],
+    ) -> None:
+        other = self._aligned(other)
+        super()._union_update(other, resolve)
+        self._longest = max(self._longest, other._longest)
+
+    def match(self, path: Iterable[str]) -> Iterable[tuple[int, Any]]:
+        """
+        Find keys which the normalised path starts with.
+
+        Yields:
+            (int, Any) as length of the matched part of path and value
+        """
+        origins = deque()
+        items = self._normalized_items(path, origins)
+        for length, node in self._traverse_nodes(items):
+            yield origins[length - 1] + 1, node.value
+
+    def _prefix_node(self, prefix: str) -> tuple[str, Optional[Node]]:
+        return super()._prefix_node(self.normalize(prefix))
+
+    def prefix_view(self, prefix: str) -> 'TrieView':
+        """Return a read-only mapping of keys starting with the normalised prefix."""
+        return super().prefix_view(self.normalize(prefix))
+
+    def longest_prefix(self, key: str, default: Any=None) -> Any:
+        """
+        Find the longest key which the normalised key starts with.
+
+        Returns:
+            (int, Any) as length of the matched part of key and its value, or
+                default
+        """
+        origins = deque()
+        found = super().longest_prefix(self._normalized_items(key, origins), default)
+        if found is default:
+            return default
+        length, value = found
+        return origins[length - 1] + 1, value
+
+    def shortest_prefix(self, key: str, default: Any=None) -> Any:
+        """
+        Find the shortest key which the normalised key starts with.
+
+        Returns:
+            (int, Any) as length of the matched part of key and its value, or
+                default
+        """
+        origins = deque()
+        found = super().shortest_prefix(self._normalized_items(key, origins), default)
+        if found is default:
+            return default
+        length, value = found
+        return origins[length - 1] + 1, value
+
+    def fuzzy(
+        self,
+        query: str,
+        max_distance: int=1,
+    ) -> Iterable[tuple[str, Any, int]]:
+        """Find keys within a Levenshtein distance of the normalised query."""
+        return super().fuzzy(self.normalize(query), max_distance)
+
+    def glob(self, pattern: str) -> Iterable[tuple[str, Any]]:
+        """
+        Find keys matching the normalised wildcard pattern, see `Trie.glob`.
+
+        The whole pattern is normalised, so characters of sets and ranges
+        are normalised too (`'[A-Z]'` is casefolded to `'[a-z]'`).
+        """
+        return super().glob(self.normalize(pattern))
+
+    def search(
+        self,
+        text: Iterable[str],
+        boundaries: Any=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search for all keys in the normalised text, see `search_iter`.
+
+        Args:
+            text (str): The text to search in.
+            boundaries (optional): Separators, see `ACMixin.search`. They are
+                checked on the characters of the original text.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value), as
+                indices of the original text
+        """
+        if boundaries is None:
+            return self.search_iter(text)
+        return self._bounded_normalized_search(text, boundary_flags(text, boundaries))
+
+    def _bounded_normalized_search(
+        self,
+        text: str,
+        text_flags: bytes,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Search the normalised text, on boundaries of the original text."""
+        origins = []
+        normalized = ''.join(self._normalized_items(text, origins))
+        # only the first normalised character of a character can be on a boundary
+        flags = bytearray(len(normalized) + 1)
+        previous = -1
+        for index, origin in enumerate(origins):
+            if origin != previous:
+                flags[index] = text_flags[origin]
+                previous = origin
+        flags[-1] = text_flags[origins[-1] + 1] if origins else 1
+        for start, end, value in self._bounded_search(normalized, flags):
+            yield origins[start], origins[end - 1] + 1, value
+
+    def search_iter(
+        self,
+        items: Iterable[str],
+        encode: None=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search for keys in the characters of items, normalising them lazily.
+
+        Only the text indices of the last normalised characters (as many as
+        the longest key) are kept to translate the offsets of matches.
+
+        Args:
+            items (Iterable): Characters of the text, e.g. a string or a
+                generator of characters.
+            encode: Not supported, keys are matched after normalising.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value), as
+                indices of the original text
+        """
+        if encode is not None:
+            raise ValueError('NormalizedTrie can not encode items')
+        origins = deque(maxlen=max(self._longest, 1))
+        matches = super().search_iter(self._normalized_items(items, origins))
+        for start, end, value in matches:
+            # origins[0] is the text index of normalised character end - len
+            yield origins[start - end + len(origins)], origins[-1] + 1, value
+
+    def instrumented_search(
+        self,
+        text: str,
+        stats: Optional[dict[str, Any]]=None,
+        callback: Optional[Callable[[dict[str, Any]], None]]=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search the normalised text while counting the work done, see `Trie`.
+
+        Counters are about the normalised text, offsets of matches are
+        indices of the original text.
+        """
+        origins = []
+        normalized = ''.join(self._normalized_items(text, origins))
+        matches = super().instrumented_search(normalized, stats, callback)
+        for start, end, value in matches:
+            if start < end:  # a linked search of an empty text yields (0, 0, None)
+                yield origins[start], origins[end - 1] + 1, value
+
+    def contains_any(self, text: Iterable[str]) -> bool:
+        """Check if any key occurs in the normalised text."""
+        if self._state != TrieStates.Linked:
+            return next(iter(self.search_iter(text)), None) is not None
+        return super().contains_any(self._normalized_items(text, deque(maxlen=1)))
+
+    def count_matches(self, text: Iterable[str]) -> Counter:
+        """Count how many times the keys occur in the normalised text."""
+        if self._state != TrieStates.Linked:
+            return Counter(value for _, _, value in self.search_iter(text))
+        return super().count_matches(self._normalized_items(text, deque(maxlen=1)))
+
+    def search_batch(self, texts: Sequence[str]) -> 'BatchMatches':
+        """
+        Search many texts at once, see `ACMixin.search_batch`.
+
+        Texts are normalised first, and offsets of matches are translated
+        back to indices of the original texts.
+        """
+        normalized, origins = [], []
+        for text in texts:
+            normalized.append(''.join(self._normalized_items(text, origins)))
+        matches = super().search_batch(normalized)
+
+        import numpy as np  # noqa: PLC0415, optional like in search_batch
+
+        lengths = np.fromiter(map(len, normalized), dtype=np.intp, count=len(texts))
+        firsts = np.cumsum(lengths) - lengths  # of each text in origins
+        origins = np.array(origins, dtype=np.intp)
+        first = firsts[matches.doc_id]
+        matches.start = origins[first + matches.start]
+        matches.end = origins[first + matches.end - 1] + 1
+        return matches
@@ -0,0 +1,131 @@
+"""
+Persistent tries, whose versions are never changed.
+
+`PersistentTrie.set` and `PersistentTrie.delete` return a new version of the
+trie and leave the old one as it is. Only the nodes on the path of the key
+are copied (path copying), all other nodes are shared by both versions, so
+keeping many snapshots of a large pattern set costs little memory.
+
+```python
+from triematch.persistent import PersistentTrie
+
+v1 = PersistentTrie({'hello': 1, 'help': 2})
+v2 = v1.set('helium', 3)
+v3 = v2.delete('hello')
+dict(v1.items()), dict(v3.items())
+# Output: ({'hello': 1, 'help': 2}, {'help': 2, 'helium': 3})
+```
+"""
+from typing import Any
+from typing import Optional
+
+from triematch.trie import Empty
+from triematch.trie import Node
+from triematch.trie import Trie
+
+
+class PersistentTrie(Trie):
+    """
+    An immutable Trie, changes return new versions which share nodes.
+
+    Lookups, `match`, `search` (without links), `expand`, `complete` and
+    the other read-only methods work like for `Trie`. Nodes can belong to
+    many versions, so a version can not be modified in place, linked or
+    minimized. `copy()` returns a regular `Trie` for that.
+    """
+
+    _frozen = False
+
+    def __init__(
+        self,
+        _dict: Optional[dict]=None,
+        /,
+        **kwargs: dict[str, Any],
+    ) -> None:
+        """Construct the first version of a PersistentTrie, see `Trie`."""
+        super().__init__(_dict, **kwargs)
+        self._frozen = True
+
+    def _check_update_possible(self) -> None:
+        if self._frozen:
+            raise AttributeError('Not possible!')
+        super()._check_update_possible()
+
+    def link_nodes(self, flatten_outputs: bool=False) -> None:  # noqa: ARG002
+        """Not possible, links would be written into nodes of other versions."""
+        raise AttributeError('Not possible!')
+
+    def minimize(self) -> None:
+        """Not possible, versions share nodes already."""
+        raise AttributeError('Not possible!')
+
+    def _empty_like(self) -> Trie:
+        """Create an empty `Trie`, copies of versions are modifiable tries."""
+        return Trie()
+
+    def _version_of(self, root: Node) -> 'PersistentTrie':
+        """Create a version with the given root node."""
+        inst = self.__class__.__new__(self.__class__)
+        inst.data = root
+        inst._frozen = True
+        return inst
+
+    def set(self, key: str, value: Any) -> 'PersistentTrie':
+        """
+        Return a new version with the value of key set.
+
+        Nodes on the path of key are copied, all other nodes are shared with
+        this version.
+
+        Args:
+            key (str): The key to insert or update.
+            value (Any): The value for key.
+
+        Returns:
+            PersistentTrie: the new version, this one is not changed
+        """
+        path = [self.data]
+        for item in key:
+            path.append(None if path[-1] is None else path[-1].get(item))
+        old = path.pop()
+        added = int(old is None or old.value is Empty)
+        node = self.__newnode__() if old is None else old.copy()
+        node.value = value
+        node.size += added
+        for item, parent in zip(reversed(key), reversed(path)):
+            child = node
+            node = self.__newnode__() if parent is None else parent.copy()
+            node[item] = child
+            node.size += added
+        return self._version_of(node)
+
+    def delete(self, key: str) -> 'PersistentTrie':
+        """
+        Return a new version without key.
+
+        Nodes on the path of key are copied, nodes which have no values below
+        them anymore are dropped.
+
+        Raises:
+            KeyError: If key is not in the trie.
+
+        Returns:
+            PersistentTrie: the new version, this one is not changed
+        """
+        if not key or key not in self:
+            raise KeyError('Key not found in trie object')
+        path = [self.data]
+        for item in key:
+            path.append(path[-1][item])
+        node = path.pop().copy()
+        node.value = Empty
+        node.size -= 1
+        for item, parent in zip(reversed(key), reversed(path)):
+            child = node
+            node = parent.copy()
+            if child or child.value is not Empty:
+                node[item] = child
+            else:
+                del node[item]
+            node.size -= 1
+        return self._version_of(node)
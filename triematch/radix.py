@@ -4,8 +4,11 @@ A simple implementation of Radix algorithm.
 A Radix is a memory efficient version of a Trie data structure.
 All feaures avaible in Trie (StringTrie) are supported by Radix objects.
 """
+from collections import Counter
 from collections import UserDict
 from collections.abc import Iterable
+from collections.abc import Mapping
+from itertools import repeat
 from typing import Any
 from typing import Optional
 from typing import Tuple
@@ -16,7 +19,6 @@ from triematch.trie import Empty
 from triematch.trie import Node
 from triematch.trie import NotDefined
 from triematch.trie import Trie
-from triematch.trie import TrieKey
 from triematch.utils import pairwise
 
 
@@ -33,9 +35,14 @@ class RadixNode(Node):
             value (Any, optional): The value associated with this node. Default
             is `Empty` object.
         """
-        self.value = value
+        super().__init__(value)
         self.key_list = SortedList()
 
+    def __reduce__(self) -> tuple:
+        """Unpickle children with __setitem__ after __init__, to fill key_list."""
+        state = {slot: getattr(self, slot) for slot in Node.__slots__}
+        return self.__class__, (), (None, state), None, iter(self.items())
+
     def __setitem__(self, __key: Any, __value: Any) -> None:
         """Set the value associated with this node."""
         if __key not in self.key_list:
@@ -109,7 +116,10 @@ class Radix(Trie):
         return RadixNode(item)
 
     def __setitem__(self, key: str, value: Any) -> None:
+        self._check_update_possible()
+        self._version += 1
         current_node = self.data
+        path = [current_node]
         found_path_len = 0
         while found_path_len < len(key):
 
@@ -123,44 +133,177 @@ class Radix(Trie):
 
             if common_part_len == len(closest_key):
                 current_node = current_node[closest_key]
+                path.append(current_node)
                 found_path_len += len(closest_key)
                 continue
         else:
             ## the whole key exists in radix, update it's node
 
-            if current_node.value is Empty:
-                self._length += 1
+            self._resize_path(path, int(current_node.value is Empty))
             current_node.value = value
             return
 
         remaining_key = key[found_path_len:]
-        try:
-            # check if there is a partial subkey of the key remaning
-            subkey, subcommon_part = self.candidate_key(current_node, remaining_key)
-
-            if not subcommon_part:
-                ##  no part of remaining_key exists in trie
-                new_node = self.__newnode__()
-                new_node.value = value
-                current_node[remaining_key] = new_node  # assign it to current node
-                self._length += 1
-                return
-
-            common_subkey = subkey[:subcommon_part]
-            rest_subkey = subkey[subcommon_part:]
-            rest_remaining_key = remaining_key[subcommon_part:]
-            current_node[common_subkey] = self.__newnode__()
-            current_node[common_subkey][rest_subkey] = current_node.pop(subkey)
-
-            if rest_remaining_key:
-                current_node[common_subkey][rest_remaining_key] = self.__newnode__(
-                    value,
-                )
+        # check if there is a partial subkey of the key remaning
+        subkey, subcommon_part = self.candidate_key(current_node, remaining_key)
+
+        if not subcommon_part:
+            ##  no part of remaining_key exists in trie
+            new_node = self.__newnode__(value)
+            new_node.size = 1
+            current_node[remaining_key] = new_node  # assign it to current node
+            self._resize_path(path, 1)
+            return
+
+        common_subkey = subkey[:subcommon_part]
+        rest_subkey = subkey[subcommon_part:]
+        rest_remaining_key = remaining_key[subcommon_part:]
+        split_node = self.__newnode__()
+        current_node[common_subkey] = split_node
+        split_node[rest_subkey] = current_node.pop(subkey)
+        split_node.size = split_node[rest_subkey].size
+
+        if rest_remaining_key:
+            new_node = self.__newnode__(value)
+            new_node.size = 1
+            split_node[rest_remaining_key] = new_node
+        else:
+            split_node.value = value
+        self._resize_path([*path, split_node], 1)
+
+    def longest_prefix(self, key: str, default: Any=None) -> Any:
+        """Find the longest key which is a prefix of key, see `Trie.longest_prefix`."""
+        found = default
+        node = self.data
+        length = 0
+        while length < len(key):
+            # edges of a node start with different characters
+            labels = node.key_list
+            index = labels.bisect_left(key[length])
+            if index == len(labels) or not key.startswith(labels[index], length):
+                break
+            node = node[labels[index]]
+            length += len(labels[index])
+            if node.value is not Empty:
+                found = length, node.value
+        return found
+
+    def shortest_prefix(self, key: str, default: Any=None) -> Any:
+        """
+        Find the shortest key which is a prefix of key.
+
+        See `Trie.shortest_prefix`, edges are compared as whole labels.
+        """
+        node = self.data
+        length = 0
+        while length < len(key):
+            labels = node.key_list
+            index = labels.bisect_left(key[length])
+            if index == len(labels) or not key.startswith(labels[index], length):
+                break
+            node = node[labels[index]]
+            length += len(labels[index])
+            if node.value is not Empty:
+                return length, node.value
+        return default
+
+    def search_iter(
+        self,
+        items: Iterable[str],
+        encode: Optional[Mapping]=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Search for keys in any iterable of characters, see `Trie.search_iter`."""
+        # failure links of Radix nodes do not follow edges with many characters,
+        # so the nodes of keys which may still match are kept even when linked
+        if encode is not None:
+            items = map(encode.get, items, repeat(NotDefined))
+        if self._dfa is not None:
+            yield from self._dfa.search(items)
+        else:
+            yield from self._active_search(items)
+
+    def _linked_search(self, items: Iterable) -> Iterable[tuple[int, int, Any]]:
+        # failure links do not follow edges with many characters, see search_iter
+        return self._active_search(items)
+
+    def _instrumented_linked_search(
+        self,
+        text: str,
+        counters: dict[str, Any],
+    ) -> Iterable[tuple[int, int, Any]]:
+        return self._instrumented_trie_search(text, counters)
+
+    def _bounded_search(
+        self,
+        items: str,
+        flags: bytes,
+    ) -> Iterable[tuple[int, int, Any]]:
+        if self._dfa is not None:
+            yield from self._dfa.bounded_search(items, flags)
+        else:
+            yield from self._bounded_trie_search(items, flags)
+
+    def contains_any(self, text: str) -> bool:
+        """Check if any key occurs in the text, see `Trie.contains_any`."""
+        if self._dfa is not None:
+            return self._dfa.contains_any(text)
+        return next(iter(self.search_iter(text)), None) is not None
+
+    def count_matches(self, text: str) -> Counter:
+        """Count how many times the keys occur in the text, see `Trie.count_matches`."""
+        if self._dfa is not None:
+            return self._dfa.count_matches(text)
+        return Counter(value for _, _, value in self.search_iter(text))
+
+    @staticmethod
+    def _edge_symbols(label: str) -> str:
+        return label
+
+    def _child_edge(self, node: RadixNode, symbol: str) -> Optional[tuple]:
+        label, common_len = self.candidate_key(node, symbol)
+        return (label, node[label]) if common_len else None
+
+    def _aligned_edges(
+        self,
+        node: RadixNode,
+        other_node: RadixNode,
+    ) -> Iterable[tuple[str, Optional[RadixNode], RadixNode]]:
+        """
+        Pair the edges of other_node with the edges of node, see `Trie`.
+
+        Edges of node are split where an edge of other_node ends inside them,
+        and the rest of a longer edge of other_node is put below a new node,
+        so paired nodes are always at the same key.
+        """
+        for other_label, other_child in other_node.items():
+            label, common_len = self.candidate_key(node, other_label)
+            if not common_len:
+                yield other_label, None, other_child
+                continue
+            if common_len < len(label):
+                child = self._split_edge(node, label, common_len)
             else:
-                current_node[common_subkey].value = value
-            self._length += 1
-        except KeyError:
-            raise
+                child = node[label]
+            if common_len < len(other_label):
+                rest = self.__newnode__()
+                rest[other_label[common_len:]] = other_child
+                rest.size = other_child.size
+                other_child = rest  # noqa: PLW2901
+            yield other_label[:common_len], child, other_child
+
+    def _split_edge(self, node: RadixNode, label: str, length: int) -> RadixNode:
+        """Split the edge with label after length characters, return the new node."""
+        split_node = self.__newnode__()
+        split_node[label[length:]] = node.pop(label)
+        split_node.size = split_node[label[length:]].size
+        node[label[:length]] = split_node
+        return split_node
+
+    def _join_edge(self, node: RadixNode, label: str, child: RadixNode) -> None:
+        if child.value is Empty and len(child) == 1:
+            ((child_label, grandchild),) = child.items()
+            del node[label]
+            node[label + child_label] = grandchild
 
     def __getnode__(self, key: str, only_leafs: bool=True) -> RadixNode:
         """Retrieve the node associated with a given key in the Radix tree."""
@@ -177,69 +320,22 @@ class Radix(Trie):
             else:
                 break
 
-        # if current_node.value is Empty and only_leafs:
         if found_path_len < len(key) or \
-            (current_node.value is Empty and not only_leafs):
+            (current_node.value is Empty and only_leafs):
             return self.__missing__(key)
 
         return current_node
 
-    def _regex(self, node: RadixNode, root_node: bool=True) -> str:
-        if not len(node) or node.value is not Empty:
-            return ''
-
-        inner_patterns = []
-        terminal_keys = []
-        childs = [
-            (key, self._regex(ch_node, False))
-            for key, ch_node in node.items()
-        ]
-
-        terminal_keys = [
-            key
-            for key, ch_pattern in childs
-            if ch_pattern == ''
-        ]
-
-        inner_patterns = [
-            key + ch_pattern
-            for key, ch_pattern in childs
-            if ch_pattern != ''
-        ]
-        empty_inner_patterns = len(inner_patterns) == 0
-
-
-        if len(terminal_keys) == 1:
-            inner_patterns.append(terminal_keys[0])
-        elif len(terminal_keys) > 1:
-            if root_node:
-                inner_patterns.append('|'.join(sorted(terminal_keys)))
-            elif max(map(len, terminal_keys)) == 1:
-                inner_patterns.append('[' + ''.join(sorted(terminal_keys)) + ']')
-            else:
-                inner_patterns.append('(?:' + '|'.join(sorted(terminal_keys)) + ')')
-
-        if len(inner_patterns) == 1:
-            result = inner_patterns[0]
-        elif len(inner_patterns) > 1 and inner_patterns:
-            if root_node:
-                result = '|'.join(sorted(inner_patterns))
-            else:
-                result = '(?:' + '|'.join(sorted(inner_patterns)) + ')'
-
-        if node.value is not Empty:
-            result = '?' if empty_inner_patterns else f'(?:{result})?'
-
-        return result
-
     def __delitem__(self, key: str) -> None:
+        self._check_update_possible()
         if not key or key not in self:
             raise KeyError('Key not found in trie object')
 
+        self._version += 1
         keys = [(0, self.data), *self._traverse_nodes(key, only_leafs=False)]
         _, node = keys[-1]
         node.value = Empty
-        self._length -= 1
+        self._resize_path((node for _, node in keys), -1)
         for (curr_key_len, curr_node), (prev_key_len, prev_node) in pairwise(
             keys[::-1],
         ):
@@ -298,41 +394,31 @@ class Radix(Trie):
             else:
                 break
 
-    def expand(self, path: TrieKey) -> Iterable[tuple[int, Any]]:
+    def _prefix_node(self, prefix: str) -> tuple[str, Optional[RadixNode]]:
         """
-        Look for patterns which contains `path` key.
+        Find the node of all keys starting with prefix.
 
-        Yields:
-            (int, node) for i as length of matched key and value for matched key
-        """
-        path_len = len(path)
+        The prefix can end inside an edge, then the node at the end of that
+        edge is returned with its full key.
 
+        Returns:
+            (key, node) as the key of the node and the node, node is None if no
+            key starts with prefix.
+        """
         current_node = self.data
         found_path_len = 0
-
-        while found_path_len < path_len:
+        while found_path_len < len(prefix):
             key_cand, common_len = self.candidate_key(
                 current_node,
-                path[found_path_len:],
+                prefix[found_path_len:],
             )
-            if common_len and common_len == len(key_cand):
+            if not common_len:
+                return prefix, None
+            if common_len == len(key_cand):
                 current_node = current_node[key_cand]
                 found_path_len += len(key_cand)
+            elif found_path_len + common_len == len(prefix):
+                return prefix[:found_path_len] + key_cand, current_node[key_cand]
             else:
-                break
-
-        if found_path_len < path_len:
-            remaining_key = path[found_path_len:]
-
-            idx = current_node.key_list.bisect_left(remaining_key)
-            curr_nodes = []
-            for key in current_node.key_list[idx:]:
-                if not key.startswith(remaining_key):
-                    break
-                curr_nodes.append((remaining_key, current_node[key]))
-        else:
-            curr_nodes = [(path_len, current_node)]
-
-        for remain_key, node in curr_nodes:
-            node_path = path + remain_key
-            yield from ((node_path + ext, node) for ext, node in node.explore())
+                return prefix, None
+        return prefix, current_node
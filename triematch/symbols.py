@@ -0,0 +1,99 @@
+"""
+Dense int ids for the tokens of tuple keys.
+
+A `SymbolTable` gives each token an id once, in order of first use, so a
+trie can store small ints as transitions instead of hashing arbitrary
+objects on every step. One table can be shared by several tries, which then
+store each token object once.
+
+```python
+from triematch.symbols import SymbolTable
+
+symbols = SymbolTable(['new', 'york'])
+symbols.encode(['new', 'york', 'city'])
+# Output: array('i', [0, 1, -1])
+symbols.decode([1, 0])
+# Output: ('york', 'new')
+```
+"""
+from array import array
+from collections.abc import Iterable
+from collections.abc import Mapping
+from typing import Any
+
+MISSING_SYMBOL = -1  # id of tokens which are not in the table
+
+
+class SymbolTable(Mapping):
+    """
+    A mapping of tokens to dense int ids, 0, 1, 2, ... in order of insertion.
+
+    Ids are never removed or reused, so arrays encoded once stay valid.
+    """
+
+    __slots__ = ('_ids', '_tokens')
+
+    def __init__(self, tokens: Iterable[Any]=()) -> None:
+        """
+        Construct SymbolTable instance.
+
+        Args:
+            tokens (iterable, optional): Tokens to add, in order.
+        """
+        self._ids = {}
+        self._tokens = []
+        for token in tokens:
+            self.add(token)
+
+    def add(self, token: Any) -> int:
+        """Return the id of token, a new one if it is not in the table yet."""
+        symbol = self._ids.get(token)
+        if symbol is None:
+            symbol = self._ids[token] = len(self._tokens)
+            self._tokens.append(token)
+        return symbol
+
+    def __getitem__(self, token: Any) -> int:
+        return self._ids[token]
+
+    def get(self, token: Any, default: Any=None) -> Any:
+        """Return the id of token, or default if it is not in the table."""
+        return self._ids.get(token, default)
+
+    def __contains__(self, token: object) -> bool:
+        return token in self._ids
+
+    def __iter__(self) -> Iterable[Any]:
+        return iter(self._tokens)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._tokens!r})'
+
+    def __getstate__(self) -> list:
+        return self._tokens
+
+    def __setstate__(self, tokens: list) -> None:
+        self._tokens = list(tokens)
+        self._ids = {token: symbol for symbol, token in enumerate(self._tokens)}
+
+    def token(self, symbol: int) -> Any:
+        """Return the token of an id."""
+        return self._tokens[symbol]
+
+    def encode(self, tokens: Iterable[Any]) -> array:
+        """
+        Encode tokens once, e.g. a whole document before searching it.
+
+        Returns:
+            array: ids as `array('i')`, `MISSING_SYMBOL` for unknown tokens
+        """
+        get = self._ids.get
+        return array('i', [get(token, MISSING_SYMBOL) for token in tokens])
+
+    def decode(self, symbols: Iterable[int]) -> tuple:
+        """Return the tokens of ids as a tuple."""
+        tokens = self._tokens
+        return tuple(tokens[symbol] for symbol in symbols)
@@ -41,20 +41,71 @@ print(list(trie.search(search_sequence)))
 # Output: [(0, 2, 'One Two'), (2, 4, 'One Two'), (2, 5, 'One Two Three')]
 ```
 """
+import gc
+import re
+from collections import Counter
 from collections import deque
 from collections import UserDict
+from collections.abc import ItemsView
 from collections.abc import Iterable
+from collections.abc import KeysView
+from collections.abc import Mapping
+from collections.abc import Sequence
+from collections.abc import ValuesView
 from enum import Enum
-from functools import reduce
+from heapq import heappop
+from heapq import heappush
+from itertools import count
+from itertools import repeat
+from math import inf
+from random import random
+from sys import version_info
+from time import perf_counter
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Optional
 from typing import TypeVar
 
+from triematch.symbols import MISSING_SYMBOL
+from triematch.symbols import SymbolTable
+from triematch.utils import boundary_flags
+from triematch.utils import char_class
+from triematch.utils import common_suffix_length
 from triematch.utils import pairwise
+from triematch.wildcard import ANY_ITEM
+from triematch.wildcard import ANY_RUN
+from triematch.wildcard import advance
+from triematch.wildcard import ItemSet
+from triematch.wildcard import pattern_text
+from triematch.wildcard import pattern_tokens
+from triematch.wildcard import start_positions
+from triematch.wildcard import Wildcard
+
+if TYPE_CHECKING:
+    from triematch.dfa import Alphabet
+    from triematch.dfa import BatchMatches
+    from triematch.dfa import DFA
+
+
+class _Constant:
+    """A marker which is unpickled as the same object, like `ANY_RUN`."""
+
+    __slots__ = ('_name',)
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __reduce__(self) -> str:
+        return self._name
+
+    def __repr__(self) -> str:
+        return self._name
+
 
 # constant values used in data structure
-Empty = object()
-NotDefined = object()
+Empty = _Constant('Empty')
+NotDefined = _Constant('NotDefined')
 TrieKey = TypeVar('TrieKey', str, tuple)
 TrieType = TypeVar('TrieType', bound='BaseTrie')
 BaseNodeType = TypeVar('BaseNode', bound='BaseNode')
@@ -64,6 +115,61 @@ class TrieStates(Enum):
 
     Not_Linked = 1
     Linked = 2
+    Minimized = 3  # equal subtrees are shared, the tree is read-only
+
+def new_search_stats() -> dict[str, Any]:
+    """
+    Create an empty counters dict for `ACMixin.instrumented_search`.
+
+    The same dict can be passed to several searches to accumulate counters
+    over a whole corpus.
+
+    Returns:
+        dict: All counters set to zero.
+    """
+    return {
+        'characters': 0,  # input items consumed
+        'transitions': 0,  # child (goto) transitions followed
+        'failure_hops': 0,  # failure links followed
+        'max_failure_chain': 0,  # longest failure walk for a single item
+        'dict_link_hops': 0,  # dictionary links followed
+        'max_output_chain': 0,  # most matches reported for a single item
+        'matches': 0,
+        'elapsed': 0.0,  # seconds spent searching, not in the consumer of matches
+        'throughput': 0.0,  # characters per second
+    }
+
+
+def _value_signature(value: Any) -> tuple:
+    """Hashable signature of a node value, equal values have equal signatures."""
+    try:
+        hash(value)
+    except TypeError:
+        return id, id(value)  # unhashable values are only equal to themselves
+    return type(value), value
+
+
+def _value_score(value: Any) -> Any:
+    """Score of a value used by complete when no score is given."""
+    return value
+
+
+def _next_edit_row(row: list[int], query: TrieKey, symbol: Any) -> list[int]:
+    """Levenshtein row of a key extended by symbol, from the row of the key."""
+    next_row = [row[0] + 1]
+    for i, item in enumerate(query, 1):
+        next_row.append(min(
+            next_row[i - 1] + 1,
+            row[i] + 1,
+            row[i - 1] + (item != symbol),
+        ))
+    return next_row
+
+
+def join_key(prefix: str, path: list[str]) -> str:
+    """Build a string key from a prefix and the list of keys after it."""
+    return prefix + ''.join(path)
+
 
 class BaseNode(dict):
     """
@@ -97,30 +203,60 @@ class BaseNode(dict):
             )
         )
 
-    def explore(self) -> Iterable[tuple[str, TrieKey]]:
-        """DFS Search for all nodes with a non-empty value."""
-        stack = [('', self)]
+    def explore(
+        self,
+        prefix: TrieKey='',
+        make_key: Optional[Callable[[TrieKey, list], TrieKey]]=None,
+    ) -> Iterable[tuple[TrieKey, Any]]:
+        """
+        DFS Search for all nodes with a non-empty value.
+
+        Keys on the current path are kept in a single list, and a key is only
+        built for nodes which have a value.
+
+        Args:
+            prefix (optional): Key of this node, it is the start of all keys.
+            make_key (callable, optional): Build a key from the prefix and the
+                list of keys on the path, default is joining strings.
+
+        Yields:
+            (key, value) for all nodes with a value in this subtree
+        """
+        if make_key is None:
+            make_key = join_key
+        if self.value is not Empty:
+            yield make_key(prefix, []), self.value
+        path = []
+        iterators = [iter(self.items())]
 
         # Perform DFS search for all nodes
-        while stack:
-            current_key, current_node = stack.pop()
-            if current_node.value is not Empty:
-                yield current_key, current_node.value
-            stack.extend(
-                (current_key + key, node)
-                for key, node in
-                reversed(current_node.items())
-            )
+        while iterators:
+            for key, node in iterators[-1]:
+                path.append(key)
+                if node.value is not Empty:
+                    yield make_key(prefix, path), node.value
+                if node:
+                    iterators.append(iter(node.items()))
+                    break
+                path.pop()
+            else:
+                iterators.pop()
+                if path:
+                    path.pop()
 
     def copy(self) -> BaseNodeType:
         """
         Create a shallow copy of the current Node instance.
 
+        The copy has the same value and the same children, which are not
+        copied.
+
         Returns:
             Node: A new Node instance that is a shallow copy of the current instance.
         """
-        inst = self.__class__.__new__(self.__class__)
-        inst.update(self)
+        inst = self.__class__(self.value)
+        for key, child in self.items():
+            inst[key] = child
         return inst
 
 class Node(BaseNode):
@@ -129,7 +265,9 @@ class Node(BaseNode):
 
     It is a dict-like object used for each node of trie objects.
     """
-    __slots__ = ('value', 'dict_link', 'failure_link', 'pathlen')
+    __slots__ = (
+        'value', 'dict_link', 'failure_link', 'pathlen', 'size',
+    )
 
     def __init__(self, value: Any=Empty) -> None:
         """
@@ -143,6 +281,13 @@ class Node(BaseNode):
         self.dict_link = None
         self.failure_link = Empty
         self.pathlen = None
+        self.size = 0  # number of values in this subtree, kept by the trie
+
+    def copy(self) -> 'Node':
+        """Create a shallow copy with the subtree size, but without links."""
+        inst = super().copy()
+        inst.size = self.size
+        return inst
 
 
 
@@ -157,7 +302,8 @@ class BaseTrie(UserDict):
     matching of keys.
     """
 
-    _length = 0
+    _version = 0  # incremented on every change of keys or values
+    _best_scores = None  # id(node) -> (score, best score in its subtree, node)
 
     def __init__(
         self,
@@ -214,16 +360,32 @@ class BaseTrie(UserDict):
         Returns:
         None
         """
+        self._version += 1
         current_node = self.data
+        path = [current_node]
         for item in key:
             current_node = current_node.setdefault(
                 item,
                 self.__newnode__,
             )
-        if current_node.value is Empty:
-            self._length += 1
+            path.append(current_node)
+        self._resize_path(path, int(current_node.value is Empty))
         current_node.value = value
 
+    def _resize_path(self, path: Iterable[Node], delta: int) -> None:
+        """Add delta to the subtree size and drop cached best scores on the path."""
+        best_scores = self._best_scores
+        for node in path:
+            node.size += delta
+            if best_scores:
+                best_scores.pop(id(node), None)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the trie without cached best scores, they are keyed by ids."""
+        state = self.__dict__.copy()
+        state.pop('_best_scores', None)
+        return state
+
     def __getitem__(self, key: TrieKey) -> Any:
         """
         Retrieve the value associated with a given key in the trie.
@@ -256,16 +418,20 @@ class BaseTrie(UserDict):
         """
         if not key or key not in self:
             raise KeyError('Key not found in trie object')
+        self._remove(key)
 
-        keys = [(0, self.data), *self._traverse_nodes(key, only_leafs=False)]
+    def _remove(self, labels: TrieKey) -> None:
+        """Remove the value at the path of labels and prune empty nodes."""
+        self._version += 1
+        keys = [(0, self.data), *self._traverse_nodes(labels, only_leafs=False)]
         _, node = keys[-1]
         node.value = Empty
-        self._length -= 1
+        self._resize_path((node for _, node in keys), -1)
         for (curr_key_len, curr_node), (prev_key_len, prev_node) in pairwise( #noqa
             keys[::-1],
         ):
             if len(curr_node) == 0 and curr_node.value is Empty:
-                del prev_node[key[curr_key_len - 1]]
+                del prev_node[labels[curr_key_len - 1]]
             else:
                 break
 
@@ -302,9 +468,13 @@ class BaseTrie(UserDict):
             Node or None: The node corresponding to the given key if it exists
                       in the trie, or None if any part of the key is not found.
         """
+        return self._find_node(key)
+
+    def _find_node(self, labels: TrieKey) -> Optional[BaseNode]:
+        """Follow edge labels from the root, they are not converted like keys."""
         try:
             current_node = self.data
-            for letter in key:
+            for letter in labels:
                 current_node = current_node[letter]
             return current_node
         except KeyError:
@@ -327,18 +497,23 @@ class BaseTrie(UserDict):
         """
         current_node = self.__getnode_safe__(key)
 
-        if current_node is None:
+        if current_node is None or (current_node.value is Empty and only_leafs):
             newvalue = self.__missing__(key)
             self.__setitem__(key=key, value=newvalue)
-            return self.__getnode__(key, only_leafs=True)
-
-        if current_node.value is Empty and only_leafs:
-            newvalue = self.__missing__(key)
-            current_node.value = newvalue
-            return current_node
+            return self.__getnode_safe__(key)
 
         return current_node
 
+    def _prefix_node(self, prefix: TrieKey) -> tuple[TrieKey, Optional[Node]]:
+        """
+        Find the node of all keys starting with prefix.
+
+        Returns:
+            (key, node) as the key of the node and the node, node is None if no
+            key starts with prefix.
+        """
+        return prefix, self.__getnode_safe__(prefix)
+
     def __contains__(self, key: TrieKey) -> bool:
         """
         Check if key exists in the trie.
@@ -355,34 +530,45 @@ class BaseTrie(UserDict):
         except KeyError:
             return False
 
-    def items(
-        self,
-        root_path: Optional[TrieKey]='',
-    ) -> Iterable[tuple[TrieKey, Any]]:
+    def items(self, root_path: Optional[TrieKey]='') -> 'TrieItemsView':
+        """
+        Return a view of (key, value) pairs in the trie.
+
+        Args:
+            root_path (optional): Only include keys starting with root_path.
+
+        Returns:
+            TrieItemsView: (key, value) pairs for all items in the trie
+        """
+        if not root_path:
+            return TrieItemsView(self)
+        return TrieItemsView(self.prefix_view(root_path))
+
+    def values(self) -> 'TrieValuesView':
+        """Return a view of values in the trie."""
+        return TrieValuesView(self)
+
+    def prefix_view(self, prefix: TrieKey) -> 'TrieView':
+        """
+        Return a read-only mapping of the keys starting with prefix.
+
+        The view follows later changes of the trie. Its length is read from
+        subtree sizes, so counting keys by prefix only walks the prefix.
+        """
+        return TrieView(self, prefix)
+
+    def _iter_items(self, root_path: Optional[TrieKey]='') -> Iterable[tuple]:
         """
         Iterate over all (key, value) pairs in the trie.
 
         Yields:
             tuple: (key, value) pairs for all items in the trie
         """
-        if root_path == '':
-            root_node = self.data
-        else:
-            root_node = self.__getnode__(root_path, only_leafs=False)
-        stack = [
-            (root_path, root_node),
-        ]
-
-        while stack:
-            path, node = stack.pop()
-            if node.value is not Empty:
-                yield path, node.value
-            for key, child in node.items():
-                stack.append(
-                    [path + key, child],
-                )
+        key, node = self._prefix_node(root_path)
+        if node is not None:
+            yield from node.explore(key, self._make_key)
 
-    __items__ = items
+    _make_key = staticmethod(join_key)
 
     def __iter__(self) -> Iterable[TrieKey]:
         """
@@ -391,7 +577,7 @@ class BaseTrie(UserDict):
         Yields:
             tuple: keys in the trie
         """
-        for key, _ in self.__items__():
+        for key, _ in self._iter_items():
             yield key
 
     def __repr__(self) -> str:
@@ -399,31 +585,282 @@ class BaseTrie(UserDict):
 
     def count(self) -> int:
         """
-        Compute and return the number of items in the trie object.
+        Return the number of items in the trie object.
+
+        Subtree sizes are kept up to date on every change, so it is O(1).
 
         Returns:
             int: keys in the trie
         """
-        self._length = reduce(lambda cnt, _: cnt + 1, self.items(), 0)
-        return self._length
+        return self.data.size
 
     def __len__(self) -> int:
-        return self._length
+        return self.data.size
+
+    def node_count(self) -> int:
+        """
+        Count nodes of the trie, nodes shared between keys are counted once.
+
+        Returns:
+            int: number of distinct nodes including the root node
+        """
+        seen = {id(self.data)}
+        stack = [self.data]
+        while stack:
+            for child in stack.pop().values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return len(seen)
 
     def copy(self) -> TrieType:
         """
-        Create a shallow copy of the current Trie instance.
+        Create a copy of the current Trie instance.
+
+        Nodes are cloned one by one (see `_clone_subtree`) instead of
+        inserting every key again, values are not copied. The copy is not
+        linked, minimized or frozen, so it can always be modified.
 
         Returns
-            Trie: A new Trie instance that is a shallow copy of the current instance.
+            Trie: A new Trie instance with new nodes and the same values.
         """
-        inst = self.__class__()
-        for k, v in self.items():
-            inst[k] = v
+        inst = self._empty_like()
+        inst.data = self._clone_subtree(self.data)
         return inst
 
     __copy__ = copy
 
+    def union(
+        self,
+        other: Mapping,
+        resolve: Optional[Callable[[Any, Any], Any]]=None,
+    ) -> TrieType:
+        """
+        Return a new trie with the keys of both tries.
+
+        Both tries are walked together, subtrees which are only in other are
+        copied node by node and keys are never built. Tries which label
+        their edges differently (another class, a dict) are turned into a
+        trie of this kind first.
+
+        Args:
+            other (Mapping): Another trie of the same kind, or any mapping.
+            resolve (callable, optional): Called as `resolve(value,
+                other_value)` for keys in both tries, default is the value
+                of other, like `dict.update`.
+
+        Returns:
+            Trie: a new trie, this one is not changed
+        """
+        inst = self.copy()
+        inst._union_update(other, resolve)
+        return inst
+
+    def intersection(
+        self,
+        other: Mapping,
+        resolve: Optional[Callable[[Any, Any], Any]]=None,
+    ) -> TrieType:
+        """
+        Return a new trie with the keys which are in both tries.
+
+        Args:
+            other (Mapping): Another trie of the same kind, or any mapping.
+            resolve (callable, optional): Called as `resolve(value,
+                other_value)` for every key, default is the value of this trie.
+
+        Returns:
+            Trie: a new trie, this one is not changed
+        """
+        inst = self.copy()
+        inst._intersection_update(other, resolve)
+        return inst
+
+    def difference(self, other: Mapping) -> TrieType:
+        """Return a new trie with the keys which are not in other."""
+        inst = self.copy()
+        inst._difference_update(other)
+        return inst
+
+    def __or__(self, other: Mapping) -> TrieType:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.union(other)
+
+    def __ior__(self, other: Mapping) -> TrieType:
+        self._union_update(other, None)
+        return self
+
+    def __and__(self, other: Mapping) -> TrieType:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __iand__(self, other: Mapping) -> TrieType:
+        self._intersection_update(other, None)
+        return self
+
+    def __sub__(self, other: Mapping) -> TrieType:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.difference(other)
+
+    def __isub__(self, other: Mapping) -> TrieType:
+        self._difference_update(other)
+        return self
+
+    def _check_update_possible(self) -> None:
+        """Raise AttributeError if the trie is frozen, see `ACMixin`."""
+
+    def _empty_like(self) -> TrieType:
+        """Create an empty trie of the same kind, e.g. with the same symbols."""
+        return self.__class__()
+
+    def _shares_labels(self, other: Mapping) -> bool:
+        """Check if the edges of other are labelled like the edges of this trie."""
+        return type(other) is type(self)
+
+    def _aligned(self, other: Mapping) -> 'BaseTrie':
+        """Return other, or a trie of this kind with the items of other."""
+        if other is not self and self._shares_labels(other):
+            return other
+        inst = self._empty_like()
+        inst.update(other)
+        return inst
+
+    def _clone_subtree(self, node: Node) -> Node:
+        """
+        Copy node and the nodes below it, with values and sizes but no links.
+
+        The garbage collector is paused meanwhile: new nodes only refer to
+        their children, so they form no cycles, and collections triggered by
+        the many new nodes would only scan them again and again.
+        """
+        newnode = self.__newnode__
+        root = newnode(node.value)
+        root.size = node.size
+        stack = [(root, node)]
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            while stack:
+                clone, original = stack.pop()
+                for label, child in original.items():
+                    child_clone = clone[label] = newnode(child.value)
+                    child_clone.size = child.size
+                    stack.append((child_clone, child))
+        finally:
+            if collecting:
+                gc.enable()
+        return root
+
+    def _aligned_edges(
+        self,
+        node: Node,
+        other_node: Node,
+    ) -> Iterable[tuple[Any, Optional[Node], Node]]:
+        """
+        Pair the edges of other_node with the edges of node.
+
+        Yields:
+            (label, child, other_child) for every edge of other_node, child is
+                None if node has no edge with the same label
+        """
+        for label, other_child in other_node.items():
+            yield label, node.get(label), other_child
+
+    def _join_edge(self, node: Node, label: Any, child: Node) -> None:
+        """Merge the edge to child with the edge below it, only Radix does."""
+
+    def _compact(self) -> None:
+        """Remove subtrees without values, recount sizes and join edges."""
+        self._best_scores = None
+        stack = [(self.data, False)]
+        while stack:
+            node, visited = stack.pop()
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.values())
+                continue
+            node.size = int(node.value is not Empty)
+            for label, child in list(node.items()):
+                if child.size:
+                    node.size += child.size
+                    self._join_edge(node, label, child)
+                else:
+                    del node[label]
+
+    def _union_update(
+        self,
+        other: Mapping,
+        resolve: Optional[Callable[[Any, Any], Any]],
+    ) -> None:
+        """Add the keys of other to this trie, see `union`."""
+        self._check_update_possible()
+        other = self._aligned(other)
+        self._version += 1
+        path = []
+        stack = [(0, self.data, other.data)]
+        while stack:
+            depth, node, other_node = stack.pop()
+            del path[depth:]
+            path.append(node)
+            if other_node.value is not Empty:
+                if node.value is Empty:
+                    node.value = other_node.value
+                    self._resize_path(path, 1)
+                else:
+                    node.value = other_node.value if resolve is None else resolve(
+                        node.value, other_node.value,
+                    )
+                    self._resize_path(path, 0)
+            for label, child, other_child in self._aligned_edges(node, other_node):
+                if child is None:
+                    node[label] = self._clone_subtree(other_child)
+                    self._resize_path(path, other_child.size)
+                else:
+                    stack.append((depth + 1, child, other_child))
+
+    def _intersection_update(
+        self,
+        other: Mapping,
+        resolve: Optional[Callable[[Any, Any], Any]],
+    ) -> None:
+        """Keep only the keys which are in other, see `intersection`."""
+        self._check_update_possible()
+        other = self._aligned(other)
+        self._version += 1
+        stack = [(self.data, other.data)]
+        while stack:
+            node, other_node = stack.pop()
+            if other_node.value is Empty:
+                node.value = Empty
+            elif node.value is not Empty and resolve is not None:
+                node.value = resolve(node.value, other_node.value)
+            shared = set()
+            for label, child, other_child in self._aligned_edges(node, other_node):
+                if child is not None:
+                    shared.add(label)
+                    stack.append((child, other_child))
+            for label in [label for label in node if label not in shared]:
+                del node[label]
+        self._compact()
+
+    def _difference_update(self, other: Mapping) -> None:
+        """Remove the keys which are in other, see `difference`."""
+        self._check_update_possible()
+        other = self._aligned(other)
+        self._version += 1
+        stack = [(self.data, other.data)]
+        while stack:
+            node, other_node = stack.pop()
+            if other_node.value is not Empty:
+                node.value = Empty
+            for _, child, other_child in self._aligned_edges(node, other_node):
+                if child is not None:
+                    stack.append((child, other_child))
+        self._compact()
+
     def _traverse_nodes(
         self,
         path: TrieKey,
@@ -458,6 +895,55 @@ class BaseTrie(UserDict):
         for length, node in self._traverse_nodes(path, only_leafs=True):
             yield length, node.value
 
+    def longest_prefix(self, key: TrieKey, default: Any=None) -> Any:
+        """
+        Find the longest key in the trie which is a prefix of key.
+
+        It is the last item `match` would yield, found in a single loop.
+
+        Args:
+            key: The key (e.g. an address or a path) to look up.
+            default (optional): Returned if no key is a prefix of key.
+
+        Returns:
+            (int, Any) as length of the matched key and its value, or default
+        """
+        found = default
+        node = self.data
+        for length, item in enumerate(key, 1):
+            node = node.get(item)
+            if node is None:
+                break
+            if node.value is not Empty:
+                found = length, node.value
+        return found
+
+    def shortest_prefix(self, key: TrieKey, default: Any=None) -> Any:
+        """
+        Find the shortest key in the trie which is a prefix of key.
+
+        Returns:
+            (int, Any) as length of the matched key and its value, or default
+        """
+        node = self.data
+        for length, item in enumerate(key, 1):
+            node = node.get(item)
+            if node is None:
+                break
+            if node.value is not Empty:
+                return length, node.value
+        return default
+
+    def longest_prefixes(self, keys: Iterable[TrieKey], default: Any=None) -> list:
+        """Return `longest_prefix(key, default)` for each of the keys."""
+        longest_prefix = self.longest_prefix
+        return [longest_prefix(key, default) for key in keys]
+
+    def shortest_prefixes(self, keys: Iterable[TrieKey], default: Any=None) -> list:
+        """Return `shortest_prefix(key, default)` for each of the keys."""
+        shortest_prefix = self.shortest_prefix
+        return [shortest_prefix(key, default) for key in keys]
+
     def expand(self, path: TrieKey) -> Iterable[tuple[int, Any]]:
         """
         Look for patterns which contains `path` key.
@@ -465,9 +951,184 @@ class BaseTrie(UserDict):
         Yields:
             (int, node) for i as length of matched key and value for matched key
         """
-        node = self.__getnode__(path, only_leafs=False)
+        key, node = self._prefix_node(path)
+        if node is None:
+            node = self.__getnode__(path, only_leafs=False)
+
+        yield from node.explore(key, self._make_key)
+
+    def complete(
+        self,
+        prefix: TrieKey='',
+        k: int=10,
+        score: Optional[Callable[[Any], Any]]=None,
+    ) -> list[tuple[TrieKey, Any]]:
+        """
+        Find the k keys starting with prefix which have the highest score.
+
+        The best score in the subtree of each node is cached, and dropped along
+        the changed path on every update and rebuilt on the next call. Nodes are
+        opened best-first, so only the paths to the top k keys are visited
+        instead of the whole subtree. Pass the same `score` object on every call
+        to reuse the cached scores.
+
+        Args:
+            prefix (optional): Only keys starting with prefix are completed.
+            k (int, optional): Number of keys to return, default is 10.
+            score (callable, optional): Score of a value, default is the value
+                itself, so values have to be numbers.
+
+        Returns:
+            list: (key, value) pairs ordered by decreasing score
+        """
+        if score is None:
+            score = _value_score
+        key, node = self._prefix_node(prefix)
+        if node is None or k <= 0:
+            return []
+
+        completions = []
+        tie_breaker = count()  # nodes are not comparable
+        heap = [(-self._best_score(node, score), next(tie_breaker), (), node, False)]
+        while heap and len(completions) < k:
+            _, _, path, node, is_key = heappop(heap)
+            if is_key:
+                # no open node can reach a better score than this key
+                completions.append((self._make_key(key, list(path)), node.value))
+                continue
+            if node.value is not Empty:
+                entry = (-score(node.value), next(tie_breaker), path, node, True)
+                heappush(heap, entry)
+            for label, child in node.items():
+                if child.size:
+                    entry = (
+                        -self._best_score(child, score),
+                        next(tie_breaker),
+                        (*path, label),
+                        child,
+                        False,
+                    )
+                    heappush(heap, entry)
+        return completions
+
+    def _best_score(self, node: Node, score: Callable[[Any], Any]) -> Any:
+        """
+        Return the best score in the subtree of node, filling missing caches.
+
+        Scores are cached in a dict by id of node, instead of in every node,
+        so tries which never complete do not pay for them. Cached entries keep
+        their node, so its id is not reused while the entry exists.
+        """
+        if self._best_scores is None:
+            self._best_scores = {}
+        best_scores = self._best_scores
+
+        def is_cached(node: Node) -> bool:
+            cached = best_scores.get(id(node))
+            return cached is not None and cached[0] is score
+
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if is_cached(current):
+                stack.pop()
+                continue
+            missing = [child for child in current.values() if not is_cached(child)]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            best = max(
+                (best_scores[id(child)][1] for child in current.values()),
+                default=-inf,
+            )
+            if current.value is not Empty:
+                best = max(best, score(current.value))
+            best_scores[id(current)] = (score, best, current)
+        return best_scores[id(node)][1]
+
+    def fuzzy(
+        self,
+        query: TrieKey,
+        max_distance: int=1,
+    ) -> Iterable[tuple[TrieKey, Any, int]]:
+        """
+        Find keys within a Levenshtein distance of the query.
+
+        Each node extends the dynamic programming row of its parent by the
+        items of its edge, so the row is computed once for a shared prefix.
+        Subtrees are skipped as soon as every cell of the row is larger than
+        `max_distance`, since the distance can only grow below them.
+
+        Args:
+            query: The key to look up, with typos.
+            max_distance (int, optional): Largest number of insertions,
+                deletions and substitutions, default is 1.
+
+        Yields:
+            (key, value, distance) for keys close enough to the query
+        """
+        first_row = list(range(len(query) + 1))
+        stack = [(self.data, (), first_row)]
+        while stack:
+            node, path, row = stack.pop()
+            if node.value is not Empty and row[-1] <= max_distance:
+                yield self._make_key('', list(path)), node.value, row[-1]
+            for label, child in node.items():
+                child_row = row
+                for symbol in self._edge_symbols(label):
+                    child_row = _next_edit_row(child_row, query, symbol)
+                    if min(child_row) > max_distance:
+                        break
+                else:
+                    stack.append((child, (*path, label), child_row))
+
+    @staticmethod
+    def _edge_symbols(label: Any) -> Iterable:
+        """Items of the key which the edge with label consumes."""
+        return (label,)
+
+    def glob(self, pattern: TrieKey) -> Iterable[tuple[TrieKey, Any]]:
+        """
+        Find keys matching a wildcard pattern, see `triematch.wildcard`.
+
+        Positions of the pattern reached by the path are kept for each node
+        and subtrees which no position can continue into are skipped. When the
+        pattern only allows literal items at a node, children are looked up
+        instead of tested one by one.
+
+        Args:
+            pattern: A glob style string like `'user_?_[0-9]*'`, or for tuple
+                keys a tuple with `ANY_ITEM`, `ANY_RUN` and `ItemSet` items.
+
+        Yields:
+            (key, value) for all keys matching the whole pattern
+        """
+        tokens = pattern_tokens(pattern)
+        stack = [(self.data, (), start_positions(tokens))]
+        while stack:
+            node, path, positions = stack.pop()
+            if node.value is not Empty and len(tokens) in positions:
+                yield self._make_key('', list(path)), node.value
+            next_tokens = {tokens[i] for i in positions if i < len(tokens)}
+            if any(isinstance(token, Wildcard) for token in next_tokens):
+                edges = node.items()
+            else:
+                edges = filter(None, (self._child_edge(node, t) for t in next_tokens))
+            for label, child in edges:
+                child_positions = positions
+                for symbol in self._edge_symbols(label):
+                    child_positions = advance(tokens, child_positions, symbol)
+                    if not child_positions:
+                        break
+                else:
+                    stack.append((child, (*path, label), child_positions))
 
-        yield from ((path + ext, node) for ext, node in node.explore())
+    @staticmethod
+    def _child_edge(node: Node, symbol: Any) -> Optional[tuple[Any, Node]]:
+        """Return (label, child) of the edge of node starting with symbol."""
+        child = node.get(symbol)
+        return None if child is None else (symbol, child)
 
     def search(self, text: TrieKey) -> Iterable[tuple[int, int, Any]]:
         """
@@ -483,8 +1144,109 @@ class BaseTrie(UserDict):
                 yield i, i + length, value
 
 
+class TrieView(Mapping):
+    """
+    Read-only mapping of the keys of a trie which start with a prefix.
+
+    It is a lazy view, so it always shows the current content of the trie.
+    """
+
+    __slots__ = ('_prefix', '_trie')
+
+    def __init__(self, trie: BaseTrie, prefix: TrieKey) -> None:
+        self._trie = trie
+        self._prefix = trie._make_key(prefix, [])
+
+    def _has_prefix(self, key: TrieKey) -> bool:
+        return self._trie._make_key(key[:len(self._prefix)], []) == self._prefix
+
+    def __getitem__(self, key: TrieKey) -> Any:
+        if not self._has_prefix(key):
+            raise KeyError(f'Key {key} does not start with {self._prefix}')
+        return self._trie[key]
+
+    def __contains__(self, key: TrieKey) -> bool:
+        return self._has_prefix(key) and key in self._trie
+
+    def __len__(self) -> int:
+        _, node = self._trie._prefix_node(self._prefix)
+        return 0 if node is None else node.size
+
+    def __iter__(self) -> Iterable[TrieKey]:
+        for key, _ in self._iter_items():
+            yield key
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._prefix!r}, {dict(self.items())!r})'
+
+    def _iter_items(self) -> Iterable[tuple[TrieKey, Any]]:
+        return self._trie._iter_items(self._prefix)
+
+    def keys(self) -> KeysView:
+        """Return a view of keys starting with the prefix."""
+        return KeysView(self)
+
+    def values(self) -> 'TrieValuesView':
+        """Return a view of values of keys starting with the prefix."""
+        return TrieValuesView(self)
+
+    def items(self) -> 'TrieItemsView':
+        """Return a view of (key, value) pairs of keys starting with the prefix."""
+        return TrieItemsView(self)
+
+    def sample(self, rand: Callable[[], float]=random) -> TrieKey:
+        """
+        Pick a random key starting with the prefix, all keys are equally likely.
+
+        Subtree sizes are used to choose a child on each level, so it only
+        walks one path from the prefix to the key.
+
+        Args:
+            rand (callable, optional): Returns a float in [0, 1), default is
+                `random.random`.
+
+        Returns:
+            key: a key of the view
+        """
+        key, node = self._trie._prefix_node(self._prefix)
+        if node is None or not node.size:
+            raise KeyError('Cannot sample from an empty view')
+        index = int(rand() * node.size)
+        path = []
+        while True:
+            if node.value is not Empty:
+                if not index:
+                    return self._trie._make_key(key, path)
+                index -= 1
+            for label, child in node.items():  # noqa: B007
+                if index < child.size:
+                    break
+                index -= child.size
+            path.append(label)
+            node = child
+
+
+class TrieValuesView(ValuesView):
+    """Values of a trie or a TrieView, read in one walk over the nodes."""
+
+    def __iter__(self) -> Iterable[Any]:
+        for _, value in self._mapping._iter_items():
+            yield value
+
+
+class TrieItemsView(ItemsView):
+    """(key, value) pairs of a trie or a TrieView, read in one walk over the nodes."""
+
+    def __iter__(self) -> Iterable[tuple[TrieKey, Any]]:
+        yield from self._mapping._iter_items()
+
+
 class ACMixin:
     _state = TrieStates.Not_Linked
+    _dfa_cache = None  # (trie version, DFA) for search_batch
+    _dfa = None  # DFA used by search after compile_dfa
+    _flat_outputs = False  # search reads _outputs, see link_nodes
+    _outputs = None  # id(node) -> (pathlen, value) of all matches of the node
 
     def __setitem__(self, key: TrieKey, value: Any) -> None:
         """
@@ -521,7 +1283,7 @@ class ACMixin:
             ref = parent
             tr_path_len = len(transition_path)
             for i in range(1, tr_path_len):
-                link = self.__getnode_safe__(transition_path[i:])
+                link = self._find_node(transition_path[i:])
 
                 if link is not None:
                     node.failure_link = link
@@ -550,13 +1312,61 @@ class ACMixin:
                 stack.appendleft(child_node)
 
     def _check_update_possible(self) -> None:
-        if self._state == TrieStates.Linked:
+        if self._state != TrieStates.Not_Linked:
             raise AttributeError('Not possible!')
 
-    def link_nodes(self) -> None:
-        """Generate lookup links between nodes and freeze the tree."""
+    def _update_outputs(self) -> None:
+        """
+        Store (pathlen, value) of each node and its dictionary links.
+
+        Only nodes with matches are stored, by id of node, since the nodes
+        are not changed while the trie is linked. A dictionary link of a Radix
+        node can go to a node which is not done yet (edges have many items),
+        so the chain of links is followed up to the first node which is done.
+        """
+        all_outputs = self._outputs = {}
+        stack = [self.data]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.values())
+            chain = []
+            while node is not None and id(node) not in all_outputs:
+                chain.append(node)
+                node = node.dict_link
+            outputs = () if node is None else all_outputs[id(node)]
+            for node in reversed(chain):
+                if node.value is not Empty:
+                    outputs = ((node.pathlen, node.value), *outputs)
+                if outputs:
+                    all_outputs[id(node)] = outputs
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the trie without outputs, they are rebuilt by the next search."""
+        state = super().__getstate__()
+        state.pop('_outputs', None)
+        return state
+
+    def link_nodes(self, flatten_outputs: bool=False) -> None:
+        """
+        Generate lookup links between nodes and freeze the tree.
+
+        Args:
+            flatten_outputs (bool, optional): Also store all matches of each
+                node (its value and the values of its dictionary links) as a
+                tuple, in a table of the trie. `search` then reports them with a single
+                loop, and skips nodes without matches with one check, instead
+                of following dictionary links one by one. Nodes which end
+                many nested keys (`a`, `aa`, `aaa`, ...) profit most, at the
+                cost of a tuple per node with a value.
+        """
+        if self._state == TrieStates.Minimized:
+            raise AttributeError('Not possible!')
         self._update_failure_links()
         self._update_dict_links()
+        self._outputs = None
+        if flatten_outputs:
+            self._update_outputs()
+        self._flat_outputs = flatten_outputs
         self._state = TrieStates.Linked
 
     def unlink_nodes(self) -> None:
@@ -566,28 +1376,130 @@ class ACMixin:
         If this method is called, the Trie will search for
         patterns like a regular Trie. This is trying to implement Aho-Corasick.
         """
+        if self._state == TrieStates.Minimized:
+            raise AttributeError('Not possible!')
         self._state = TrieStates.Not_Linked
+        self._dfa = None
+        self._outputs = None
 
-    def search(self, text: str) -> Iterable[Any]:
+    def compile_dfa(
+        self,
+        alphabet: Optional['Alphabet']=None,
+        max_memory: Optional[int]=None,
+    ) -> 'DFA':
         """
-        Search for the patterns in the given text.
+        Compile the trie into a dense transition table used by `search`.
 
-        If link_nodes is called, this methid will use failure and dictionary links
-        to speed up the search process. In other cases it will work as a regular Trie.
+        Failure transitions are resolved in the table, so `search` and
+        `search_iter` do one table lookup per item instead of walking failure
+        and dictionary links. The table has `states * (len(alphabet) + 1)`
+        entries, so it is meant for small alphabets. The trie is linked (and
+        read-only) afterwards, `unlink_nodes` drops the table.
 
         Args:
-            text (str): The text to search for patterns.
+            alphabet (Alphabet, optional): Symbols which get their own column,
+                default is the symbols of the keys, see `triematch.dfa`.
+            max_memory (int, optional): Largest table size in bytes, checked
+                with `estimate_memory` before the table is built.
+
+        Raises:
+            ValueError: If the table would be larger than max_memory, or a
+                symbol of a key is not in the alphabet.
+
+        Returns:
+            DFA: the compiled automaton
         """
+        # imported here, since the dfa module imports this one
+        from triematch.dfa import DFA  # noqa: PLC0415
+        from triematch.dfa import estimate_memory  # noqa: PLC0415
+
+        if max_memory is not None:
+            needed = estimate_memory(self, alphabet)
+            if needed > max_memory:
+                raise ValueError(
+                    f'DFA table needs {needed} bytes, more than max_memory',
+                )
+        dfa = DFA(self, alphabet)
         if self._state != TrieStates.Linked:
-            yield from super().search(text)
-            return
-        if not text:
-            yield 0, 0, None
-            return
+            self.link_nodes()
+        self._dfa = dfa
+        return dfa
 
-        root_node = current_node = self.data
+    def minimize(self) -> None:
+        """
+        Share equal subtrees between keys and freeze the tree.
+
+        Nodes with the same value and the same children are replaced by a
+        single node (hash-consing), which turns the trie into a DAWG. Keys
+        sharing suffixes, like inflected words or domain names, share nodes
+        for those suffixes. Lookups, `match`, `expand` and `to_regex` work
+        as before, but the trie can not be modified or linked anymore. Use
+        `copy()` to get a modifiable trie again.
+        """
+        if self._state == TrieStates.Linked:
+            raise AttributeError('Not possible!')
+        canonical = {}  # id(node) -> node which replaces it
+        registry = {}  # signature -> node
+        stack = [(self.data, False)]
 
-        for i, letter in enumerate(text):
+        while stack:
+            node, visited = stack.pop()
+            if id(node) in canonical:
+                continue
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.values())
+                continue
+            for key, child in list(node.items()):
+                node[key] = canonical[id(child)]
+            signature = (
+                _value_signature(node.value),
+                frozenset((key, id(child)) for key, child in node.items()),
+            )
+            canonical[id(node)] = registry.setdefault(signature, node)
+
+        self._best_scores = None  # it would keep the replaced nodes alive
+        self._state = TrieStates.Minimized
+
+    def search(self, text: str, boundaries: Any=None) -> Iterable[Any]:
+        """
+        Search for the patterns in the given text.
+
+        If link_nodes is called, this methid will use failure and dictionary links
+        to speed up the search process. In other cases it will work as a regular Trie.
+
+        Args:
+            text (str): The text to search for patterns.
+            boundaries (optional): Only report keys which start and end on a
+                boundary: 'word' (next to a character which is not a letter,
+                digit or '_'), a function checking if an item is a separator
+                or a collection of separators. See `utils.boundary_flags`.
+        """
+        if boundaries is not None:
+            yield from self._bounded_search(text, boundary_flags(text, boundaries))
+            return
+        if self._state != TrieStates.Linked:
+            yield from super().search(text)
+            return
+        if not text:
+            yield 0, 0, None
+            return
+        if self._dfa is not None:
+            yield from self._dfa.search(text)
+            return
+
+        yield from self._linked_search(text)
+
+    def _linked_search(self, items: Iterable) -> Iterable[tuple[int, int, Any]]:
+        """Follow failure and dictionary links, reading items only once."""
+        if self._flat_outputs:
+            if self._outputs is None:  # after unpickling
+                self._update_outputs()
+            yield from self._flat_linked_search(items)
+            return
+        root_node = current_node = self.data
+
+        for i, letter in enumerate(items):
             while letter not in current_node and current_node is not root_node:
                 current_node = current_node.failure_link
 
@@ -604,6 +1516,355 @@ class ACMixin:
                     break
                 yield i - value_node.pathlen, i + 1, value_node.value
 
+    def _flat_linked_search(self, items: Iterable) -> Iterable[tuple[int, int, Any]]:
+        """Follow failure links, matches are read from the outputs of nodes."""
+        root_node = current_node = self.data
+        get_outputs = self._outputs.get
+
+        for i, letter in enumerate(items):
+            while letter not in current_node and current_node is not root_node:
+                current_node = current_node.failure_link
+
+            current_node = current_node.get(letter, root_node)
+            outputs = get_outputs(id(current_node))
+            if outputs:
+                for pathlen, value in outputs:
+                    yield i - pathlen, i + 1, value
+
+    def _bounded_search(
+        self,
+        items: Sequence,
+        flags: bytes,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Search for keys starting and ending at positions i with flags[i]."""
+        if self._dfa is not None:
+            yield from self._dfa.bounded_search(items, flags)
+        elif self._state == TrieStates.Linked:
+            yield from self._bounded_linked_search(items, flags)
+        else:
+            yield from self._bounded_trie_search(items, flags)
+
+    def _bounded_linked_search(
+        self,
+        items: Iterable,
+        flags: bytes,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Follow links like `_linked_search`, skipping ends not on a boundary."""
+        root_node = current_node = self.data
+
+        for i, letter in enumerate(items):
+            while letter not in current_node and current_node is not root_node:
+                current_node = current_node.failure_link
+
+            current_node = current_node.get(letter, root_node)
+            if not flags[i + 1]:
+                continue
+            value_node = current_node
+            if value_node.value is Empty:
+                value_node = value_node.dict_link
+            while value_node is not None:
+                start = i - value_node.pathlen
+                if flags[start]:
+                    yield start, i + 1, value_node.value
+                value_node = value_node.dict_link
+
+    def _bounded_trie_search(
+        self,
+        items: Sequence,
+        flags: bytes,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Match keys from every position on a boundary, without links."""
+        for start in range(len(items)):
+            if not flags[start]:
+                continue
+            for length, node in self._traverse_nodes(items[start:]):
+                if flags[start + length]:
+                    yield start, start + length, node.value
+
+    def contains_any(self, text: Iterable) -> bool:
+        """
+        Check if any key occurs in the text, stopping at the first match.
+
+        After `link_nodes` it is the automaton loop of `search` without
+        building a match, otherwise it takes the first match of `search_iter`.
+
+        Args:
+            text (Iterable): The items (characters, tokens) to search in.
+
+        Returns:
+            bool: True if at least one key occurs in the text
+        """
+        if self._dfa is not None:
+            return self._dfa.contains_any(text)
+        if self._state != TrieStates.Linked:
+            return next(iter(self.search_iter(text)), None) is not None
+
+        root_node = current_node = self.data
+        for letter in text:
+            while letter not in current_node and current_node is not root_node:
+                current_node = current_node.failure_link
+            current_node = current_node.get(letter, root_node)
+            if current_node.value is not Empty or current_node.dict_link is not None:
+                return True
+        return False
+
+    def count_matches(self, text: Iterable) -> Counter:
+        """
+        Count how many times the keys occur in the text.
+
+        After `link_nodes`, the automaton loop only counts how often each node
+        with matches is reached. Values are added up from those counts at the
+        end, so no tuple is built per match.
+
+        Args:
+            text (Iterable): The items (characters, tokens) to search in.
+
+        Returns:
+            Counter: number of matches of each value, so values have to be
+                hashable
+        """
+        if self._dfa is not None:
+            return self._dfa.count_matches(text)
+        if self._state != TrieStates.Linked:
+            return Counter(value for _, _, value in self.search_iter(text))
+
+        visits = {}  # id(node) -> [node, times the node was reached]
+        root_node = current_node = self.data
+        for letter in text:
+            while letter not in current_node and current_node is not root_node:
+                current_node = current_node.failure_link
+            current_node = current_node.get(letter, root_node)
+            if current_node.value is not Empty or current_node.dict_link is not None:
+                visit = visits.get(id(current_node))
+                if visit is None:
+                    visits[id(current_node)] = [current_node, 1]
+                else:
+                    visit[1] += 1
+
+        counts = Counter()
+        for node, times in visits.values():
+            if node.value is not Empty:
+                counts[node.value] += times
+            value_node = node.dict_link
+            while value_node is not None:
+                counts[value_node.value] += times
+                value_node = value_node.dict_link
+        return counts
+
+    def _active_search(self, items: Iterable) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search without links, keeping the nodes of keys which may still match.
+
+        Each kept node also has the rest of the edge it is on, which is only
+        non-empty for edges with more than one item (Radix).
+        """
+        active = []  # (start, node, rest of the edge to node)
+        for i, item in enumerate(items):
+            active.append((i, self.data, ()))
+            still_active = []
+            for start, node, rest in active:
+                if rest:
+                    if rest[0] != item:
+                        continue
+                    child, rest = node, rest[1:]  # noqa: PLW2901
+                else:
+                    edge = self._child_edge(node, item)
+                    if edge is None:
+                        continue
+                    label, child = edge
+                    rest = self._edge_symbols(label)[1:]  # noqa: PLW2901
+                if not rest and child.value is not Empty:
+                    yield start, i + 1, child.value
+                if rest or child:
+                    still_active.append((start, child, rest))
+            active = still_active
+
+    def search_iter(
+        self,
+        items: Iterable,
+        encode: Optional[Mapping]=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search for keys in any iterable, e.g. a generator of tokens.
+
+        Items are read lazily and only once. After `link_nodes` the state is a
+        single node of the automaton, otherwise the nodes of the keys which
+        may still match are kept (at most one per item of the longest key).
+
+        Args:
+            items (Iterable): The items (tokens, characters) to search in.
+            encode (Mapping, optional): Look up each item in it before the
+                trie, e.g. to use int ids of tokens as keys so transitions are
+                int lookups. Items missing in it can not be part of a key.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value)
+        """
+        if encode is not None:
+            items = map(encode.get, items, repeat(NotDefined))
+        if self._dfa is not None:
+            yield from self._dfa.search(items)
+        elif self._state == TrieStates.Linked:
+            yield from self._linked_search(items)
+        else:
+            yield from self._active_search(items)
+
+    def search_batch(self, texts: Sequence[TrieKey]) -> 'BatchMatches':
+        """
+        Search many short texts at once with NumPy, see `triematch.dfa`.
+
+        The keys are exported once into a dense transition table (a `DFA`,
+        cached until the trie is modified), and all texts advance together
+        by one vectorised table lookup per position, so there is no Python
+        loop per text or per item. The trie does not have to be linked.
+        It needs the optional NumPy dependency (`triematch[numpy]`).
+
+        Args:
+            texts (Sequence): The texts to search in.
+
+        Returns:
+            BatchMatches: columns `doc_id`, `start`, `end` and `value_id` as
+                NumPy arrays, `values[value_id]` is the value of a match
+        """
+        # imported here, since the dfa module imports this one
+        from triematch.dfa import DFA  # noqa: PLC0415
+
+        if self._dfa is not None:
+            return self._dfa.search_batch(texts)
+        if self._dfa_cache is None or self._dfa_cache[0] != self._version:
+            self._dfa_cache = (self._version, DFA(self))
+        return self._dfa_cache[1].search_batch(texts)
+
+    def instrumented_search(
+        self,
+        text: TrieKey,
+        stats: Optional[dict[str, Any]]=None,
+        callback: Optional[Callable[[dict[str, Any]], None]]=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search like `search` while counting the work done by the automaton.
+
+        This is a separate code path, so `search` itself pays nothing for
+        the instrumentation. Counters are added to `stats` (see
+        `new_search_stats`) when the generator is exhausted or closed, and
+        `callback` is called with the same dict afterwards.
+
+        Args:
+            text (str): The text to search for patterns.
+            stats (dict, optional): Counters dict to update. A new one is
+                created if it is not provided.
+            callback (callable, optional): Called with the counters dict
+                once the search is over.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value for matched key)
+        """
+        if stats is None:
+            stats = new_search_stats()
+        counters = new_search_stats()
+        if self._state != TrieStates.Linked:
+            matches = self._instrumented_trie_search(text, counters)
+        else:
+            matches = self._instrumented_linked_search(text, counters)
+        try:
+            # only the time until the next match is found is counted, not
+            # the time the caller spends between matches
+            while True:
+                started = perf_counter()
+                try:
+                    match = next(matches)
+                except StopIteration:
+                    break
+                finally:
+                    counters['elapsed'] += perf_counter() - started
+                yield match
+        finally:
+            for name in ('max_failure_chain', 'max_output_chain'):
+                stats[name] = max(stats[name], counters.pop(name))
+            counters.pop('throughput')
+            for name, count in counters.items():
+                stats[name] += count
+            if stats['elapsed']:
+                stats['throughput'] = stats['characters'] / stats['elapsed']
+            if callback is not None:
+                callback(stats)
+
+    def _instrumented_trie_search(
+        self,
+        text: TrieKey,
+        counters: dict[str, Any],
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Regular Trie walk from every position of the text, with counters.
+
+        Edges are followed with `_child_edge`, so edges with many items
+        (Radix) count as one transition.
+        """
+        for i in range(len(text)):
+            counters['characters'] += 1
+            outputs = 0
+            current_node = self.data
+            j = i
+            while j < len(text):
+                edge = self._child_edge(current_node, text[j])
+                if edge is None:
+                    break
+                label, current_node = edge
+                symbols = self._edge_symbols(label)
+                end = j + len(symbols)
+                if end > len(text) or any(
+                    text[k] != symbol for k, symbol in enumerate(symbols, j)
+                ):
+                    break
+                counters['transitions'] += 1
+                j = end
+                if current_node.value is not Empty:
+                    outputs += 1
+                    yield i, j, current_node.value
+            counters['matches'] += outputs
+            counters['max_output_chain'] = max(counters['max_output_chain'], outputs)
+
+    def _instrumented_linked_search(
+        self,
+        text: TrieKey,
+        counters: dict[str, Any],
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Aho-Corasick walk over the linked nodes, with counters."""
+        if not text:
+            yield 0, 0, None
+            return
+
+        root_node = current_node = self.data
+        for i, letter in enumerate(text):
+            counters['characters'] += 1
+            hops = 0
+            while letter not in current_node and current_node is not root_node:
+                current_node = current_node.failure_link
+                hops += 1
+            counters['failure_hops'] += hops
+            counters['max_failure_chain'] = max(counters['max_failure_chain'], hops)
+
+            next_node = current_node.get(letter)
+            if next_node is None:
+                current_node = root_node
+            else:
+                counters['transitions'] += 1
+                current_node = next_node
+
+            outputs = 0
+            if current_node.value is not Empty:
+                outputs += 1
+                yield i - current_node.pathlen, i + 1, current_node.value
+
+            value_node = current_node.dict_link
+            while value_node is not None:
+                counters['dict_link_hops'] += 1
+                outputs += 1
+                yield i - value_node.pathlen, i + 1, value_node.value
+                value_node = value_node.dict_link
+            counters['matches'] += outputs
+            counters['max_output_chain'] = max(counters['max_output_chain'], outputs)
+
 
 class StringTrie(ACMixin, BaseTrie):
     """
@@ -614,67 +1875,160 @@ class StringTrie(ACMixin, BaseTrie):
     for any keys present in the text.
     """
 
+    _regex_cache = None  # (trie version, {flags: compiled pattern})
+
     def __init__(self, _dict: Optional[dict]=None, /, **kwargs: dict[str, Any]) -> None:
         super().__init__(_dict, **kwargs)
         self.data.failure_link = (
             self.data
         )  # root node is self referencing for failure case
 
-    def to_regex(self) -> str:
+    def to_regex(self, atomic: bool=False) -> str:
         """
         Generate regex pattern to match keys in the trie object.
 
+        Keys are escaped, so they can contain regex metacharacters.
+
+        Args:
+            atomic (bool, optional): Use atomic groups `(?>...)` instead of
+                non-capturing ones, so the regex engine does not backtrack into
+                them. Alternatives in a group never start with the same
+                character, so this does not change what the pattern matches.
+                It needs Python 3.11 or later.
+
         Returns:
             str: Regex pattern to match keys in the trie object.
         """
-        return self._regex(self.data)
+        if atomic and version_info < (3, 11):
+            raise ValueError('Atomic groups require Python 3.11 or later')
+        return self._regex(self.data, atomic=atomic)
+
+    def compiled_regex(self, flags: int=0, atomic: bool=False) -> re.Pattern:
+        """
+        Return `to_regex()` compiled with `re.compile`.
+
+        The compiled pattern is cached per arguments and reused until the trie
+        is modified, so a trie which rarely changes pays for the export once.
 
-    def _regex(self, node: Node, root_node: bool=True) -> str:
+        Args:
+            flags (int, optional): Flags passed to `re.compile`.
+            atomic (bool, optional): Passed to `to_regex`.
+
+        Returns:
+            re.Pattern: Compiled pattern to match keys in the trie object.
+        """
+        if self._regex_cache is None or self._regex_cache[0] != self._version:
+            self._regex_cache = (self._version, {})
+        patterns = self._regex_cache[1]
+        if (flags, atomic) not in patterns:
+            patterns[flags, atomic] = re.compile(self.to_regex(atomic), flags)
+        return patterns[flags, atomic]
+
+    def _regex(self, node: Node, atomic: bool=False) -> str:
         """
         Generate regex pattern for specified node and it's childs.
 
-        This method is used internal and called recursively on each node
-        to generate regex patterns.
+        Nodes are visited in post-order with an explicit stack, so deep
+        tries do not hit the recursion limit. A key ends the pattern at the
+        first node with a value, because any text matching a longer key
+        also matches the shorter one.
 
         Returns:
             str: Regex pattern to match keys in the trie object.
         """
-        if not len(node) or node.value is not Empty:
-            return ''
+        group = '(?>' if atomic else '(?:'
+        fragments = {}  # id(node) -> pattern of the node's subtree
+        stack = [(node, None)]
 
-        inner_patterns = []
-        terminal_keys = []
-        childs = [
-            (key, self._regex(ch_node, root_node=False))
-            for key, ch_node in node.items()
-        ]
+        while stack:
+            current_node, edges = stack.pop()
+            if edges is not None:
+                alternatives = sorted(
+                    alternative
+                    for labels, tail in self._regex_groups(edges, fragments)
+                    for alternative in self._regex_alternatives(labels, tail, group)
+                )
+                pattern = '|'.join(alternatives)
+                if len(alternatives) > 1 and current_node is not node:
+                    pattern = group + pattern + ')'
+                fragments[id(current_node)] = pattern
+                continue
+            if not len(current_node) or current_node.value is not Empty:
+                continue  # empty pattern for leafs
+            edges = list(self._regex_edges(current_node))
+            stack.append((current_node, edges))
+            stack.extend(
+                (child, None)
+                for _, child in edges
+                if id(child) not in fragments
+            )
 
-        terminal_keys = [key for key, ch_pattern in childs if ch_pattern == '']
+        return fragments.get(id(node), '')
 
-        inner_patterns = [
-            key + ch_pattern for key, ch_pattern in childs if ch_pattern != ''
-        ]
-        empty_inner_patterns = len(inner_patterns) == 0
+    @staticmethod
+    def _regex_edges(node: Node) -> Iterable[tuple[str, Node]]:
+        """
+        Yield (label, node) for each child of node.
 
-        if len(terminal_keys) == 1:
-            inner_patterns.append(terminal_keys[0])
-        elif len(terminal_keys) > 1:
-            inner_patterns.append('[' + ''.join(terminal_keys) + ']')
+        Chains of nodes with a single child and no value are merged into one
+        label, so long keys are joined once instead of once per level.
+        """
+        for key, first_child in node.items():
+            labels = [key]
+            child = first_child
+            while len(child) == 1 and child.value is Empty:
+                ((label, child),) = child.items()
+                labels.append(label)
+            yield ''.join(labels), child
 
-        if len(inner_patterns) == 1:
-            result = inner_patterns[0]
-        elif root_node:
-            result = '|'.join(sorted(inner_patterns))
-        else:
-            result = '(?:' + '|'.join(sorted(inner_patterns)) + ')'
+    @staticmethod
+    def _regex_groups(
+        edges: list[tuple[str, Node]],
+        fragments: dict[int, str],
+    ) -> Iterable[tuple[list[str], str]]:
+        """
+        Group edge labels which can share one alternative.
 
-        if node.value is not Empty and not root_node:
-            if empty_inner_patterns:
-                result += '?'
-            else:
-                result = '(?:' + result + ')?'
+        Children with equal patterns are grouped, and common suffixes of their
+        labels are moved to the shared tail, (e.g. `a[bd]c` for `abc` and
+        `adc`, or `(?:jump|runn)ing` for `jumping` and `running`).
 
-        return result
+        Yields:
+            (list, str) as (raw labels, escaped pattern following the labels)
+        """
+        labels_by_tail = {}
+        for label, child in edges:
+            labels_by_tail.setdefault(fragments.get(id(child), ''), []).append(label)
+
+        for tail, labels in labels_by_tail.items():
+            by_last = {}
+            for label in labels:
+                by_last.setdefault(label[-1] if len(label) > 1 else None, []).append(
+                    label,
+                )
+            rest = by_last.pop(None, [])
+            for bucket in by_last.values():
+                shared = common_suffix_length(bucket) if len(bucket) > 1 else 0
+                if shared:
+                    yield (
+                        [label[:-shared] for label in bucket],
+                        re.escape(bucket[0][-shared:]) + tail,
+                    )
+                else:
+                    rest.extend(bucket)
+            if rest:
+                yield rest, tail
+
+    @staticmethod
+    def _regex_alternatives(labels: list[str], tail: str, group: str) -> list[str]:
+        """Alternatives matching any of labels followed by tail."""
+        if len(labels) == 1:
+            return [re.escape(labels[0]) + tail]
+        if max(map(len, labels)) == 1:
+            return [char_class(labels) + tail]
+        if not tail:
+            return [re.escape(label) for label in labels]
+        return [group + '|'.join(map(re.escape, sorted(labels))) + ')' + tail]
 
 
 class TupleTrie(ACMixin, BaseTrie):
@@ -685,31 +2039,11 @@ class TupleTrie(ACMixin, BaseTrie):
     of strings.
     """
 
-    def items(self, root_path: tuple=()) -> Iterable[tuple[tuple, Any]]:
-        """
-        Iterate over all (key, value) pairs in the TupleTrie object.
-
-        keys are supposed to be tuples.
-
-        Yields:
-            tuple: (key, value) pairs for all items in the trie
-        """
-        if len(root_path) == 0:
-            root_node = self.data
-        else:
-            root_node = self.__getnode__(root_path, only_leafs=False)
-        stack = [
-            (tuple(root_path), root_node),
-        ]
+    @staticmethod
+    def _make_key(prefix: tuple, path: list) -> tuple:
+        """Build a tuple key from a prefix and the list of items after it."""
+        return (*prefix, *path)
 
-        while stack:
-            path, node = stack.pop()
-            if node.value is not Empty:
-                yield path, node.value
-            for key, child in node.items():
-                stack.append(
-                    [ (*path, key), child],
-                )
     def _update_failure_links(self) -> None:
         root_node = self.data
         root_node.failure_link = root_node
@@ -723,7 +2057,7 @@ class TupleTrie(ACMixin, BaseTrie):
             ref = parent
             tr_path_len = len(transition_path)
             for i in range(1, tr_path_len):
-                link = self.__getnode_safe__(transition_path[i:])
+                link = self._find_node(transition_path[i:])
 
                 if link is not None:
                     node.failure_link = link
@@ -736,5 +2070,309 @@ class TupleTrie(ACMixin, BaseTrie):
                 stack.appendleft((node, (*transition_path, transition), child))
 
 
+class EncodedTupleTrie(TupleTrie):
+    """
+    A TupleTrie which stores int ids of tokens instead of the tokens.
+
+    Tokens are mapped to dense ids by a `SymbolTable`, which can be shared by
+    several tries, so transitions are int lookups and each token object is
+    stored once. Keys are given and returned as tuples of tokens. `match`,
+    `search`, `search_iter`, `contains_any` and `count_matches` also take
+    ids with `encoded=True`, e.g. an `array('i')` from `SymbolTable.encode`
+    or a NumPy int array, so the tokens of a text are hashed once instead of
+    on every transition.
+    """
+
+    def __init__(
+        self,
+        _dict: Optional[dict]=None,
+        /,
+        symbols: Optional[SymbolTable]=None,
+    ) -> None:
+        """
+        Construct EncodedTupleTrie instance.
+
+        Args:
+            _dict (dict, optional): Keys (tuples of tokens) and values to insert.
+            symbols (SymbolTable, optional): Table of token ids, new tokens of
+                keys are added to it. A new table is used by default.
+        """
+        self.symbols = SymbolTable() if symbols is None else symbols
+        super().__init__(_dict)
+
+    def _make_key(self, prefix: tuple, path: list) -> tuple:
+        """Build a tuple key from a prefix and the ids of items after it."""
+        return (*prefix, *self.symbols.decode(path))
+
+    def _symbol_ids(self, items: Iterable, encoded: bool=False) -> list[int]:
+        """Ids of tokens, or ids given as an array converted to a list of ints."""
+        if encoded:
+            return items.tolist() if hasattr(items, 'tolist') else list(items)
+        get = self.symbols.get
+        return [get(item, MISSING_SYMBOL) for item in items]
+
+    def __setitem__(self, key: tuple, value: Any) -> None:
+        self._check_update_possible()
+        super().__setitem__(tuple(map(self.symbols.add, key)), value)
+
+    def __getnode_safe__(self, key: tuple) -> Optional[Node]:
+        return self._find_node(self._symbol_ids(key))
+
+    def __delitem__(self, key: tuple) -> None:
+        self._check_update_possible()
+        if not key or key not in self:
+            raise KeyError('Key not found in trie object')
+        self._remove(self._symbol_ids(key))
+
+    def _empty_like(self) -> 'EncodedTupleTrie':
+        return self.__class__(symbols=self.symbols)
+
+    def _shares_labels(self, other: Mapping) -> bool:
+        return super()._shares_labels(other) and other.symbols is self.symbols
+
+    def match(self, path: Iterable, encoded: bool=False) -> Iterable[tuple[int, Any]]:
+        """
+        Traverse the trie structure following the given path.
+
+        Args:
+            path: Tokens, or ids of tokens if encoded is True.
+            encoded (bool, optional): The path is already encoded.
+
+        Yields:
+            (int, Any) as length of matched key and value for matched key
+        """
+        for length, node in self._traverse_nodes(self._symbol_ids(path, encoded)):
+            yield length, node.value
+
+    def search(
+        self,
+        text: Iterable,
+        encoded: bool=False,
+        boundaries: Any=None,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search for all keys in the text, like `TupleTrie.search`.
+
+        Args:
+            text: Tokens, or ids of tokens if encoded is True.
+            encoded (bool, optional): The text is already encoded.
+            boundaries (optional): Separators, see `ACMixin.search`. They are
+                checked on the items of text, so on ids if encoded is True.
+
+        Yields:
+            (int, int, Any) as (key start index, key end index, value)
+        """
+        ids = self._symbol_ids(text, encoded)
+        if boundaries is not None:
+            yield from self._bounded_search(ids, boundary_flags(text, boundaries))
+            return
+        if self._state == TrieStates.Linked:
+            yield from super().search(ids)
+            return
+        for i in range(len(ids)):
+            for length, node in self._traverse_nodes(ids[i:]):
+                yield i, i + length, node.value
+
+    def search_iter(
+        self,
+        items: Iterable,
+        encode: Optional[Mapping]=None,
+        encoded: bool=False,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """
+        Search for keys in any iterable, like `ACMixin.search_iter`.
+
+        Tokens are encoded by the symbol table unless encoded is True or
+        another `encode` mapping (of tokens to ids) is given.
+        """
+        if encode is None and not encoded:
+            encode = self.symbols
+        yield from super().search_iter(items, encode)
+
+    def instrumented_search(
+        self,
+        text: Iterable,
+        stats: Optional[dict[str, Any]]=None,
+        callback: Optional[Callable[[dict[str, Any]], None]]=None,
+        encoded: bool=False,
+    ) -> Iterable[tuple[int, int, Any]]:
+        """Search like `search` while counting the work done by the automaton."""
+        ids = self._symbol_ids(text, encoded)
+        yield from super().instrumented_search(ids, stats, callback)
+
+    def contains_any(self, text: Iterable, encoded: bool=False) -> bool:
+        """Check if any key occurs in the text of tokens (or ids if encoded)."""
+        ids = self._symbol_ids(text, encoded)
+        if self._state != TrieStates.Linked:
+            return next(iter(self.search_iter(ids, encoded=True)), None) is not None
+        return super().contains_any(ids)
+
+    def count_matches(self, text: Iterable, encoded: bool=False) -> Counter:
+        """Count how many times the keys occur in the text of tokens (or ids)."""
+        ids = self._symbol_ids(text, encoded)
+        if self._state != TrieStates.Linked:
+            return Counter(value for _, _, value in self.search_iter(ids, encoded=True))
+        return super().count_matches(ids)
+
+    def search_batch(
+        self,
+        texts: Sequence[Iterable],
+        encoded: bool=False,
+    ) -> 'BatchMatches':
+        """Search many texts of tokens (or ids) at once, see `ACMixin.search_batch`."""
+        return super().search_batch([self._symbol_ids(text, encoded) for text in texts])
+
+    def longest_prefix(self, key: tuple, default: Any=None) -> Any:
+        """Find the longest key in the trie which is a prefix of key."""
+        return super().longest_prefix(self._symbol_ids(key), default)
+
+    def shortest_prefix(self, key: tuple, default: Any=None) -> Any:
+        """Find the shortest key in the trie which is a prefix of key."""
+        return super().shortest_prefix(self._symbol_ids(key), default)
+
+    def fuzzy(
+        self,
+        query: tuple,
+        max_distance: int=1,
+    ) -> Iterable[tuple[tuple, Any, int]]:
+        """Find keys within a Levenshtein distance of the query of tokens."""
+        return super().fuzzy(self._symbol_ids(query), max_distance)
+
+    def glob(self, pattern: Iterable) -> Iterable[tuple[tuple, Any]]:
+        """
+        Find keys matching a wildcard pattern of tokens, see `BaseTrie.glob`.
+
+        `ItemSet` items are checked against the tokens of the symbol table
+        once, and replaced with the set of matching ids.
+        """
+        tokens = []
+        for token in pattern:
+            if isinstance(token, ItemSet):
+                token = ItemSet(  # noqa: PLW2901
+                    symbol for symbol, item in enumerate(self.symbols)
+                    if token.matches(item)
+                )
+            elif not isinstance(token, Wildcard):
+                token = self.symbols.get(token, MISSING_SYMBOL)  # noqa: PLW2901
+            tokens.append(token)
+        return super().glob(tuple(tokens))
+
+
 class Trie(StringTrie):
     pass
+
+
+class WildcardNode(Node):
+    """A Node which also keeps a list of its `ItemSet` edges."""
+
+    __slots__ = (*Node.__slots__, 'item_sets')
+
+    def __init__(self, value: Any=Empty) -> None:
+        super().__init__(value)
+        self.item_sets = []
+
+    def setdefault(self, key: Any, default: Any=None) -> Any:
+        """Insert the child like `BaseNode.setdefault`, and list `ItemSet` keys."""
+        if isinstance(key, ItemSet) and key not in self:
+            self.item_sets.append(key)
+        return super().setdefault(key, default)
+
+    def __setitem__(self, key: Any, child: Any) -> None:
+        if isinstance(key, ItemSet) and key not in self:
+            self.item_sets.append(key)
+        super().__setitem__(key, child)
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        if isinstance(key, ItemSet):
+            self.item_sets.remove(key)
+
+
+class WildcardTrie(BaseTrie):
+    """
+    A Trie which stores string wildcard patterns as keys, see `triematch.wildcard`.
+
+    Patterns are stored as they are instead of every key they match. A lookup
+    follows the literal edge and the wildcard edges which accept the next
+    item, so a key is checked against all stored patterns in one walk.
+    """
+
+    @staticmethod
+    def __newnode__(item: Optional[Any]=Empty) -> WildcardNode:
+        return WildcardNode(item)
+
+    @staticmethod
+    def _make_key(prefix: str, path: list) -> str:
+        """Build a pattern from a prefix and the list of pattern items after it."""
+        return prefix + pattern_text(path)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(pattern_tokens(key), value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(pattern_tokens(key))
+
+    def __getnode_safe__(self, key: str) -> Optional[WildcardNode]:
+        return super().__getnode_safe__(pattern_tokens(key))
+
+    @staticmethod
+    def _add_state(states: dict, node: WildcardNode, path: tuple) -> None:
+        """Add node to the states, and nodes after `*` edges which match nothing."""
+        while node is not None:
+            states[id(node)] = (node, path)
+            node, path = node.get(ANY_RUN), (*path, ANY_RUN)
+
+    def _states(self, key: str) -> Iterable[dict[int, tuple[WildcardNode, tuple]]]:
+        """
+        Follow all patterns matching the key, one item at a time.
+
+        Yields:
+            dict: {id(node): (node, pattern items)} of nodes reached before the
+                first item and after each item, it stops when no node is left.
+        """
+        states = {}
+        self._add_state(states, self.data, ())
+        yield states
+        for item in key:
+            reached = {}
+            for node, path in states.values():
+                if path and path[-1] == ANY_RUN:  # `*` also matches this item
+                    reached[id(node)] = (node, path)
+                for label in (item, ANY_ITEM):
+                    if label in node:
+                        self._add_state(reached, node[label], (*path, label))
+                for item_set in node.item_sets:
+                    if item_set.matches(item):
+                        self._add_state(reached, node[item_set], (*path, item_set))
+            if not reached:
+                return
+            states = reached
+            yield states
+
+    def match(self, path: str) -> Iterable[tuple[int, Any]]:
+        """
+        Find patterns which match a prefix of the path.
+
+        Yields:
+            (int, Any) as length of the matched prefix and value of the pattern
+        """
+        for length, states in enumerate(self._states(path)):
+            for node, _ in states.values():
+                if node.value is not Empty:
+                    yield length, node.value
+
+    def matches(self, key: str) -> Iterable[tuple[str, Any]]:
+        """
+        Find patterns which match the whole key.
+
+        Yields:
+            (str, Any) as (pattern, value) for all matching patterns
+        """
+        length, states = -1, {}
+        for length, states in enumerate(self._states(key)):  # noqa: B007
+            pass
+        if length != len(key):
+            return
+        for node, path in states.values():
+            if node.value is not Empty:
+                yield self._make_key('', list(path)), node.value
@@ -1,7 +1,11 @@
 """utility functions used in retire library."""
+from collections.abc import Callable
 from collections.abc import Iterable
+from collections.abc import Sequence
 from itertools import tee
+from re import escape
 from sys import version_info
+from typing import Any
 
 if version_info.minor > 9: #noqa PLR2004
     from itertools import pairwise
@@ -17,3 +21,111 @@ else:
         a, b = tee(iterable)
         next(b, None)
         return zip(a, b)
+
+
+def common_suffix_length(keys: list) -> int:
+    """
+    Length of the longest common suffix of keys.
+
+    The suffix is kept shorter than the shortest key, so removing it leaves a
+    non-empty head for every key.
+    common_suffix_length(['xyzq', 'wyzq']) --> 3
+    """
+    limit = min(map(len, keys)) - 1
+    first = keys[0]
+    length = 0
+    while length < limit and all(
+        key[-1 - length] == first[-1 - length] for key in keys
+    ):
+        length += 1
+    return length
+
+
+def char_class(chars: Iterable[str], min_range: int=3) -> str:
+    """
+    Regex character class matching any of chars.
+
+    Runs of at least `min_range` consecutive code points are written as ranges
+    and every character is escaped.
+    char_class('dcbaxz') --> '[a-dxz]'
+    """
+    points = sorted(set(map(ord, chars)))
+    parts = []
+    start = 0
+    for end in range(1, len(points) + 1):
+        if end < len(points) and points[end] == points[end - 1] + 1:
+            continue
+        run = [escape(chr(point)) for point in points[start:end]]
+        if len(run) >= min_range:
+            parts.append(f'{run[0]}-{run[-1]}')
+        else:
+            parts.extend(run)
+        start = end
+    return '[' + ''.join(parts) + ']'
+
+
+def is_word_separator(item: Any) -> bool:
+    """
+    Check if item separates words, i.e. it is not a letter, digit or '_'.
+
+    Items which are not strings (e.g. ids of tokens) are parts of words.
+    """
+    return isinstance(item, str) and not (item.isalnum() or item == '_')
+
+
+def separator_test(boundaries: Any) -> Callable[[Any], bool]:
+    """
+    Return a function checking if an item is a separator, see boundaries.
+
+    Boundaries are 'word' (see `is_word_separator`), a function of an item or
+    a collection of separators.
+    """
+    if isinstance(boundaries, str):
+        if boundaries != 'word':
+            raise ValueError(f'Unknown boundaries: {boundaries!r}')
+        return is_word_separator
+    if callable(boundaries):
+        return boundaries
+    return frozenset(boundaries).__contains__
+
+
+class _SeparatorClasses(dict):
+    """Code point -> chr(1) for separators or chr(0), filled on first use."""
+
+    __slots__ = ('is_separator',)
+
+    def __init__(self, is_separator: Callable[[str], bool]) -> None:
+        super().__init__()
+        self.is_separator = is_separator
+
+    def __missing__(self, point: int) -> str:
+        flag = '\x01' if self.is_separator(chr(point)) else '\x00'
+        self[point] = flag
+        return flag
+
+
+_WORD_CLASSES = _SeparatorClasses(is_word_separator)
+
+
+def boundary_flags(text: Sequence, boundaries: Any) -> bytes:
+    """
+    Return flags of the positions 0 to len(text) which are on a boundary.
+
+    A position is on a boundary at the start or end of text, or when the
+    item before or after it is a separator (see `separator_test`). Classes
+    of characters are looked up with `str.translate` in a cached table, so
+    strings are not checked item by item in Python.
+    boundary_flags('ab c', 'word') --> bytes([1, 0, 1, 1, 1])
+    """
+    if isinstance(text, str):
+        if isinstance(boundaries, str) and boundaries == 'word':
+            classes = _WORD_CLASSES
+        else:
+            classes = _SeparatorClasses(separator_test(boundaries))
+        separators = text.translate(classes).encode('latin-1')
+    else:
+        separators = bytes(map(separator_test(boundaries), text))
+    # flags[i] = separators[i - 1] | separators[i], with 1 outside of text
+    before = int.from_bytes(b'\x01' + separators, 'big')
+    after = int.from_bytes(separators + b'\x01', 'big')
+    return (before | after).to_bytes(len(separators) + 1, 'big')
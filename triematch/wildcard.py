@@ -0,0 +1,267 @@
+"""
+Wildcard patterns for tries.
+
+A pattern is a sequence of items, where an item is a literal or a wildcard:
+`?` matches one item, `*` matches any number of items, `[abc]`, `[a-z]` and
+`[!0-9]` match one item of (or not of) a set. Special characters are escaped
+with a backslash.
+
+```python
+parse_pattern('user_?_[0-9]*')
+# Output: ('u', 's', 'e', 'r', '_', ANY_ITEM, '_',
+#          ItemSet([], [('0', '9')], negated=False), ANY_RUN)
+```
+
+Tuple keys use tuples of items, where `ANY_ITEM`, `ANY_RUN` and `ItemSet`
+objects are the wildcards.
+"""
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+SPECIAL_CHARACTERS = frozenset('?*[]\\')
+
+
+def _escape(text: str) -> str:
+    return ''.join('\\' + char if char in SPECIAL_CHARACTERS else char for char in text)
+
+
+class Wildcard(ABC):
+    """Base class of pattern items which match other items than themselves."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def matches(self, item: Any) -> bool:
+        """Check if the wildcard matches one item of a key."""
+
+    @abstractmethod
+    def __str__(self) -> str:
+        """Return the pattern syntax of the wildcard, e.g. `?`."""
+
+
+class AnyItem(Wildcard):
+    """`?`, matches exactly one item."""
+
+    __slots__ = ()
+
+    def matches(self, item: Any) -> bool:  # noqa: ARG002
+        """Any item is matched."""
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, AnyItem)
+
+    def __hash__(self) -> int:
+        return hash(AnyItem)
+
+    def __reduce__(self) -> str:
+        return 'ANY_ITEM'
+
+    def __repr__(self) -> str:
+        return 'ANY_ITEM'
+
+    def __str__(self) -> str:
+        return '?'
+
+
+class AnyRun(Wildcard):
+    """`*`, matches zero or more items."""
+
+    __slots__ = ()
+
+    def matches(self, item: Any) -> bool:  # noqa: ARG002
+        """Any item is matched, any number of times."""
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, AnyRun)
+
+    def __hash__(self) -> int:
+        return hash(AnyRun)
+
+    def __reduce__(self) -> str:
+        return 'ANY_RUN'
+
+    def __repr__(self) -> str:
+        return 'ANY_RUN'
+
+    def __str__(self) -> str:
+        return '*'
+
+
+ANY_ITEM = AnyItem()
+ANY_RUN = AnyRun()
+
+
+class ItemSet(Wildcard):
+    """`[...]`, matches one item of a set of items and ranges, or not of it."""
+
+    __slots__ = ('items', 'negated', 'ranges')
+
+    def __init__(
+        self,
+        items: Iterable[Any]=(),
+        ranges: Iterable[tuple[Any, Any]]=(),
+        negated: bool=False,
+    ) -> None:
+        """
+        Construct ItemSet instance.
+
+        Args:
+            items (iterable, optional): Items in the set.
+            ranges (iterable, optional): (first, last) pairs, items between
+                them (inclusive) are in the set.
+            negated (bool, optional): Match items which are not in the set.
+        """
+        self.items = frozenset(items)
+        self.ranges = tuple(sorted(ranges))
+        self.negated = negated
+
+    def matches(self, item: Any) -> bool:
+        """Check if item is in the set, or not in it for a negated set."""
+        found = item in self.items or any(
+            first <= item <= last for first, last in self.ranges
+        )
+        return found != self.negated
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ItemSet)
+            and (self.items, self.ranges, self.negated)
+            == (other.items, other.ranges, other.negated)
+        )
+
+    def __hash__(self) -> int:
+        return hash((ItemSet, self.items, self.ranges, self.negated))
+
+    def __repr__(self) -> str:
+        items = sorted(self.items, key=repr)
+        return (
+            f'{self.__class__.__name__}({items!r}, {list(self.ranges)!r}, '
+            f'negated={self.negated!r})'
+        )
+
+    def __str__(self) -> str:
+        ranges = ''.join(
+            f'{_escape(first)}-{_escape(last)}' for first, last in self.ranges
+        )
+        items = _escape(''.join(sorted(self.items)))
+        return f"[{'!' if self.negated else ''}{items}{ranges}]"
+
+
+def _parse_set(pattern: str, i: int) -> tuple[ItemSet, int]:
+    """
+    Parse a `[...]` set which starts after the `[` at index i.
+
+    Returns:
+        (ItemSet, int) as the set and index after its `]`, or (None, i) if the
+            set is not closed.
+    """
+    negated = i < len(pattern) and pattern[i] in '!^'
+    i += negated
+    chars = []
+    while i < len(pattern) and (pattern[i] != ']' or not chars):
+        if pattern[i] == '\\' and i + 1 < len(pattern):
+            i += 1
+        chars.append(pattern[i])
+        i += 1
+    if i >= len(pattern):
+        return None, i
+
+    items, ranges = [], []
+    j = 0
+    while j < len(chars):
+        if j + 2 < len(chars) and chars[j + 1] == '-':
+            ranges.append((chars[j], chars[j + 2]))
+            j += 3
+        else:
+            items.append(chars[j])
+            j += 1
+    return ItemSet(items, ranges, negated), i + 1
+
+
+def parse_pattern(pattern: str) -> tuple:
+    """
+    Split a glob style string pattern into literal characters and wildcards.
+
+    Returns:
+        tuple: items of the pattern, consecutive `*` are merged
+    """
+    tokens = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        if char == '\\' and i < len(pattern):
+            tokens.append(pattern[i])
+            i += 1
+        elif char == '?':
+            tokens.append(ANY_ITEM)
+        elif char == '*':
+            if not tokens or not isinstance(tokens[-1], AnyRun):
+                tokens.append(ANY_RUN)
+        elif char == '[':
+            item_set, end = _parse_set(pattern, i)
+            if item_set is None:  # not closed, it is a literal
+                tokens.append(char)
+            else:
+                tokens.append(item_set)
+                i = end
+        else:
+            tokens.append(char)
+    return tuple(tokens)
+
+
+def pattern_tokens(pattern: Any) -> tuple:
+    """Parse string patterns, other sequences are already tuples of items."""
+    if isinstance(pattern, str):
+        return parse_pattern(pattern)
+    return tuple(pattern)
+
+
+def pattern_text(tokens: Iterable[Any]) -> str:
+    """Write tokens of a string pattern back as a pattern, see `parse_pattern`."""
+    return ''.join(
+        str(token) if isinstance(token, Wildcard) else _escape(token)
+        for token in tokens
+    )
+
+
+def start_positions(tokens: tuple) -> frozenset[int]:
+    """Positions in tokens which are reached before reading any item."""
+    return _skip_runs(tokens, {0})
+
+
+def advance(tokens: tuple, positions: frozenset[int], item: Any) -> frozenset[int]:
+    """
+    Move all positions in tokens over one item.
+
+    Returns:
+        frozenset: positions reached after item, empty if item does not match
+    """
+    reached = set()
+    for i in positions:
+        if i == len(tokens):
+            continue
+        token = tokens[i]
+        if isinstance(token, AnyRun):
+            reached.add(i)
+        elif isinstance(token, Wildcard):
+            if token.matches(item):
+                reached.add(i + 1)
+        elif token == item:
+            reached.add(i + 1)
+    return _skip_runs(tokens, reached)
+
+
+def _skip_runs(tokens: tuple, positions: set[int]) -> frozenset[int]:
+    """Add positions after `*` items, since they can match nothing."""
+    reached = set(positions)
+    for position in positions:
+        i = position
+        while i < len(tokens) and isinstance(tokens[i], AnyRun):
+            i += 1
+            reached.add(i)
+    return frozenset(reached)